@@ -0,0 +1,183 @@
+"""
+Admission control: shed load instead of queueing without bound.
+
+Without it every request is accepted: under overload they pile up in the
+endpoint thread pool and latency grows to seconds for everybody. With
+APP_ADMISSION_MAX_IN_FLIGHT set, AdmissionMiddleware lets at most that many
+requests run at once. A request arriving when all slots are taken waits on the
+event loop for at most APP_ADMISSION_QUEUE_TIMEOUT_MS, in a queue of at most
+APP_ADMISSION_MAX_QUEUE requests; when the queue is full or the deadline
+passes it gets an immediate 429 Too Many Requests with Retry-After. Admitted
+requests therefore see a bounded queue wait, rejected ones fail in
+microseconds, and the client can back off.
+
+With APP_ADMISSION_ADAPTIVE the limit is an AIMD concurrency limit between 1
+and the configured maximum (see ConcurrencyLimit): it backs off when requests
+take longer than APP_ADMISSION_LATENCY_TARGET_MS or are shed at the deadline,
+and grows slowly while the requests finish in time.
+
+Health, metrics and admin endpoints are never shed.
+
+Metrics: admission_limit, admission_in_flight, admission_queued and
+admission_rejected_total{reason} (queue_full, deadline).
+"""
+
+import asyncio
+import collections
+import time
+
+from prometheus_client import Counter, Gauge
+
+LIMIT = Gauge("admission_limit", "Current concurrency limit of admission control")
+IN_FLIGHT = Gauge("admission_in_flight", "Requests admitted and running")
+QUEUED = Gauge("admission_queued", "Requests waiting for admission")
+REJECTED = Counter("admission_rejected_total", "Requests shed by admission control", ["reason"])
+
+# Paths that are always admitted
+EXEMPT_PATHS = ("/health", "/metrics", "/admin/")
+
+REJECT_BODY = b'{"detail":"Server overloaded"}'
+
+
+class ConcurrencyLimit:
+    """
+    Static concurrency limit, or AIMD adaptive limit between 1 and max_limit.
+
+    Adaptive: a request slower than the latency target or shed at its queue
+    deadline multiplies the limit by BACKOFF, once per congestion event (only
+    requests admitted after the previous backoff can trigger the next one).
+    A request finishing in time while at least half of the limit is in use
+    adds 1/limit, i.e. about one slot per limit requests.
+    """
+
+    BACKOFF = 0.9
+
+    def __init__(self, max_limit: int, adaptive: bool = False, latency_target: float = 0.2):
+        self.max_limit = max_limit
+        self.adaptive = adaptive
+        self.latency_target = latency_target
+        self.value = float(max_limit)
+        # Incremented on every backoff
+        self.epoch = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self.value)
+
+    def on_success(self, latency: float, in_flight: int, epoch: int):
+        if not self.adaptive:
+            return
+        if latency > self.latency_target:
+            self.on_drop(epoch)
+        elif in_flight * 2 >= self.limit:
+            self.value = min(self.max_limit, self.value + 1 / self.value)
+
+    def on_drop(self, epoch: int):
+        if self.adaptive and epoch == self.epoch:
+            self.value = max(1.0, self.value * self.BACKOFF)
+            self.epoch += 1
+
+
+class AdmissionMiddleware:
+    """ASGI middleware limiting the requests in flight, with a bounded, deadline-limited queue."""
+
+    def __init__(
+        self,
+        app,
+        max_in_flight: int,
+        max_queue: int = 100,
+        queue_timeout: float = 0.1,
+        adaptive: bool = False,
+        latency_target: float = 0.2,
+    ):
+        self.app = app
+        self.limit = ConcurrencyLimit(max_in_flight, adaptive, latency_target)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        # Futures of the waiting requests, oldest first; all state lives on the event loop.
+        # Futures of requests that gave up stay until they reach the front
+        self.waiters = collections.deque()
+        # Requests still waiting for a slot
+        self.waiting = 0
+        LIMIT.set_function(lambda: self.limit.limit)
+        IN_FLIGHT.set_function(lambda: self.in_flight)
+        QUEUED.set_function(lambda: self.waiting)
+        self._rejected = {reason: REJECTED.labels(reason) for reason in ("queue_full", "deadline")}
+
+    def _try_acquire(self) -> bool:
+        if self.in_flight < self.limit.limit:
+            self.in_flight += 1
+            return True
+        return False
+
+    def _release(self):
+        self.in_flight -= 1
+        # Hand the free slots to the oldest waiters; timed out waiters are already done
+        while self.waiters:
+            waiter = self.waiters[0]
+            if waiter.done():
+                self.waiters.popleft()
+            elif self._try_acquire():
+                self.waiters.popleft()
+                waiter.set_result(None)
+            else:
+                break
+
+    async def _admit(self):
+        """Wait for a slot; returns the rejection reason, or None when admitted."""
+        while self.waiters and self.waiters[0].done():
+            self.waiters.popleft()
+        if not self.waiters and self._try_acquire():
+            return None
+        if self.waiting >= self.max_queue or self.queue_timeout <= 0:
+            return "queue_full"
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            # wait_for may time out after _release has handed over a slot; give it back
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            return "deadline"
+        except asyncio.CancelledError:
+            # Client gone: give back a slot handed over in the meantime
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            self.waiting -= 1
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        epoch = self.limit.epoch
+        reason = await self._admit()
+        if reason is not None:
+            self._rejected[reason].inc()
+            if reason == "deadline":
+                self.limit.on_drop(epoch)
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(REJECT_BODY)).encode()),
+                    (b"retry-after", b"1"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": REJECT_BODY})
+            return
+
+        epoch = self.limit.epoch
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limit.on_success(time.perf_counter() - start, self.in_flight, epoch)
+            self._release()
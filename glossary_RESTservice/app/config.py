@@ -3,6 +3,26 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./glossary.db"
+    # Instrumentation is off by default, so a benchmark measures the bare service
+    # unless a run asks for more (scripts/start_rest_service.ps1 -Instrument)
+    # Per-request phase timings in the Server-Timing response header
+    server_timing: bool = False
+    # Prometheus metrics (GET /metrics)
+    metrics: bool = False
+    # On-demand sampling profiler (GET /admin/profile; unauthenticated, keep it on test benches)
+    profiling: bool = False
+    # GC pause timing (python_gc_pause_seconds, GET /admin/gc for per-run reports)
+    gc_stats: bool = False
+    # Seconds between tracemalloc snapshots (0: no allocation tracing; slows the service down)
+    tracemalloc_interval: int = 0
+    # Admission control: requests running at once (0: no limit, no load shedding)
+    admission_max_in_flight: int = 0
+    # Requests waiting for a slot, and how long they may wait before a 429
+    admission_max_queue: int = 100
+    admission_queue_timeout_ms: int = 100
+    # Adapt the limit (AIMD) between 1 and admission_max_in_flight to keep latency under the target
+    admission_adaptive: bool = False
+    admission_latency_target_ms: int = 200
 
     class Config:
         env_prefix = "APP_"
@@ -0,0 +1,142 @@
+"""
+Garbage collector pauses and (optionally) memory allocation growth.
+
+GC pauses: a gc.callbacks hook times every collection. Each pause is
+- observed in the python_gc_pause_seconds{generation} histogram
+- kept with its wall clock time in a bounded buffer, so a benchmark run can
+  fetch the pauses of its own time window (report(since)) and line them up
+  with its latency history
+
+Allocations: with a tracemalloc interval, tracemalloc traces every allocation
+(one frame) and a background thread takes a snapshot every interval. Each
+snapshot is compared with the previous one; the locations whose allocated
+size changed the most are kept together with the traced and peak memory of the
+interval (python_tracemalloc_traced_bytes / _peak_bytes gauges). Memory that
+keeps growing at the same location interval after interval is a leak.
+tracemalloc slows every allocation down, so it is off by default and meant for
+soak tests, not for latency measurements.
+"""
+
+import gc
+import threading
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+from prometheus_client import Gauge, Histogram
+
+# Young collections take microseconds, full collections of a large heap up to seconds
+PAUSE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+GC_PAUSE = Histogram("python_gc_pause_seconds", "Garbage collector pause", ["generation"], buckets=PAUSE_BUCKETS)
+TRACED_BYTES = Gauge("python_tracemalloc_traced_bytes", "Memory allocated by Python, traced by tracemalloc")
+PEAK_BYTES = Gauge("python_tracemalloc_peak_bytes", "Peak traced memory during the last tracemalloc interval")
+
+# Pauses kept for reports: several minutes of young collections under load
+MAX_PAUSES = 100_000
+# Snapshots kept for reports (a day at a 60 s interval)
+MAX_SNAPSHOTS = 1440
+# Locations kept per snapshot
+TOP_LOCATIONS = 10
+
+# (time, generation, pause seconds, collected, uncollectable)
+_pauses = deque(maxlen=MAX_PAUSES)
+# {"time", "traced", "peak", "top": [[location, size, count, size_diff, count_diff], ...]}
+_snapshots = deque(maxlen=MAX_SNAPSHOTS)
+_pause_children = [GC_PAUSE.labels(str(generation)) for generation in range(3)]
+_start = None
+_installed = False
+
+
+def _on_gc(phase, info):
+    # Collections hold the GIL and do not nest, so one start time is enough
+    global _start
+    if phase == "start":
+        _start = time.perf_counter()
+    elif _start is not None:
+        pause = time.perf_counter() - _start
+        _start = None
+        generation = info["generation"]
+        _pause_children[generation].observe(pause)
+        _pauses.append((time.time(), generation, pause, info["collected"], info["uncollectable"]))
+
+
+def _location(statistic) -> str:
+    frame = statistic.traceback[0]
+    path = Path(frame.filename)
+    return f"{path.parent.name}/{path.name}:{frame.lineno}"
+
+
+def _take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        # The pause buffer of this module
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+
+
+def _trace_allocations(interval: float):
+    previous = _take_snapshot()
+    tracemalloc.reset_peak()
+    while True:
+        time.sleep(interval)
+        snapshot = _take_snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        TRACED_BYTES.set(traced)
+        PEAK_BYTES.set(peak)
+        top = [
+            [_location(statistic), statistic.size, statistic.count, statistic.size_diff, statistic.count_diff]
+            for statistic in snapshot.compare_to(previous, "lineno")[:TOP_LOCATIONS]
+        ]
+        _snapshots.append({"time": time.time(), "traced": traced, "peak": peak, "top": top})
+        previous = snapshot
+
+
+def install(tracemalloc_interval: float = 0) -> None:
+    """Start timing collections and, with an interval (seconds), tracing allocations."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    gc.callbacks.append(_on_gc)
+    if tracemalloc_interval > 0:
+        tracemalloc.start()
+        threading.Thread(
+            target=_trace_allocations, args=(tracemalloc_interval,), name="tracemalloc-snapshots", daemon=True
+        ).start()
+
+
+def _copy(items) -> list:
+    # A collection (and its callback) can run while the buffer is being copied
+    while True:
+        try:
+            return list(items)
+        except RuntimeError:
+            continue
+
+
+def report(since: float = 0) -> dict:
+    """
+    GC pauses and tracemalloc snapshots from `since` (Unix time) on.
+
+    Returns:
+        {"pauses": [[time, generation, pause_ms, collected, uncollectable], ...],
+         "truncated": whether older pauses of the window were dropped from the buffer,
+         "tracemalloc": whether allocations are traced,
+         "snapshots": [{"time", "traced", "peak", "top"}, ...]}
+    """
+    pauses = _copy(_pauses)
+    return {
+        "pauses": [
+            [round(t, 6), generation, round(pause * 1000, 4), collected, uncollectable]
+            for t, generation, pause, collected, uncollectable in pauses
+            if t >= since
+        ],
+        "truncated": len(pauses) == MAX_PAUSES and pauses[0][0] > since,
+        "tracemalloc": tracemalloc.is_tracing(),
+        "snapshots": [snapshot for snapshot in _copy(_snapshots) if snapshot["time"] >= since],
+    }
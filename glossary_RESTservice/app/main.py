@@ -1,14 +1,43 @@
 from fastapi import FastAPI
 
-from .routers import terms
+from . import gc_monitor, metrics, timing
+from .admission import AdmissionMiddleware
+from .config import settings
+from .routers import admin, terms
 
 
 app = FastAPI(title="Glossary Service", version="0.1.0")
 
+if settings.gc_stats:
+    gc_monitor.install(settings.tracemalloc_interval)
+
+if settings.server_timing:
+    timing.install()
+    app.add_middleware(timing.ServerTimingMiddleware)
+
+if settings.metrics:
+    metrics.install()
+    app.add_middleware(metrics.PrometheusMiddleware)
+    app.add_api_route(metrics.METRICS_PATH, metrics.metrics_endpoint, include_in_schema=False)
+
+# Outermost middleware: shed requests before any other work is done for them
+if settings.admission_max_in_flight:
+    app.add_middleware(
+        AdmissionMiddleware,
+        max_in_flight=settings.admission_max_in_flight,
+        max_queue=settings.admission_max_queue,
+        queue_timeout=settings.admission_queue_timeout_ms / 1000,
+        adaptive=settings.admission_adaptive,
+        latency_target=settings.admission_latency_target_ms / 1000,
+    )
+
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
-app.include_router(terms.router)
\ No newline at end of file
+app.include_router(terms.router)
+
+if settings.profiling or settings.gc_stats:
+    app.include_router(admin.router)
@@ -0,0 +1,128 @@
+"""
+Prometheus metrics of the service, exposed on GET /metrics.
+
+- http_request_duration_seconds{method, route, status}: request latency
+  (route is the path template, e.g. /terms/{keyword})
+- http_requests_in_progress{method}: requests being handled
+- db_session_duration_seconds: lifetime of a session's transaction
+  (begin -> commit/rollback/close)
+- db_pool_wait_seconds: transaction begin -> connection checked out of the pool
+- threadpool_busy_threads / threadpool_queue_depth / threadpool_size: the
+  thread pool running sync endpoints (read when /metrics is scraped)
+
+Recording on the hot path costs two perf_counter calls, a gauge update and a
+histogram observation per request; label children are cached instead of being
+resolved on every request.
+"""
+
+import time
+
+import anyio.to_thread
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+# Latency buckets from 1 ms to 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Pool wait is usually far below a millisecond
+POOL_WAIT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests being handled", ["method"])
+DB_SESSION_DURATION = Histogram(
+    "db_session_duration_seconds", "Lifetime of a database session transaction", buckets=LATENCY_BUCKETS
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time to check a connection out of the pool", buckets=POOL_WAIT_BUCKETS
+)
+THREADPOOL_BUSY = Gauge("threadpool_busy_threads", "Threads of the endpoint thread pool running a request")
+THREADPOOL_QUEUE = Gauge("threadpool_queue_depth", "Requests waiting for a thread of the endpoint thread pool")
+THREADPOOL_SIZE = Gauge("threadpool_size", "Size of the endpoint thread pool")
+
+METRICS_PATH = "/metrics"
+
+# Label children by (method, route, status) and by method
+_durations = {}
+_in_progress = {}
+# Whether the SQLAlchemy listeners are registered (install)
+_installed = False
+
+
+def _after_transaction_create(session, transaction):
+    if transaction.parent is None:
+        session.info["transaction_start"] = time.perf_counter()
+
+
+def _after_begin(session, transaction, connection):
+    start = session.info.get("transaction_start")
+    if start is not None and transaction.parent is None:
+        DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        start = session.info.pop("transaction_start", None)
+        if start is not None:
+            DB_SESSION_DURATION.observe(time.perf_counter() - start)
+
+
+def install() -> None:
+    """Start observing session transactions (only needed while metrics are on)."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    event.listen(Session, "after_transaction_create", _after_transaction_create)
+    event.listen(Session, "after_begin", _after_begin)
+    event.listen(Session, "after_transaction_end", _after_transaction_end)
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording latency and in-flight requests of every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = _in_progress.get(method)
+        if in_progress is None:
+            in_progress = _in_progress[method] = REQUESTS_IN_PROGRESS.labels(method)
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            key = (method, route.path if route is not None else "unmatched", status["code"])
+            child = _durations.get(key)
+            if child is None:
+                child = _durations[key] = REQUEST_DURATION.labels(*key)
+            child.observe(duration)
+
+
+async def metrics_endpoint():
+    """Prometheus text exposition of all metrics."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    statistics = limiter.statistics()
+    THREADPOOL_BUSY.set(statistics.borrowed_tokens)
+    THREADPOOL_QUEUE.set(statistics.tasks_waiting)
+    THREADPOOL_SIZE.set(limiter.total_tokens)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
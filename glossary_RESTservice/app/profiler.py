@@ -0,0 +1,125 @@
+"""
+Sampling profiler for on-demand captures under load.
+
+While a capture runs, a background thread takes the Python stack of every
+other thread every `interval` seconds (sys._current_frames) and counts
+identical stacks. Nothing is traced between samples, so the service runs at
+full speed apart from one stack walk per thread and sample.
+
+The result is in collapsed ("folded") stack format, one line per stack from
+the thread down to the innermost function, followed by its sample count:
+
+    AnyIO worker thread;_bootstrap (lib/threading.py);...;get_term (routers/terms.py) 42
+
+flamegraph.pl, inferno or https://www.speedscope.app render it as a flame
+graph. Threads waiting for work (idle pool threads, the event loop selector)
+are left out unless idle=True; use idle=True to see lock contention as well.
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_SECONDS = 30.0
+DEFAULT_INTERVAL = 0.01
+MAX_SECONDS = 300.0
+
+# Innermost frames of threads that wait for work: (file name, function)
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    # uvloop runs the event loop in C: an idle loop shows asyncio.run as innermost frame
+    ("runners.py", "run"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("_server.py", "_serve"),
+}
+
+# One capture at a time
+_capture_lock = threading.Lock()
+
+
+def frame_label(code) -> str:
+    path = Path(code.co_filename)
+    return f"{code.co_name} ({path.parent.name}/{path.name})"
+
+
+def thread_label(name: str) -> str:
+    """Group the threads of a pool under one name (ThreadPoolExecutor-0_3 -> ThreadPoolExecutor)."""
+    return re.sub(r"[-_]\d+", "", name)
+
+
+class SamplingProfiler:
+    """Background thread counting the stacks of all other threads."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, idle: bool = False, exclude=()):
+        self.interval = interval
+        self.idle = idle
+        self.exclude = set(exclude)
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self):
+        self.exclude.add(threading.get_ident())
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id in self.exclude:
+                    continue
+                code = frame.f_code
+                if not self.idle and (Path(code.co_filename).name, code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(thread_label(names.get(thread_id, str(thread_id))))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed stacks."""
+        self._stop.set()
+        self._thread.join()
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def start_capture(interval: float = DEFAULT_INTERVAL, idle: bool = False, exclude=()):
+    """
+    Start a capture, leaving out the threads in `exclude`.
+
+    Returns:
+        The running SamplingProfiler, or None when another capture is running.
+    """
+    if not _capture_lock.acquire(blocking=False):
+        return None
+    profiler = SamplingProfiler(interval, idle, exclude)
+    profiler.start()
+    return profiler
+
+
+def finish_capture(profiler: SamplingProfiler) -> str:
+    """Stop a capture started by start_capture and return the collapsed stacks."""
+    try:
+        return profiler.stop()
+    finally:
+        _capture_lock.release()
+
+
+def capture(seconds: float, interval: float = DEFAULT_INTERVAL, idle: bool = False):
+    """Profile for `seconds` (blocking); None when another capture is running."""
+    # The calling thread only sleeps
+    profiler = start_capture(interval, idle, exclude=(threading.get_ident(),))
+    if profiler is None:
+        return None
+    time.sleep(seconds)
+    return finish_capture(profiler)
@@ -0,0 +1,39 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from .. import gc_monitor, profiler
+from ..config import settings
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], include_in_schema=False)
+
+
+@router.get("/profile", response_class=PlainTextResponse, summary="Profile the service")
+async def profile(
+    seconds: float = Query(profiler.DEFAULT_SECONDS, gt=0, le=profiler.MAX_SECONDS),
+    interval: float = Query(profiler.DEFAULT_INTERVAL, ge=0.001, le=1.0),
+    idle: bool = False,
+):
+    """Sample all threads for `seconds` and return the collapsed stacks."""
+    if not settings.profiling:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled (APP_PROFILING)")
+    capture = profiler.start_capture(interval, idle)
+    if capture is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile capture is already running")
+    try:
+        # Sleep on the event loop: the capture must not hold an endpoint thread
+        await asyncio.sleep(seconds)
+    finally:
+        stacks = profiler.finish_capture(capture)
+    return PlainTextResponse(stacks)
+
+
+@router.get("/gc", summary="GC pauses and allocation snapshots")
+def gc_report(since: float = Query(0, ge=0, description="Unix time of the first pause to report")):
+    """GC pauses and tracemalloc snapshots since `since` (see app.gc_monitor.report)."""
+    if not settings.gc_stats:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="GC statistics are disabled (APP_GC_STATS)")
+    # Plain lists and numbers: skip jsonable_encoder, the report can hold many pauses
+    return JSONResponse(gc_monitor.report(since))
@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.routing import APIRoute
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from ..config import settings
 from ..db import get_db
 from ..models import Term
 from ..schemas import TermCreate, TermUpdate, TermOut
+from ..timing import TimedRoute
 
 
-router = APIRouter(prefix="/terms", tags=["terms"])
+# Endpoints are wrapped for timing only while Server-Timing is on
+router = APIRouter(
+    prefix="/terms", tags=["terms"], route_class=TimedRoute if settings.server_timing else APIRoute
+)
 
 
 @router.get("", response_model=list[TermOut], summary="List all terms")
@@ -0,0 +1,154 @@
+"""
+Per-request timing of server phases, reported in the Server-Timing header.
+
+Phases (milliseconds):
+- framework: request received -> endpoint called (routing, body parsing and
+  validation, dependencies, dispatch to the thread pool)
+- db: SQL statements (execution up to the first row) and commits
+- app: rest of the endpoint (fetching rows, ORM mapping, application code)
+- serialize: endpoint returned -> response started (response model
+  validation, JSON encoding, dependency cleanup)
+- total: request received -> response started
+
+Example header: Server-Timing: framework;dur=0.412, db;dur=1.203, app;dur=0.310, serialize;dur=0.198, total;dur=2.123
+"""
+
+import inspect
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+
+
+class RequestTimings:
+    """Phase durations of one request (seconds)."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.handler_start = None
+        self.handler_end = None
+        self.commit_start = None
+        self.db = 0.0
+
+    def header(self) -> str:
+        end = time.perf_counter()
+        phases = {"total": end - self.start}
+        if self.handler_start is not None:
+            handler_end = self.handler_end or end
+            phases = {
+                "framework": self.handler_start - self.start,
+                "db": self.db,
+                "app": handler_end - self.handler_start - self.db,
+                "serialize": end - handler_end,
+                **phases,
+            }
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in phases.items())
+
+
+# Timings of the current request (the thread pool running sync endpoints copies the context)
+_current: ContextVar = ContextVar("request_timings", default=None)
+# Whether the SQLAlchemy listeners are registered (install)
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # The start goes on the statement's execution context: with StaticPool all
+    # threads share one connection, so conn.info would mix concurrent requests
+    if context is not None:
+        context._timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_timing_start", None)
+    timings = _current.get()
+    if timings is not None and start is not None:
+        timings.db += time.perf_counter() - start
+
+
+def _before_commit(conn):
+    timings = _current.get()
+    if timings is not None:
+        timings.commit_start = time.perf_counter()
+
+
+def _after_commit(session):
+    timings = _current.get()
+    if timings is not None and timings.commit_start is not None:
+        timings.db += time.perf_counter() - timings.commit_start
+        timings.commit_start = None
+
+
+def install() -> None:
+    """Start timing SQL statements and commits (only needed while Server-Timing is on)."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "commit", _before_commit)
+    event.listen(Session, "after_commit", _after_commit)
+
+
+def timed_endpoint(endpoint):
+    """Wrap an endpoint to record when it starts and returns."""
+    if inspect.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is not None:
+                timings.handler_start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if timings is not None:
+                    timings.handler_end = time.perf_counter()
+    else:
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is not None:
+                timings.handler_start = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                if timings is not None:
+                    timings.handler_end = time.perf_counter()
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """Route class that separates the endpoint from framework and serialization time."""
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, timed_endpoint(endpoint), **kwargs)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding the Server-Timing header to every HTTP response."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", timings.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
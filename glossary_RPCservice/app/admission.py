@@ -0,0 +1,144 @@
+"""
+Admission control: shed load instead of queueing without bound.
+
+Without it every call is accepted: under overload the calls pile up in the
+server's ThreadPoolExecutor queue and latency grows to seconds for everybody.
+With APP_ADMISSION_MAX_IN_FLIGHT set, server.interceptors.AdmissionInterceptor
+lets at most that many calls run at once:
+- when all slots are taken and APP_ADMISSION_MAX_QUEUE calls already wait
+  (in the executor queue or for a slot), a new call is rejected with
+  RESOURCE_EXHAUSTED when it arrives; it only passes through the thread pool
+  to send its status
+- a call that waited longer than APP_ADMISSION_QUEUE_TIMEOUT_MS, in the
+  executor queue or for a slot, is rejected with RESOURCE_EXHAUSTED without
+  running
+Admitted calls therefore see a bounded queue wait and rejected ones fail fast,
+so the client can back off. Keep the limit at or below APP_GRPC_MAX_WORKERS:
+calls above the thread count wait in the executor queue anyway.
+
+With APP_ADMISSION_ADAPTIVE the limit is an AIMD concurrency limit between 1
+and the configured maximum (see ConcurrencyLimit): it backs off when calls
+take longer than APP_ADMISSION_LATENCY_TARGET_MS or are shed at the deadline,
+and grows slowly while the calls finish in time.
+
+Metrics: admission_limit, admission_in_flight, admission_queued and
+admission_rejected_total{reason} (queue_full, deadline).
+"""
+
+import threading
+import time
+
+from prometheus_client import Counter, Gauge
+
+LIMIT = Gauge("admission_limit", "Current concurrency limit of admission control")
+IN_FLIGHT = Gauge("admission_in_flight", "Calls admitted and running")
+QUEUED = Gauge("admission_queued", "Calls waiting for admission")
+REJECTED = Counter("admission_rejected_total", "Calls shed by admission control", ["reason"])
+
+REJECT_DETAILS = "Server overloaded"
+
+
+class ConcurrencyLimit:
+    """
+    Static concurrency limit, or AIMD adaptive limit between 1 and max_limit.
+
+    Adaptive: a call slower than the latency target or shed at its queue
+    deadline multiplies the limit by BACKOFF, once per congestion event (only
+    calls admitted after the previous backoff can trigger the next one).
+    A call finishing in time while at least half of the limit is in use adds
+    1/limit, i.e. about one slot per limit calls.
+    """
+
+    BACKOFF = 0.9
+
+    def __init__(self, max_limit: int, adaptive: bool = False, latency_target: float = 0.2):
+        self.max_limit = max_limit
+        self.adaptive = adaptive
+        self.latency_target = latency_target
+        self.value = float(max_limit)
+        # Incremented on every backoff
+        self.epoch = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self.value)
+
+    def on_success(self, latency: float, in_flight: int, epoch: int):
+        if not self.adaptive:
+            return
+        if latency > self.latency_target:
+            self.on_drop(epoch)
+        elif in_flight * 2 >= self.limit:
+            self.value = min(self.max_limit, self.value + 1 / self.value)
+
+    def on_drop(self, epoch: int):
+        if self.adaptive and epoch == self.epoch:
+            self.value = max(1.0, self.value * self.BACKOFF)
+            self.epoch += 1
+
+
+class AdmissionController:
+    """Thread-safe slots for running calls, with waiting up to a deadline."""
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int = 100,
+        queue_timeout: float = 0.1,
+        adaptive: bool = False,
+        latency_target: float = 0.2,
+        queue_depth=lambda: 0,
+    ):
+        self.limit = ConcurrencyLimit(max_in_flight, adaptive, latency_target)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        # Calls waiting for a thread of the server (the executor's queue length)
+        self.queue_depth = queue_depth
+        self.in_flight = 0
+        # Calls holding a thread while they wait for a slot
+        self.waiting = 0
+        self._condition = threading.Condition()
+        LIMIT.set_function(lambda: self.limit.limit)
+        IN_FLIGHT.set_function(lambda: self.in_flight)
+        QUEUED.set_function(lambda: self.waiting + self.queue_depth())
+        self._rejected = {reason: REJECTED.labels(reason) for reason in ("queue_full", "deadline")}
+
+    def has_room(self) -> bool:
+        """Whether a new call may queue: a free slot, or fewer than max_queue calls waiting."""
+        return self.in_flight < self.limit.limit or self.waiting + self.queue_depth() < self.max_queue
+
+    def acquire(self, deadline: float, epoch: int):
+        """
+        Wait for a slot until `deadline` (perf_counter time).
+
+        Args:
+            deadline: Arrival time of the call plus the queue timeout
+            epoch: Limit epoch when the call arrived
+
+        Returns:
+            The limit epoch to pass to release, or None when the deadline passed.
+        """
+        with self._condition:
+            # A call that spent its deadline in the executor queue is stale even when a slot is free
+            remaining = deadline - time.perf_counter()
+            admitted = False
+            if remaining > 0:
+                self.waiting += 1
+                try:
+                    admitted = self._condition.wait_for(lambda: self.in_flight < self.limit.limit, remaining)
+                finally:
+                    self.waiting -= 1
+            if not admitted:
+                self.limit.on_drop(epoch)
+                return None
+            self.in_flight += 1
+            return self.limit.epoch
+
+    def release(self, latency: float, epoch: int):
+        with self._condition:
+            self.limit.on_success(latency, self.in_flight, epoch)
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def rejected(self, reason: str):
+        self._rejected[reason].inc()
@@ -3,6 +3,37 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./glossary.db"
+    # TLS: when both files are set the server listens with ssl_server_credentials
+    tls_cert_file: str | None = None
+    tls_key_file: str | None = None
+    # HTTP/2 tuning (unset values keep grpc defaults)
+    grpc_max_workers: int = 10
+    grpc_max_concurrent_streams: int | None = None
+    grpc_max_message_length: int | None = None
+    # Minimum interval between client keepalive pings the server tolerates
+    grpc_keepalive_min_time_ms: int | None = None
+    # Instrumentation is off by default, so a benchmark measures the bare service
+    # unless a run asks for more (scripts/start_grpc_service.ps1 -Instrument)
+    # Per-call phase timings in the server-timing trailing metadata
+    server_timing: bool = False
+    # Prometheus metrics (GET /metrics on the metrics port)
+    metrics: bool = False
+    # HTTP port of /metrics, /profile and /gc, opened when any of them is on (0: none)
+    metrics_port: int | None = 9464
+    # On-demand sampling profiler (GET /profile on the metrics port; unauthenticated)
+    profiling: bool = False
+    # GC pause timing (python_gc_pause_seconds, GET /gc on the metrics port for per-run reports)
+    gc_stats: bool = False
+    # Seconds between tracemalloc snapshots (0: no allocation tracing; slows the service down)
+    tracemalloc_interval: int = 0
+    # Admission control: calls running at once (0: no limit, no load shedding)
+    admission_max_in_flight: int = 0
+    # Calls waiting for a slot, and how long they may wait before RESOURCE_EXHAUSTED
+    admission_max_queue: int = 100
+    admission_queue_timeout_ms: int = 100
+    # Adapt the limit (AIMD) between 1 and admission_max_in_flight to keep latency under the target
+    admission_adaptive: bool = False
+    admission_latency_target_ms: int = 200
 
     class Config:
         env_prefix = "APP_"
@@ -0,0 +1,149 @@
+"""
+Prometheus metrics of the server, exposed on a separate HTTP port (/metrics).
+
+- grpc_server_handling_seconds{grpc_method, grpc_code}: method latency
+- grpc_server_in_progress{grpc_method}: calls being handled
+- db_session_duration_seconds: lifetime of a session's transaction
+  (begin -> commit/rollback/close)
+- db_pool_wait_seconds: transaction begin -> connection checked out of the pool
+- threadpool_busy_threads / threadpool_queue_depth / threadpool_size: the
+  server thread pool (read when /metrics is scraped)
+
+The calls are recorded by server.interceptors.MetricsInterceptor (APP_METRICS).
+The same port serves
+- GET /profile?seconds=30&interval=0.01&idle=false: the collapsed stacks of a
+  sampling profiler capture (app.profiler; APP_PROFILING)
+- GET /gc?since=<unix time>: GC pauses and tracemalloc snapshots as JSON
+  (app.gc_monitor; APP_GC_STATS)
+"""
+
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from prometheus_client import Gauge, Histogram
+from prometheus_client.exposition import MetricsHandler
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import gc_monitor, profiler
+from app.config import settings
+
+# Latency buckets from 1 ms to 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Pool wait is usually far below a millisecond
+POOL_WAIT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+HANDLING_DURATION = Histogram(
+    "grpc_server_handling_seconds", "gRPC method latency", ["grpc_method", "grpc_code"], buckets=LATENCY_BUCKETS
+)
+CALLS_IN_PROGRESS = Gauge("grpc_server_in_progress", "gRPC calls being handled", ["grpc_method"])
+DB_SESSION_DURATION = Histogram(
+    "db_session_duration_seconds", "Lifetime of a database session transaction", buckets=LATENCY_BUCKETS
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time to check a connection out of the pool", buckets=POOL_WAIT_BUCKETS
+)
+THREADPOOL_BUSY = Gauge("threadpool_busy_threads", "Threads of the server thread pool running a call")
+THREADPOOL_QUEUE = Gauge("threadpool_queue_depth", "Calls waiting for a thread of the server thread pool")
+THREADPOOL_SIZE = Gauge("threadpool_size", "Size of the server thread pool")
+
+# Whether the SQLAlchemy listeners are registered (install)
+_installed = False
+
+
+def _after_transaction_create(session, transaction):
+    if transaction.parent is None:
+        session.info["transaction_start"] = time.perf_counter()
+
+
+def _after_begin(session, transaction, connection):
+    start = session.info.get("transaction_start")
+    if start is not None and transaction.parent is None:
+        DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        start = session.info.pop("transaction_start", None)
+        if start is not None:
+            DB_SESSION_DURATION.observe(time.perf_counter() - start)
+
+
+def install() -> None:
+    """Start observing session transactions (only needed while metrics are on)."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    event.listen(Session, "after_transaction_create", _after_transaction_create)
+    event.listen(Session, "after_begin", _after_begin)
+    event.listen(Session, "after_transaction_end", _after_transaction_end)
+
+
+class AdminHandler(MetricsHandler):
+    """Serve GET /profile and GET /gc, any other path with the metrics (each only when enabled)."""
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/profile":
+            if settings.profiling:
+                self._profile(params)
+            else:
+                self._reply(404, "Profiling is disabled (APP_PROFILING)\n")
+        elif url.path == "/gc":
+            if settings.gc_stats:
+                self._gc(params)
+            else:
+                self._reply(404, "GC statistics are disabled (APP_GC_STATS)\n")
+        elif settings.metrics:
+            super().do_GET()
+        else:
+            self._reply(404, "Metrics are disabled (APP_METRICS)\n")
+
+    def _profile(self, params: dict) -> None:
+        try:
+            seconds = float(params.get("seconds", profiler.DEFAULT_SECONDS))
+            interval = float(params.get("interval", profiler.DEFAULT_INTERVAL))
+        except ValueError:
+            self._reply(400, "seconds and interval must be numbers\n")
+            return
+        if not 0 < seconds <= profiler.MAX_SECONDS or not 0.001 <= interval <= 1.0:
+            self._reply(400, f"seconds must be in (0, {profiler.MAX_SECONDS:g}], interval in [0.001, 1]\n")
+            return
+        stacks = profiler.capture(seconds, interval, params.get("idle", "false").lower() in ("1", "true", "yes"))
+        if stacks is None:
+            self._reply(409, "A profile capture is already running\n")
+            return
+        self._reply(200, stacks)
+
+    def _gc(self, params: dict) -> None:
+        try:
+            since = float(params.get("since", 0))
+        except ValueError:
+            self._reply(400, "since must be a Unix time\n")
+            return
+        self._reply(200, json.dumps(gc_monitor.report(since)), "application/json")
+
+    def _reply(self, status: int, text: str, content_type: str = "text/plain; charset=utf-8") -> None:
+        body = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port: int, executor) -> None:
+    """Serve /metrics, /profile and /gc on the port, reporting the state of the server's ThreadPoolExecutor."""
+    # ThreadPoolExecutor has no public statistics: read its queue and idle thread count
+    THREADPOOL_SIZE.set(executor._max_workers)
+    THREADPOOL_QUEUE.set_function(executor._work_queue.qsize)
+    THREADPOOL_BUSY.set_function(lambda: max(len(executor._threads) - executor._idle_semaphore._value, 0))
+    # A thread per request: a running capture must not block scrapes
+    httpd = ThreadingHTTPServer(("0.0.0.0", port), AdminHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name="metrics-server", daemon=True).start()
@@ -0,0 +1,92 @@
+"""
+Per-call timing of server phases, reported in the server-timing trailing metadata.
+
+Phases (milliseconds):
+- deserialize: request message parsing
+- db: SQL statements (execution up to the first row) and commits
+- app: rest of the method (fetching rows, ORM mapping, building the response)
+- serialize: response message encoding
+- total: deserialize start -> serialize end
+
+The value uses the HTTP Server-Timing syntax, e.g.
+deserialize;dur=0.021, db;dur=1.203, app;dur=0.310, serialize;dur=0.015, total;dur=1.549
+"""
+
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+METADATA_KEY = "server-timing"
+
+
+class RequestTimings:
+    """Phase durations of one call (seconds)."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.deserialize = 0.0
+        self.handler_start = None
+        self.handler_end = None
+        self.serialize = 0.0
+        self.commit_start = None
+        self.db = 0.0
+
+    def value(self) -> str:
+        phases = {"deserialize": self.deserialize}
+        if self.handler_start is not None:
+            handler_end = self.handler_end or time.perf_counter()
+            phases.update({
+                "db": self.db,
+                "app": handler_end - self.handler_start - self.db,
+                "serialize": self.serialize,
+            })
+        phases["total"] = time.perf_counter() - self.start
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in phases.items())
+
+
+# Timings of the current call (each call runs in one thread of the server pool)
+current = ContextVar("request_timings", default=None)
+# Whether the SQLAlchemy listeners are registered (install)
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # The start goes on the statement's execution context: with StaticPool all
+    # threads share one connection, so conn.info would mix concurrent requests
+    if context is not None:
+        context._timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_timing_start", None)
+    timings = current.get()
+    if timings is not None and start is not None:
+        timings.db += time.perf_counter() - start
+
+
+def _before_commit(conn):
+    timings = current.get()
+    if timings is not None:
+        timings.commit_start = time.perf_counter()
+
+
+def _after_commit(session):
+    timings = current.get()
+    if timings is not None and timings.commit_start is not None:
+        timings.db += time.perf_counter() - timings.commit_start
+        timings.commit_start = None
+
+
+def install() -> None:
+    """Start timing SQL statements and commits (only needed while Server-Timing is on)."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "commit", _before_commit)
+    event.listen(Session, "after_commit", _after_commit)
@@ -1,14 +1,98 @@
+import os
 import sys
+import threading
+import time
+from pathlib import Path
+
 import grpc
 
 import glossary_pb2 as pb
-import glossary_pb2_grpc as rpc
+from client.pool import ChannelPool, build_channel_options
+
+
+ADDRESS = "localhost:50051"
+
+
+def open_channel(address: str, options: list | None = None) -> grpc.Channel:
+    """Open a TLS channel when GRPC_TLS_CA_FILE is set, a plaintext one otherwise."""
+    ca_file = os.getenv("GRPC_TLS_CA_FILE")
+    if ca_file:
+        credentials = grpc.ssl_channel_credentials(root_certificates=Path(ca_file).read_bytes())
+        return grpc.secure_channel(address, credentials, options=options)
+    return grpc.insecure_channel(address, options=options)
+
+
+def open_pool(size: int | None = None) -> ChannelPool:
+    """Open a channel pool configured from GRPC_CHANNEL_POOL_SIZE, GRPC_KEEPALIVE_* and GRPC_MAX_MESSAGE_LENGTH."""
+    options = build_channel_options(
+        keepalive_time_ms=int(os.getenv("GRPC_KEEPALIVE_TIME_MS", "0")),
+        keepalive_timeout_ms=int(os.getenv("GRPC_KEEPALIVE_TIMEOUT_MS", "0")),
+        max_message_length=int(os.getenv("GRPC_MAX_MESSAGE_LENGTH", "0")),
+    )
+    if size is None:
+        size = int(os.getenv("GRPC_CHANNEL_POOL_SIZE", "1"))
+    return ChannelPool(ADDRESS, size=size, options=options, channel_factory=open_channel)
+
+
+def bench(duration: float, concurrency: int, pool_sizes: list[int]) -> None:
+    """
+    Measure the client throughput ceiling for each pool size.
+
+    `concurrency` threads call GetTerm (ListTerms on an empty database) back to
+    back for `duration` seconds over a pool of each size.
+    """
+    with open_pool(1) as pool:
+        items = pool.stub().ListTerms(pb.ListTermsRequest()).items
+    keyword = items[0].keyword if items else None
+
+    print(f"{'pool':>6} {'calls':>8} {'errors':>7} {'rps':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for size in pool_sizes:
+        with open_pool(size) as pool:
+            pool.wait_ready(timeout=10)
+            latencies: list[float] = []
+            errors = [0]
+            lock = threading.Lock()
+            deadline = time.perf_counter() + duration
+
+            def worker() -> None:
+                local, failed = [], 0
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        if keyword is None:
+                            pool.stub().ListTerms(pb.ListTermsRequest())
+                        else:
+                            pool.stub().GetTerm(pb.GetTermRequest(keyword=keyword))
+                        local.append(time.perf_counter() - start)
+                    except grpc.RpcError:
+                        failed += 1
+                with lock:
+                    latencies.extend(local)
+                    errors[0] += failed
+
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0
+        print(f"{size:>6} {len(latencies):>8} {errors[0]:>7} {len(latencies) / duration:>9.1f} {p50:>8.2f} {p99:>8.2f}")
 
 
 def main() -> None:
-    with grpc.insecure_channel("localhost:50051") as channel:
-        stub = rpc.GlossaryServiceStub(channel)
-        cmd = sys.argv[1] if len(sys.argv) > 1 else "list"
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if cmd == "bench":
+        duration = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+        concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+        pool_sizes = [int(n) for n in sys.argv[4:]] or [1, 2, 4, 8]
+        bench(duration, concurrency, pool_sizes)
+        return
+
+    with open_pool() as pool:
+        stub = pool.stub()
 
         if cmd == "list":
             resp = stub.ListTerms(pb.ListTermsRequest())
@@ -38,6 +122,7 @@ def main() -> None:
                 "  create <keyword> <description>\n"
                 "  update <keyword> <description>\n"
                 "  delete <keyword>\n"
+                "  bench [seconds] [concurrency] [pool sizes...]\n"
             )
 
 
@@ -0,0 +1,105 @@
+"""
+Round-robin pool of gRPC channels.
+
+A grpc channel multiplexes every call over a single HTTP/2 connection, and the
+Python client serializes part of the per-call work on that channel, so one
+channel caps the throughput of a busy client. ChannelPool opens several
+channels, each with its own connection, and hands out stubs in turn.
+"""
+
+from itertools import count
+from typing import Callable, Optional
+
+import grpc
+
+import glossary_pb2_grpc as rpc
+
+
+# Channels with identical arguments share connections through grpc's global
+# subchannel pool; a local pool per channel gives each one its own connection.
+POOL_CHANNEL_OPTIONS = [("grpc.use_local_subchannel_pool", 1)]
+
+
+def build_channel_options(
+    keepalive_time_ms: Optional[int] = None,
+    keepalive_timeout_ms: Optional[int] = None,
+    max_message_length: Optional[int] = None,
+) -> list:
+    """
+    Build grpc channel arguments for pooled channels.
+
+    Args:
+        keepalive_time_ms: Interval between HTTP/2 keepalive pings (None keeps grpc default)
+        keepalive_timeout_ms: Time to wait for a ping ack before closing the connection
+        max_message_length: Max send/receive message size in bytes (None keeps 4 MB default)
+
+    Returns:
+        List of (key, value) channel arguments.
+    """
+    options = []
+    if keepalive_time_ms:
+        options += [
+            ("grpc.keepalive_time_ms", keepalive_time_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+        ]
+        if keepalive_timeout_ms:
+            options.append(("grpc.keepalive_timeout_ms", keepalive_timeout_ms))
+    if max_message_length:
+        options += [
+            ("grpc.max_send_message_length", max_message_length),
+            ("grpc.max_receive_message_length", max_message_length),
+        ]
+    return options
+
+
+class ChannelPool:
+    """
+    Fixed-size pool of channels to one address with round-robin stub selection.
+
+    Channels connect lazily on first use (call wait_ready() to connect eagerly).
+    Safe to share between threads and greenlets.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        size: int = 1,
+        options: Optional[list] = None,
+        channel_factory: Callable[..., grpc.Channel] = grpc.insecure_channel,
+    ):
+        """
+        Args:
+            address: Service address (host:port)
+            size: Number of channels (connections) in the pool
+            options: Extra channel arguments applied to every channel
+            channel_factory: Called as channel_factory(address, options=...) to
+                open a channel, e.g. to create secure channels
+        """
+        channel_options = POOL_CHANNEL_OPTIONS + list(options or [])
+        self.channels = [channel_factory(address, options=channel_options) for _ in range(max(1, size))]
+        self._stubs = [rpc.GlossaryServiceStub(channel) for channel in self.channels]
+        self._counter = count()
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def __enter__(self) -> "ChannelPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def stub(self) -> rpc.GlossaryServiceStub:
+        """Return the stub of the next channel in round-robin order."""
+        return self._stubs[next(self._counter) % len(self._stubs)]
+
+    def wait_ready(self, timeout: Optional[float] = None) -> None:
+        """Connect every channel, raising grpc.FutureTimeoutError on timeout."""
+        for channel in self.channels:
+            grpc.channel_ready_future(channel).result(timeout=timeout)
+
+    def close(self) -> None:
+        """Close all channels."""
+        for channel in self.channels:
+            channel.close()
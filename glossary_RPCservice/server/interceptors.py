@@ -0,0 +1,154 @@
+import time
+
+import grpc
+
+from app.admission import REJECT_DETAILS
+from app.metrics import CALLS_IN_PROGRESS, HANDLING_DURATION
+from app.timing import METADATA_KEY, RequestTimings, current
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Record latency by method and status code, and calls in progress, for unary calls."""
+
+    def __init__(self):
+        # Label children by (method, code) and by method
+        self._durations = {}
+        self._in_progress = {}
+
+    def _duration(self, method: str, code: grpc.StatusCode):
+        child = self._durations.get((method, code))
+        if child is None:
+            child = self._durations[(method, code)] = HANDLING_DURATION.labels(method, code.name)
+        return child
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        behavior = handler.unary_unary
+        method = handler_call_details.method
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = self._in_progress[method] = CALLS_IN_PROGRESS.labels(method)
+
+        def unary_unary(request, context):
+            in_progress.inc()
+            start = time.perf_counter()
+            code = grpc.StatusCode.OK
+            try:
+                return behavior(request, context)
+            except BaseException:
+                code = grpc.StatusCode.UNKNOWN
+                raise
+            finally:
+                duration = time.perf_counter() - start
+                in_progress.dec()
+                # Set by context.abort() / context.set_code()
+                self._duration(method, context.code() or code).observe(duration)
+
+        return handler._replace(unary_unary=unary_unary)
+
+
+class ServerTimingInterceptor(grpc.ServerInterceptor):
+    """
+    Time the phases of unary calls and send them as server-timing trailing metadata.
+
+    intercept_service runs for every call, and grpc runs the request
+    deserializer, the method and the response serializer of a unary call one
+    after another before it sends the status, so the wrapped serializer can
+    still set the trailing metadata.
+    """
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        behavior = handler.unary_unary
+        request_deserializer = handler.request_deserializer
+        response_serializer = handler.response_serializer
+        call = {"timings": None, "context": None}
+
+        def deserialize(data):
+            timings = call["timings"] = RequestTimings()
+            result = request_deserializer(data) if request_deserializer else data
+            timings.deserialize = time.perf_counter() - timings.start
+            return result
+
+        def unary_unary(request, context):
+            timings = call["timings"] or RequestTimings()
+            call["context"] = context
+            # The SQLAlchemy listeners add database time to the timings of the current context
+            token = current.set(timings)
+            timings.handler_start = time.perf_counter()
+            try:
+                return behavior(request, context)
+            except BaseException:
+                # Aborted calls (NOT_FOUND, ...) end here: send the phases measured so far
+                timings.handler_end = time.perf_counter()
+                context.set_trailing_metadata(((METADATA_KEY, timings.value()),))
+                raise
+            finally:
+                timings.handler_end = time.perf_counter()
+                current.reset(token)
+
+        def serialize(response):
+            start = time.perf_counter()
+            result = response_serializer(response) if response_serializer else response
+            timings = call["timings"]
+            if timings is not None and call["context"] is not None:
+                timings.serialize = time.perf_counter() - start
+                call["context"].set_trailing_metadata(((METADATA_KEY, timings.value()),))
+            return result
+
+        return handler._replace(
+            unary_unary=unary_unary,
+            request_deserializer=deserialize,
+            response_serializer=serialize,
+        )
+
+
+def _reject(request, context):
+    context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, REJECT_DETAILS)
+
+
+class AdmissionInterceptor(grpc.ServerInterceptor):
+    """
+    Shed unary calls above the admission limit with RESOURCE_EXHAUSTED (see app.admission).
+
+    intercept_service runs in the server's polling thread when a call arrives,
+    before the call is queued for a worker thread: calls that find the slots
+    and the queue full are rejected there and only pass through the pool to
+    send their status. The others wait for a slot until their deadline.
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        controller = self.controller
+        if not controller.has_room():
+            controller.rejected("queue_full")
+            return handler._replace(unary_unary=_reject)
+
+        behavior = handler.unary_unary
+        epoch = controller.limit.epoch
+        deadline = time.perf_counter() + controller.queue_timeout
+
+        def unary_unary(request, context):
+            admitted = controller.acquire(deadline, epoch)
+            if admitted is None:
+                controller.rejected("deadline")
+                context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, REJECT_DETAILS)
+            start = time.perf_counter()
+            try:
+                return behavior(request, context)
+            finally:
+                controller.release(time.perf_counter() - start, admitted)
+
+        return handler._replace(unary_unary=unary_unary)
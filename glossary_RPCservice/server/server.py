@@ -12,8 +12,12 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from app.config import settings
 from app.db import SessionLocal, engine
-from app import models
+from app import gc_monitor, metrics, models, timing
+from app.metrics import start_metrics_server
+from app.admission import AdmissionController
+from server.interceptors import AdmissionInterceptor, MetricsInterceptor, ServerTimingInterceptor
 
 import glossary_pb2 as pb
 import glossary_pb2_grpc as rpc
@@ -76,12 +80,67 @@ class GlossaryService(rpc.GlossaryServiceServicer):
             return pb.DeleteTermResponse(ok=True)
 
 
+def server_options() -> list:
+    """Build grpc server arguments from settings."""
+    options = []
+    if settings.grpc_max_concurrent_streams:
+        options.append(("grpc.max_concurrent_streams", settings.grpc_max_concurrent_streams))
+    if settings.grpc_max_message_length:
+        options.append(("grpc.max_send_message_length", settings.grpc_max_message_length))
+        options.append(("grpc.max_receive_message_length", settings.grpc_max_message_length))
+    if settings.grpc_keepalive_min_time_ms:
+        options.append(("grpc.http2.min_ping_interval_without_data_ms", settings.grpc_keepalive_min_time_ms))
+        options.append(("grpc.keepalive_permit_without_calls", 1))
+    return options
+
+
+def server_interceptors(executor=None) -> list:
+    """Build server interceptors from settings (executor: the server's thread pool, for admission control)."""
+    interceptors = []
+    if settings.metrics:
+        interceptors.append(MetricsInterceptor())
+    if settings.admission_max_in_flight:
+        # After the metrics interceptor: shed calls are counted as RESOURCE_EXHAUSTED
+        controller = AdmissionController(
+            settings.admission_max_in_flight,
+            max_queue=settings.admission_max_queue,
+            queue_timeout=settings.admission_queue_timeout_ms / 1000,
+            adaptive=settings.admission_adaptive,
+            latency_target=settings.admission_latency_target_ms / 1000,
+            # ThreadPoolExecutor has no public queue length
+            queue_depth=executor._work_queue.qsize if executor is not None else lambda: 0,
+        )
+        interceptors.append(AdmissionInterceptor(controller))
+    if settings.server_timing:
+        interceptors.append(ServerTimingInterceptor())
+    return interceptors
+
+
 def serve() -> None:
     try_run_migrations()
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    if settings.gc_stats:
+        gc_monitor.install(settings.tracemalloc_interval)
+    if settings.server_timing:
+        timing.install()
+    if settings.metrics:
+        metrics.install()
+    executor = futures.ThreadPoolExecutor(max_workers=settings.grpc_max_workers)
+    server = grpc.server(
+        executor,
+        interceptors=server_interceptors(executor),
+        options=server_options(),
+    )
     rpc.add_GlossaryServiceServicer_to_server(GlossaryService(), server)
-    server.add_insecure_port("[::]:50051")
+    if settings.tls_cert_file and settings.tls_key_file:
+        credentials = grpc.ssl_server_credentials(
+            [(Path(settings.tls_key_file).read_bytes(), Path(settings.tls_cert_file).read_bytes())]
+        )
+        server.add_secure_port("[::]:50051", credentials)
+    else:
+        server.add_insecure_port("[::]:50051")
     server.start()
+    if settings.metrics_port and (settings.metrics or settings.profiling or settings.gc_stats):
+        start_metrics_server(settings.metrics_port, executor)
     server.wait_for_termination()
 
 
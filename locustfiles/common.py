@@ -5,10 +5,15 @@ This module provides shared functions for generating test data,
 loading configuration, and other utilities used by both REST and gRPC test classes.
 """
 
+import bisect
+import math
 import os
 import random
 import string
-from typing import List, Optional
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+import yaml
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,6 +24,36 @@ REST_SERVICE_URL = os.getenv("REST_SERVICE_URL", "http://localhost:8000")
 GRPC_SERVICE_HOST = os.getenv("GRPC_SERVICE_HOST", "localhost")
 GRPC_SERVICE_PORT = int(os.getenv("GRPC_SERVICE_PORT", "50051"))
 
+# TLS configuration (certificates are generated by scripts/generate_certs.py)
+TLS_ENABLED = os.getenv("TLS_ENABLED", "false").lower() in ("1", "true", "yes")
+TLS_CA_FILE = os.getenv("TLS_CA_FILE", "certs/ca.pem")
+
+# Connection lifecycle (rest_connection_users.py, grpc_connection_users.py): modes,
+# size of the shared pool used by pooled users and timeout of connect and requests
+CONNECTION_MODE_PER_REQUEST = "per_request"
+CONNECTION_MODE_PER_USER = "per_user"
+CONNECTION_MODE_POOLED = "pooled"
+CONNECTION_POOL_SIZE = int(os.getenv("CONNECTION_POOL_SIZE", "10"))
+CONNECTION_TIMEOUT = 30
+
+# gRPC channel pool shared by GrpcUser instances of one Locust process
+GRPC_CHANNEL_POOL_SIZE = int(os.getenv("GRPC_CHANNEL_POOL_SIZE", "1"))
+GRPC_KEEPALIVE_TIME_MS = int(os.getenv("GRPC_KEEPALIVE_TIME_MS", "0"))
+GRPC_KEEPALIVE_TIMEOUT_MS = int(os.getenv("GRPC_KEEPALIVE_TIMEOUT_MS", "0"))
+GRPC_MAX_MESSAGE_LENGTH = int(os.getenv("GRPC_MAX_MESSAGE_LENGTH", "0"))
+
+# Project root (relative paths from the environment are resolved against it)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Service and scenario being run (exported by run_benchmark.sh / run_benchmark.ps1)
+BENCHMARK_SERVICE = os.getenv("BENCHMARK_SERVICE", "")
+BENCHMARK_SCENARIO = os.getenv("BENCHMARK_SCENARIO", "")
+BENCHMARK_CONFIG = os.getenv("BENCHMARK_CONFIG", "config/test_scenarios.yaml")
+
+# Optional keyword file (one keyword per line) preloading the shared keyword pool;
+# "{service}" is replaced by the pool name (rest or grpc)
+KEYWORD_POOL_FILE = os.getenv("KEYWORD_POOL_FILE", "")
+
 # Sample keywords for generating test data
 SAMPLE_KEYWORDS = [
     "API", "REST", "gRPC", "HTTP", "HTTPS", "JSON", "XML", "SOAP",
@@ -192,15 +227,144 @@ def generate_description(keyword: Optional[str] = None) -> str:
     return random.choice(SAMPLE_DESCRIPTIONS)
 
 
-def generate_term_data() -> dict:
+# Size limits of generated descriptions (description_size in config/test_scenarios.yaml)
+MIN_DESCRIPTION_SIZE = 100
+MAX_DESCRIPTION_SIZE = 1024 * 1024
+
+# ASCII text sized descriptions are cut from (one character = one byte in JSON and protobuf)
+_DESCRIPTION_TEXT = " ".join(SAMPLE_DESCRIPTIONS) + ". "
+
+_SIZE_UNITS = {"b": 1, "kb": 1024, "mb": 1024 * 1024}
+
+
+def parse_size(value) -> int:
+    """
+    Parse a size in bytes ("512", "100B", "10KB", "1MB").
+    
+    Args:
+        value: Size string or number of bytes
+    
+    Returns:
+        Size in bytes.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().lower()
+    for unit in ("kb", "mb", "b"):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * _SIZE_UNITS[unit])
+    return int(float(text))
+
+
+def generate_sized_description(size: int) -> str:
+    """
+    Generate a description of exactly `size` bytes.
+    
+    The text is cut from the sample descriptions at a random offset, so
+    descriptions differ but compress like natural text.
+    """
+    text = _DESCRIPTION_TEXT
+    start = random.randrange(len(text))
+    repeats = (start + size) // len(text) + 1
+    return (text * repeats)[start:start + size]
+
+
+class DescriptionSize:
+    """
+    Size distribution of generated descriptions: fixed or lognormal.
+    
+    A lognormal size has the given median and shape sigma and is clamped to
+    [minimum, maximum], by default MIN_DESCRIPTION_SIZE..MAX_DESCRIPTION_SIZE.
+    """
+    
+    def __init__(
+        self,
+        size: int,
+        sigma: float = 0.0,
+        minimum: int = MIN_DESCRIPTION_SIZE,
+        maximum: int = MAX_DESCRIPTION_SIZE
+    ):
+        if not 1 <= size <= MAX_DESCRIPTION_SIZE:
+            raise ValueError(f"Description size must be between 1 and {MAX_DESCRIPTION_SIZE} bytes, got {size}")
+        if sigma < 0 or minimum > maximum:
+            raise ValueError("sigma must be >= 0 and minimum <= maximum")
+        self.size = size
+        self.sigma = sigma
+        self.minimum = minimum
+        self.maximum = min(maximum, MAX_DESCRIPTION_SIZE)
+    
+    def __repr__(self) -> str:
+        if self.sigma:
+            return f"lognormal(median={self.size}, sigma={self.sigma:g})"
+        return f"fixed({self.size})"
+    
+    def sample(self) -> int:
+        """Get the size of the next description in bytes."""
+        if not self.sigma:
+            return self.size
+        size = int(random.lognormvariate(math.log(self.size), self.sigma))
+        return max(self.minimum, min(self.maximum, size))
+    
+    def generate(self) -> str:
+        """Generate a description of a sampled size."""
+        return generate_sized_description(self.sample())
+
+
+def parse_description_size(config) -> Optional[DescriptionSize]:
+    """
+    Create a DescriptionSize from a scenario's description_size value.
+    
+    Args:
+        config: Fixed size ("10KB", 1024) or dictionary:
+            {type: fixed, bytes: 10KB} or {type: lognormal, median: 4KB, sigma: 1.0, min: 100B, max: 1MB}
+    
+    Returns:
+        DescriptionSize, or None for the default short sample descriptions.
+    """
+    if not config:
+        return None
+    if not isinstance(config, dict):
+        return DescriptionSize(parse_size(config))
+    kind = config.get("type", "fixed")
+    if kind == "fixed":
+        return DescriptionSize(parse_size(config["bytes"]))
+    if kind == "lognormal":
+        return DescriptionSize(
+            parse_size(config["median"]),
+            sigma=float(config.get("sigma", 1.0)),
+            minimum=parse_size(config.get("min", MIN_DESCRIPTION_SIZE)),
+            maximum=parse_size(config.get("max", MAX_DESCRIPTION_SIZE)),
+        )
+    raise ValueError(f"Unknown description_size type '{kind}'. Available: fixed, lognormal")
+
+
+def get_description_size(scenario: Optional[dict] = None) -> Optional[DescriptionSize]:
+    """
+    Get the description size of a scenario (description_size).
+    
+    Args:
+        scenario: Scenario dictionary (default: the scenario selected by BENCHMARK_SCENARIO)
+    """
+    if scenario is None:
+        scenario = load_scenario_config()
+    return parse_description_size(scenario.get("description_size"))
+
+
+def generate_term_data(description_size: Optional[DescriptionSize] = None) -> dict:
     """
     Generate a complete term data dictionary for API requests.
     
+    Args:
+        description_size: Size of the description (default: a short sample description)
+    
     Returns:
         Dictionary with 'keyword' and 'description' keys.
     """
     keyword = generate_keyword()
-    description = generate_description(keyword)
+    if description_size is not None:
+        description = description_size.generate()
+    else:
+        description = generate_description(keyword)
     return {
         "keyword": keyword,
         "description": description
@@ -208,7 +372,9 @@ def generate_term_data() -> dict:
 
 
 def get_rest_service_url() -> str:
-    """Get REST service URL from environment or default."""
+    """Get REST service URL from environment or default (https in TLS mode)."""
+    if TLS_ENABLED and REST_SERVICE_URL.startswith("http://"):
+        return "https://" + REST_SERVICE_URL[len("http://"):]
     return REST_SERVICE_URL
 
 
@@ -227,6 +393,86 @@ def get_grpc_service_address() -> str:
     return f"{GRPC_SERVICE_HOST}:{GRPC_SERVICE_PORT}"
 
 
+def get_connection_pool_size() -> int:
+    """Get number of connections shared by pooled users in one Locust process."""
+    return max(1, CONNECTION_POOL_SIZE)
+
+
+def get_grpc_channel_pool_size() -> int:
+    """Get number of gRPC channels (HTTP/2 connections) shared by GrpcUser instances."""
+    return max(1, GRPC_CHANNEL_POOL_SIZE)
+
+
+def is_tls_enabled() -> bool:
+    """Check whether the services are benchmarked over TLS."""
+    return TLS_ENABLED
+
+
+def get_tls_ca_file() -> str:
+    """Get absolute path of the CA certificate used to verify both services."""
+    path = Path(TLS_CA_FILE)
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    return str(path)
+
+
+def parse_duration(value) -> float:
+    """
+    Parse a Locust-style duration ("90", "30s", "5m", "1h30m") into seconds.
+    
+    Args:
+        value: Duration string or number of seconds
+    
+    Returns:
+        Duration in seconds.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().lower()
+    if text.replace(".", "", 1).isdigit():
+        return float(text)
+    seconds, number = 0.0, ""
+    for char in text:
+        if char.isdigit() or char == ".":
+            number += char
+        elif char in "hms" and number:
+            seconds += float(number) * {"h": 3600, "m": 60, "s": 1}[char]
+            number = ""
+        else:
+            raise ValueError(f"Invalid duration: {value!r}")
+    if number:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return seconds
+
+
+def load_benchmark_config() -> dict:
+    """Load the benchmark configuration (BENCHMARK_CONFIG, default config/test_scenarios.yaml)."""
+    path = Path(BENCHMARK_CONFIG)
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def load_scenario_config(scenario: Optional[str] = None) -> dict:
+    """
+    Load a scenario from the benchmark configuration.
+    
+    Args:
+        scenario: Scenario key (default: BENCHMARK_SCENARIO from the environment)
+    
+    Returns:
+        Scenario dictionary, or an empty dictionary when no scenario is selected.
+    """
+    scenario = scenario or BENCHMARK_SCENARIO
+    if not scenario:
+        return {}
+    config = load_benchmark_config()
+    if scenario not in config["scenarios"]:
+        raise ValueError(f"Unknown scenario '{scenario}' in {BENCHMARK_CONFIG}")
+    return config["scenarios"][scenario]
+
+
 def extract_keywords_from_response(response_data: List[dict]) -> List[str]:
     """
     Extract keywords from API response data.
@@ -265,6 +511,279 @@ def get_random_keyword(keywords: List[str]) -> Optional[str]:
     return random.choice(keywords)
 
 
+class RankOrder:
+    """
+    Keywords in the order they were added, indexed by rank among the remaining ones.
+    
+    Removed keywords leave a hole, so the others keep their relative order. A
+    Fenwick tree counts the remaining keywords, which makes add, remove and
+    lookup by rank O(log n); the holes are compacted away once they make up
+    half of the sequence.
+    """
+    
+    def __init__(self, keywords: Iterable[str] = ()):
+        self._keywords: List[Optional[str]] = list(keywords)
+        self._index: Dict[str, int] = {keyword: position for position, keyword in enumerate(self._keywords)}
+        self._build_tree()
+    
+    def _build_tree(self):
+        """Build the Fenwick tree of a sequence without holes in O(n)."""
+        size = len(self._keywords)
+        self._tree = [1] * size
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                self._tree[parent - 1] += self._tree[i - 1]
+    
+    def _prefix(self, i: int) -> int:
+        """Count the keywords among the first i positions."""
+        count = 0
+        while i > 0:
+            count += self._tree[i - 1]
+            i -= i & -i
+        return count
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def __getitem__(self, rank: int) -> str:
+        """Get the keyword with 0-based rank `rank` among the remaining keywords."""
+        if not 0 <= rank < len(self._index):
+            raise IndexError(rank)
+        position, remaining = 0, rank + 1
+        step = 1 << (len(self._tree).bit_length() - 1)
+        while step:
+            candidate = position + step
+            if candidate <= len(self._tree) and self._tree[candidate - 1] < remaining:
+                position = candidate
+                remaining -= self._tree[candidate - 1]
+            step >>= 1
+        return self._keywords[position]
+    
+    def add(self, keyword: str):
+        i = len(self._keywords) + 1
+        self._index[keyword] = i - 1
+        self._keywords.append(keyword)
+        # The new node covers positions (i - lowbit(i), i]
+        self._tree.append(1 + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+    
+    def remove(self, keyword: str):
+        i = self._index.pop(keyword) + 1
+        self._keywords[i - 1] = None
+        while i <= len(self._tree):
+            self._tree[i - 1] -= 1
+            i += i & -i
+        if len(self._index) * 2 < len(self._keywords):
+            self._keywords = [keyword for keyword in self._keywords if keyword is not None]
+            self._index = {keyword: position for position, keyword in enumerate(self._keywords)}
+            self._build_tree()
+
+
+class KeywordPool:
+    """
+    Keywords known to exist in a service, shared by all users of a Locust process.
+    
+    Keywords are stored in a list (for O(1) random choice) plus a dictionary
+    mapping each keyword to its position. Removal moves the last keyword into
+    the freed slot, so add, remove and random choice are all O(1).
+    
+    Key distributions rank the keywords by the order they were added (see
+    RankOrder), which removals do not change; pool[rank] is O(log n).
+    """
+    
+    def __init__(self, keywords: Iterable[str] = ()):
+        self._keywords: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._order = RankOrder()
+        self._lock = threading.Lock()
+        self.loaded = False
+        for keyword in keywords:
+            self.add(keyword)
+    
+    def __len__(self) -> int:
+        return len(self._keywords)
+    
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._index
+    
+    def __getitem__(self, rank: int) -> str:
+        """Get the keyword with 0-based rank `rank` in the order keywords were added."""
+        return self._order[rank]
+    
+    def add(self, keyword: str) -> bool:
+        """Add a keyword. Returns False if it is already in the pool."""
+        if keyword in self._index:
+            return False
+        self._index[keyword] = len(self._keywords)
+        self._keywords.append(keyword)
+        self._order.add(keyword)
+        return True
+    
+    def remove(self, keyword: str) -> bool:
+        """Remove a keyword. Returns False if it is not in the pool."""
+        position = self._index.pop(keyword, None)
+        if position is None:
+            return False
+        last = self._keywords.pop()
+        if position < len(self._keywords):
+            self._keywords[position] = last
+            self._index[last] = position
+        self._order.remove(keyword)
+        return True
+    
+    def replace(self, keywords: Iterable[str]):
+        """Replace the pool contents."""
+        self._keywords = list(dict.fromkeys(keywords))
+        self._index = {keyword: position for position, keyword in enumerate(self._keywords)}
+        self._order = RankOrder(self._keywords)
+    
+    def random(self) -> Optional[str]:
+        """Get a random keyword, or None if the pool is empty."""
+        if not self._keywords:
+            return None
+        return random.choice(self._keywords)
+    
+    def load_once(self, loader: Callable[[], Iterable[str]], keyword_file: Optional[str] = None) -> bool:
+        """
+        Fill the pool once per process.
+        
+        Users spawned while the first one is loading wait for it instead of
+        loading again. If loading fails, the next caller tries again.
+        
+        Args:
+            loader: Called to fetch the keywords (e.g. one List Terms request)
+            keyword_file: Keyword file to read instead of calling loader
+        
+        Returns:
+            True if this call loaded the pool.
+        """
+        with self._lock:
+            if self.loaded:
+                return False
+            if keyword_file:
+                with open(keyword_file, "r", encoding="utf-8") as f:
+                    self.replace(line.strip() for line in f if line.strip())
+            else:
+                self.replace(loader())
+            self.loaded = True
+            return True
+
+
+_keyword_pools: Dict[str, KeywordPool] = {}
+
+
+def get_keyword_pool(name: str) -> KeywordPool:
+    """
+    Get the keyword pool shared by the users of one service in this process.
+    
+    Args:
+        name: Pool name, one per service ("rest" or "grpc")
+    """
+    if name not in _keyword_pools:
+        _keyword_pools[name] = KeywordPool()
+    return _keyword_pools[name]
+
+
+def get_keyword_pool_file(name: str) -> Optional[str]:
+    """Get the keyword file for a pool (KEYWORD_POOL_FILE), or None to load from the service."""
+    if not KEYWORD_POOL_FILE:
+        return None
+    path = Path(KEYWORD_POOL_FILE.replace("{service}", name))
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    return str(path)
+
+
+# Key popularity distributions (key_distribution in config/test_scenarios.yaml)
+KEY_DISTRIBUTIONS = ("uniform", "zipf", "hotspot", "latest")
+
+class KeyDistribution:
+    """
+    Popularity of the keywords of a KeywordPool.
+    
+    Keywords are ranked by the order they were added to the pool (loaded
+    keywords in List Terms order, created keywords appended; removals keep
+    the order of the others):
+    - uniform: every keyword equally likely
+    - zipf: rank r (from the start of the pool) has weight 1 / r^s
+    - hotspot: the first hot_keys share of the keywords gets hot_traffic share of requests
+    - latest: zipf counted from the end of the pool, so recently created keywords are hottest
+    
+    Every choice uses the current pool size. Zipf ranks are found by binary
+    search in the cumulative weights of ranks 1..n, which do not depend on n
+    and are only extended as the pool grows; hotspot ranks are O(1).
+    """
+    
+    def __init__(self, kind: str = "uniform", s: float = 1.0, hot_keys: float = 0.2, hot_traffic: float = 0.8):
+        if kind not in KEY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown key distribution '{kind}'. Available: {', '.join(KEY_DISTRIBUTIONS)}")
+        if not 0 < hot_keys < 1 or not 0 <= hot_traffic <= 1:
+            raise ValueError("hot_keys must be in (0, 1) and hot_traffic in [0, 1]")
+        self.kind = kind
+        self.s = s
+        self.hot_keys = hot_keys
+        self.hot_traffic = hot_traffic
+        # Zipf: cumulative weight of ranks 1..k at index k - 1
+        self.cumulative: List[float] = []
+    
+    def sample_rank(self, n: int) -> int:
+        """Get a random 0-based rank for a pool of n > 0 keywords."""
+        if self.kind == "hotspot":
+            hot = min(n - 1, max(1, int(n * self.hot_keys)))
+            if hot < 1:
+                return 0
+            if random.random() < self.hot_traffic:
+                return random.randrange(hot)
+            return hot + random.randrange(n - hot)
+        cumulative = self.cumulative
+        total = cumulative[-1] if cumulative else 0.0
+        for rank in range(len(cumulative) + 1, n + 1):
+            total += 1.0 / (rank ** self.s)
+            cumulative.append(total)
+        return bisect.bisect_right(cumulative, random.random() * cumulative[n - 1], 0, n - 1)
+    
+    def choose(self, pool: KeywordPool) -> Optional[str]:
+        """Get a keyword of the pool, or None if the pool is empty."""
+        n = len(pool)
+        if n == 0:
+            return None
+        if self.kind == "uniform":
+            return pool.random()
+        rank = self.sample_rank(n)
+        return pool[n - 1 - rank] if self.kind == "latest" else pool[rank]
+
+
+def parse_key_distribution(config) -> KeyDistribution:
+    """
+    Create a KeyDistribution from a scenario's key_distribution value.
+    
+    Args:
+        config: Distribution name ("zipf") or dictionary with type and parameters
+            ({type: zipf, s: 1.1}, {type: hotspot, hot_keys: 0.2, hot_traffic: 0.8})
+    """
+    if not config:
+        return KeyDistribution()
+    if isinstance(config, str):
+        return KeyDistribution(config)
+    params = {key: float(value) for key, value in config.items() if key != "type"}
+    return KeyDistribution(config.get("type", "uniform"), **params)
+
+
+_key_distributions: Dict[str, KeyDistribution] = {}
+
+
+def get_key_distribution(name: str) -> KeyDistribution:
+    """
+    Get the key distribution of a keyword pool (from the selected scenario's key_distribution).
+    
+    Args:
+        name: Pool name, one per service ("rest" or "grpc")
+    """
+    if name not in _key_distributions:
+        _key_distributions[name] = parse_key_distribution(load_scenario_config().get("key_distribution"))
+    return _key_distributions[name]
+
+
 def create_unique_keyword(existing_keywords: set, base: Optional[str] = None) -> str:
     """
     Create a unique keyword that doesn't exist in the provided set.
@@ -298,3 +817,76 @@ TASK_WEIGHT_CREATE = 2    # 20% probability (2 out of 10)
 WAIT_TIME_MIN = 1  # Minimum seconds between requests
 WAIT_TIME_MAX = 3  # Maximum seconds between requests
 
+# Operations a scenario can mix (operation_mix in config/test_scenarios.yaml)
+OPERATIONS = ("list", "get", "create", "update", "delete")
+
+# Mix used by scenarios without operation_mix
+DEFAULT_OPERATION_MIX = {
+    "list": TASK_WEIGHT_LIST,
+    "get": TASK_WEIGHT_GET,
+    "create": TASK_WEIGHT_CREATE,
+}
+
+
+def get_operation_mix(scenario: Optional[dict] = None) -> Dict[str, int]:
+    """
+    Get the operation weights of a scenario.
+    
+    Args:
+        scenario: Scenario dictionary (default: the scenario selected by BENCHMARK_SCENARIO)
+    
+    Returns:
+        Weight of each operation in OPERATIONS (0 for operations that are not run).
+    """
+    if scenario is None:
+        scenario = load_scenario_config()
+    mix = scenario.get("operation_mix") or DEFAULT_OPERATION_MIX
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in operation_mix: {', '.join(sorted(unknown))}")
+    weights = {operation: int(mix.get(operation, 0)) for operation in OPERATIONS}
+    if any(weight < 0 for weight in weights.values()) or not any(weights.values()):
+        raise ValueError(f"Invalid operation_mix {mix}: weights must be >= 0 and not all 0")
+    return weights
+
+
+def get_think_time(scenario: Optional[dict] = None) -> tuple:
+    """
+    Get the think time between a user's requests.
+    
+    Scenarios set think_time either to a number of seconds or to {min, max};
+    without it WAIT_TIME_MIN..WAIT_TIME_MAX is used.
+    
+    Args:
+        scenario: Scenario dictionary (default: the scenario selected by BENCHMARK_SCENARIO)
+    
+    Returns:
+        Tuple of (minimum, maximum) seconds.
+    """
+    if scenario is None:
+        scenario = load_scenario_config()
+    think_time = scenario.get("think_time")
+    if think_time is None:
+        return WAIT_TIME_MIN, WAIT_TIME_MAX
+    if isinstance(think_time, dict):
+        return float(think_time.get("min", 0)), float(think_time.get("max", think_time.get("min", 0)))
+    return float(think_time), float(think_time)
+
+
+def build_task_weights(task_functions: Dict[str, Callable], mix: Dict[str, int]) -> Dict[Callable, int]:
+    """
+    Build a Locust tasks dictionary from an operation mix.
+    
+    Args:
+        task_functions: Task function of each operation
+        mix: Operation weights (see get_operation_mix)
+    
+    Returns:
+        Dictionary of task function to weight, without operations of weight 0.
+    """
+    return {
+        task_functions[operation]: weight
+        for operation, weight in mix.items()
+        if weight > 0
+    }
+
@@ -0,0 +1,60 @@
+"""
+Locust load testing for REST API service with FastHttpUser.
+
+RestUser is built on HttpUser (python-requests), which costs enough CPU per
+request that at a few hundred users the Locust process saturates a core and
+becomes the bottleneck. FastRestUser runs the same tasks on FastHttpUser
+(geventhttpclient), which needs several times less CPU per request.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import gevent.ssl
+from locust import between
+from locust.contrib.fasthttp import FastHttpUser
+# Import the module (not the class) so Locust does not also run RestUser from this file
+import locustfiles.rest_user as rest_user
+from locustfiles.common import (
+    get_rest_service_url,
+    get_think_time,
+    is_tls_enabled,
+    get_tls_ca_file
+)
+
+
+def create_tls_context():
+    """Create an SSL context that verifies the service against the local CA."""
+    return gevent.ssl.create_default_context(cafile=get_tls_ca_file())
+
+
+class FastRestUser(rest_user.RestTasks, FastHttpUser):
+    """
+    Locust user class for testing REST API service with geventhttpclient.
+
+    Runs RestUser's tasks with the same weights (the scenario's operation_mix,
+    by default 50% List, 30% Get, 20% Create) and the same think time.
+    """
+
+    # Base URL for REST service (from environment or default)
+    host = get_rest_service_url()
+
+    # Wait time between requests (realistic user behavior)
+    wait_time = between(*get_think_time())
+
+    # In TLS mode verify the service certificate against the local CA
+    if is_tls_enabled():
+        ssl_context_factory = staticmethod(create_tls_context)
+
+    # Same task weights as RestUser (the tasks come from RestTasks)
+    tasks = rest_user.RestUser.tasks
+
+    def on_start(self):
+        """
+        Called when a user starts. Loads existing terms for use in tests.
+        """
+        self.load_terms()
@@ -0,0 +1,90 @@
+"""
+Load generator CPU reporting.
+
+A Locust process that saturates its CPU core measures its own scheduling
+delays instead of the service, so results are only comparable while the
+generator has headroom. Locust samples its process CPU every few seconds and
+fires the usage_monitor event; this module records those samples (and, on a
+master, the CPU of every worker) to <csv_prefix>_generator_cpu.csv and logs a
+summary when the test ends. Locust versions without the event record nothing.
+
+Imported by the locustfiles for its event listeners.
+"""
+
+import csv
+import logging
+import time
+
+from locust import events
+from locust.runners import MasterRunner, WorkerRunner
+
+# Above this CPU usage the generator itself is likely the bottleneck
+GENERATOR_CPU_LIMIT = 90.0
+
+CSV_HEADER = ["Timestamp", "Source", "CPU %", "Memory MB", "User Count"]
+
+_samples = []
+_state = {"first_event": True}
+
+
+def _csv_path(environment):
+    """Get the generator CPU CSV path, or None when --csv is not used."""
+    options = environment.parsed_options
+    prefix = getattr(options, "csv_prefix", None) if options else None
+    return f"{prefix}_generator_cpu.csv" if prefix else None
+
+
+def on_usage_monitor(environment, cpu_usage, memory_usage, **kwargs):
+    """Record a CPU sample of this process and, on a master, of each worker."""
+    runner = environment.runner
+    if isinstance(runner, WorkerRunner):
+        # Workers report their CPU to the master with the heartbeat
+        return
+    if _state["first_event"]:
+        # psutil's first cpu_percent() reading has no reference interval (always 0)
+        _state["first_event"] = False
+        return
+
+    timestamp = int(time.time())
+    if isinstance(runner, MasterRunner):
+        _samples.append([timestamp, "master", cpu_usage, memory_usage / 2**20, runner.user_count])
+        for worker in runner.clients.values():
+            _samples.append([timestamp, worker.id, worker.cpu_usage, worker.memory_usage / 2**20, worker.user_count])
+    else:
+        _samples.append([timestamp, "local", cpu_usage, memory_usage / 2**20, runner.user_count])
+
+
+# Older Locust releases have no usage_monitor event; they run without CPU samples
+if hasattr(events, "usage_monitor"):
+    events.usage_monitor.add_listener(on_usage_monitor)
+else:
+    logging.warning("This Locust version has no usage_monitor event: generator CPU is not recorded")
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    """Write collected samples and log average/maximum CPU per source."""
+    if not _samples:
+        return
+
+    path = _csv_path(environment)
+    if path:
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for timestamp, source, cpu, memory, users in _samples:
+                writer.writerow([timestamp, source, f"{cpu:.1f}", f"{memory:.1f}", users])
+
+    by_source = {}
+    for _, source, cpu, _, _ in _samples:
+        by_source.setdefault(source, []).append(cpu)
+    for source, values in by_source.items():
+        peak = max(values)
+        logging.info(
+            f"Generator CPU ({source}): avg {sum(values) / len(values):.1f}%, max {peak:.1f}%"
+        )
+        if peak > GENERATOR_CPU_LIMIT:
+            logging.warning(
+                f"Generator CPU ({source}) reached {peak:.1f}%: the load generator may be the bottleneck "
+                f"(use FastRestUser or distribute the load over more Locust processes)"
+            )
@@ -0,0 +1,172 @@
+"""
+Goodput: requests that succeeded within the latency objective.
+
+Under overload, throughput alone is misleading: a server that accepts
+everything keeps its request rate while every response comes too late to be
+useful, and a server that sheds load fails some requests fast so the others
+finish in time. This module splits every request into
+- good: succeeded within the scenario's goodput_slo_ms (default: expected_p95)
+- slow: succeeded, but later than the objective
+- shed: rejected by the services' admission control (HTTP 429 or gRPC
+  RESOURCE_EXHAUSTED "Server overloaded")
+- failed: any other failure
+
+At the end it writes per endpoint and in total the counts, goodput per second,
+the shares and the p50/p99 of the successful requests to
+<csv_prefix>_goodput.csv and logs the totals. In distributed mode workers send
+their counts with the regular stats report and the master merges them.
+Imported by the locustfiles for its event listeners.
+"""
+
+import csv
+import logging
+
+from locust import events
+from locust.runners import WorkerRunner
+
+from locustfiles.common import load_scenario_config
+from locustfiles.server_timing import PhaseStats
+
+CSV_HEADER = [
+    "Type", "Name", "Requests", "Good", "Slow", "Shed", "Failed",
+    "Goodput/s", "Good %", "Shed %", "Success 50%", "Success 99%",
+]
+
+# Objective when the scenario sets neither goodput_slo_ms nor expected_p95
+DEFAULT_SLO_MS = 1000
+
+# Details of the gRPC status sent by the services' admission control
+SHED_DETAILS = "Server overloaded"
+
+
+def is_shed(response, exception) -> bool:
+    """Whether a failed request was rejected by admission control."""
+    if getattr(response, "status_code", None) == 429:
+        return True
+    code = getattr(exception, "code", None)
+    details = getattr(exception, "details", None)
+    return (
+        callable(code) and callable(details)
+        and getattr(code(), "name", None) == "RESOURCE_EXHAUSTED" and details() == SHED_DETAILS
+    )
+
+
+class Outcomes:
+    """Outcome counts and latency of the successful requests of one endpoint."""
+
+    def __init__(self):
+        self.good = 0
+        self.slow = 0
+        self.shed = 0
+        self.failed = 0
+        self.success = PhaseStats()
+
+    @property
+    def requests(self) -> int:
+        return self.good + self.slow + self.shed + self.failed
+
+    def merge(self, good: int, slow: int, shed: int, failed: int, count: int, total: float, values: list):
+        self.good += good
+        self.slow += slow
+        self.shed += shed
+        self.failed += failed
+        self.success.merge(count, total, values)
+
+
+# Outcomes by (request type, name); workers send and clear theirs
+_endpoints = {}
+_state = {"slo_ms": None}
+
+
+def slo_ms() -> float:
+    if _state["slo_ms"] is None:
+        scenario = load_scenario_config()
+        _state["slo_ms"] = float(scenario.get("goodput_slo_ms") or scenario.get("expected_p95") or DEFAULT_SLO_MS)
+    return _state["slo_ms"]
+
+
+@events.request.add_listener
+def on_request(request_type, name, response_time, response=None, exception=None, **kwargs):
+    """Classify a finished request."""
+    outcomes = _endpoints.get((request_type, name))
+    if outcomes is None:
+        outcomes = _endpoints[(request_type, name)] = Outcomes()
+    if exception:
+        if is_shed(response, exception):
+            outcomes.shed += 1
+        else:
+            outcomes.failed += 1
+        return
+    response_time = response_time or 0.0
+    outcomes.success.add(response_time)
+    if response_time <= slo_ms():
+        outcomes.good += 1
+    else:
+        outcomes.slow += 1
+
+
+@events.report_to_master.add_listener
+def on_report_to_master(client_id, data, **kwargs):
+    """Send this worker's outcomes since the last report to the master."""
+    data["goodput"] = [
+        [request_type, name, o.good, o.slow, o.shed, o.failed,
+         o.success.count, o.success.total, list(o.success.values.items())]
+        for (request_type, name), o in _endpoints.items()
+    ]
+    _endpoints.clear()
+
+
+@events.worker_report.add_listener
+def on_worker_report(client_id, data, **kwargs):
+    """Merge a worker's outcomes."""
+    for request_type, name, *counts in data.get("goodput", []):
+        outcomes = _endpoints.get((request_type, name))
+        if outcomes is None:
+            outcomes = _endpoints[(request_type, name)] = Outcomes()
+        outcomes.merge(*counts)
+
+
+def _row(request_type, name, outcomes: Outcomes, duration: float) -> list:
+    requests = outcomes.requests
+    success = outcomes.success
+    return [
+        request_type, name, requests, outcomes.good, outcomes.slow, outcomes.shed, outcomes.failed,
+        round(outcomes.good / duration, 2) if duration else "",
+        round(outcomes.good / requests * 100, 1) if requests else "",
+        round(outcomes.shed / requests * 100, 1) if requests else "",
+        success.percentile(0.5) if success.count else "",
+        success.percentile(0.99) if success.count else "",
+    ]
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    """Write the outcomes per endpoint and in total, and log the totals."""
+    if isinstance(environment.runner, WorkerRunner) or not _endpoints:
+        return
+
+    total = Outcomes()
+    rows = []
+    stats = environment.runner.stats.total
+    duration = (stats.last_request_timestamp or stats.start_time) - stats.start_time
+    for (request_type, name), outcomes in sorted(_endpoints.items(), key=lambda item: item[0][1]):
+        rows.append(_row(request_type, name, outcomes, duration))
+        success = outcomes.success
+        total.merge(outcomes.good, outcomes.slow, outcomes.shed, outcomes.failed,
+                    success.count, success.total, list(success.values.items()))
+    aggregated = _row("", "Aggregated", total, duration)
+    rows.append(aggregated)
+
+    logging.info(
+        f"Goodput: {aggregated[7]} req/s within {slo_ms():g} ms ({aggregated[8]}% of {total.requests} requests), "
+        f"shed {aggregated[9]}%, slow {total.slow}, failed {total.failed}; "
+        f"successful requests p50 {aggregated[10]} ms, p99 {aggregated[11]} ms"
+    )
+
+    options = environment.parsed_options
+    prefix = getattr(options, "csv_prefix", None) if options else None
+    if prefix:
+        with open(f"{prefix}_goodput.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(rows)
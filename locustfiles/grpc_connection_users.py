@@ -0,0 +1,299 @@
+"""
+Locust load testing of gRPC connection lifecycle strategies.
+
+GrpcUser shares its channels for the whole test, so connection setup never
+shows up in the results. The users in this module make the connection
+strategy explicit and compare three modes:
+
+- per_request: a new channel for every RPC (TCP + TLS handshake + HTTP/2
+  preface + RPC)
+- per_user: one channel per user, opened in on_start and reused
+- pooled: a shared pool of CONNECTION_POOL_SIZE channels used by all users
+  of the Locust process
+
+Connection setup is recorded as a separate "[Connect]" entry, so RPC times
+only cover the call itself. The REST counterparts are in
+rest_connection_users.py.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# Add glossary_RPCservice to path for protobuf imports
+grpc_service_path = project_root / "glossary_RPCservice"
+if str(grpc_service_path) not in sys.path:
+    sys.path.insert(0, str(grpc_service_path))
+
+import gevent
+import grpc
+from locust import User, events, between
+from locustfiles.common import (
+    get_grpc_service_address,
+    get_connection_pool_size,
+    generate_term_data,
+    generate_description,
+    get_keyword_pool,
+    get_keyword_pool_file,
+    get_key_distribution,
+    get_operation_mix,
+    get_think_time,
+    get_description_size,
+    build_task_weights,
+    CONNECTION_MODE_PER_REQUEST,
+    CONNECTION_MODE_PER_USER,
+    CONNECTION_MODE_POOLED,
+    CONNECTION_TIMEOUT
+)
+# Also enables grpc's gevent integration and registers the event listeners
+from locustfiles.grpc_user import create_grpc_channel, fire_request_event
+
+# Import protobuf generated files
+import glossary_pb2 as pb
+import glossary_pb2_grpc as rpc
+from client.pool import ChannelPool
+
+
+# Channels with identical arguments share subchannels (TCP connections) through
+# grpc's global subchannel pool; a local pool guarantees a really new connection.
+GRPC_FRESH_CONNECTION_OPTIONS = [("grpc.use_local_subchannel_pool", 1)]
+
+# How often grpc polls a subscribed channel's connectivity (grpc/_channel.py)
+GRPC_CONNECTIVITY_POLL_INTERVAL = 0.2
+
+
+class GrpcConnectionUser(User):
+    """
+    Base Locust user for gRPC tests with an explicit connection lifecycle.
+
+    Uses the same task mix and think time as GrpcUser (the scenario's
+    operation_mix and think_time) over channels managed according to
+    connection_mode. Channels are connected eagerly (channel_ready_future) so
+    the connect time is measured on its own.
+    """
+
+    abstract = True
+
+    # Connection lifecycle mode (one of CONNECTION_MODE_*)
+    connection_mode = CONNECTION_MODE_PER_USER
+
+    # Wait time between requests (realistic user behavior)
+    wait_time = between(*get_think_time())
+
+    # Size of created and updated descriptions (description_size, default: short samples)
+    description_size = get_description_size()
+
+    # Shared ChannelPool for CONNECTION_MODE_POOLED (HTTP/2 multiplexes, so no checkout is needed)
+    _pool = None
+
+    # Last per-request channels of stopped users, closed when Locust quits
+    _stopped_channels = []
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        # Hook request metrics are fired through (like HttpSession.request_event)
+        self.request_event = environment.events.request
+
+    def on_start(self):
+        """
+        Called when a user starts. Prepares channels and loads existing terms.
+        """
+        self.address = get_grpc_service_address()
+        self.channel = None
+        self._used_channel = None
+        if self.connection_mode == CONNECTION_MODE_PER_USER:
+            self.channel = self._connect()
+            self.stub = rpc.GlossaryServiceStub(self.channel)
+        elif self.connection_mode == CONNECTION_MODE_POOLED and GrpcConnectionUser._pool is None:
+            # Publish the pool before connecting so users spawned meanwhile do not build their own
+            GrpcConnectionUser._pool = ChannelPool(
+                self.address, size=get_connection_pool_size(), channel_factory=create_grpc_channel
+            )
+            for channel in GrpcConnectionUser._pool.channels:
+                self._wait_connected(channel)
+
+        self.keywords = get_keyword_pool("grpc")
+        self.key_distribution = get_key_distribution("grpc")
+        try:
+            self.keywords.load_once(self._fetch_keywords, get_keyword_pool_file("grpc"))
+        except Exception:
+            # The failed request is already recorded; the next user retries
+            pass
+
+    def on_stop(self):
+        """
+        Called when a user stops. Closes the per-user channel.
+        """
+        if self._used_channel is not None:
+            # grpc may still poll its connectivity, and Locust interrupts any wait
+            # here; keep it referenced until quitting (see close_stopped_channels)
+            GrpcConnectionUser._stopped_channels.append(self._used_channel)
+            self._used_channel = None
+        if self.channel is not None:
+            self.channel.close()
+            self.channel = None
+
+    def _connect(self) -> grpc.Channel:
+        """
+        Open a new channel and wait until it is connected.
+
+        Returns:
+            The channel (if connecting failed the channel keeps retrying on its own).
+        """
+        channel = create_grpc_channel(self.address, options=GRPC_FRESH_CONNECTION_OPTIONS)
+        self._wait_connected(channel)
+        return channel
+
+    def _wait_connected(self, channel: grpc.Channel):
+        """Connect a channel (TCP, TLS, HTTP/2 preface) and record the connect cost."""
+        start_time = time.perf_counter()
+        try:
+            grpc.channel_ready_future(channel).result(timeout=CONNECTION_TIMEOUT)
+            fire_request_event(
+                "[Connect]", (time.perf_counter() - start_time) * 1000, 0, request_event=self.request_event
+            )
+        except grpc.FutureTimeoutError as e:
+            fire_request_event(
+                "[Connect]", (time.perf_counter() - start_time) * 1000, 0, e, request_event=self.request_event
+            )
+
+    def _close_used_channel(self):
+        """
+        Close the channel left over from the previous per-request call.
+
+        Closing is deferred to the next call because grpc keeps polling a
+        channel's connectivity for a short while after channel_ready_future
+        resolves, and closing it under that poller raises in a grpc thread.
+        """
+        if self._used_channel is not None:
+            self._used_channel.close()
+            self._used_channel = None
+
+    def _call(self, method: str, request, name: str):
+        """
+        Perform one RPC over a channel chosen by the connection mode.
+
+        Returns:
+            Tuple of (response message or None, gRPC status code).
+        """
+        if self.connection_mode == CONNECTION_MODE_PER_REQUEST:
+            self._close_used_channel()
+            channel = self._connect()
+            self._used_channel = channel
+            stub = rpc.GlossaryServiceStub(channel)
+        elif self.connection_mode == CONNECTION_MODE_POOLED:
+            stub = GrpcConnectionUser._pool.stub()
+        else:
+            stub = self.stub
+
+        start_time = time.perf_counter()
+        try:
+            response = getattr(stub, method)(request, timeout=CONNECTION_TIMEOUT)
+            fire_request_event(
+                name, (time.perf_counter() - start_time) * 1000, response.ByteSize(),
+                request_event=self.request_event
+            )
+            return response, grpc.StatusCode.OK
+        except grpc.RpcError as e:
+            fire_request_event(
+                name, (time.perf_counter() - start_time) * 1000, 0, e, request_event=self.request_event
+            )
+            return None, e.code()
+
+    def _fetch_keywords(self) -> list:
+        """Load existing keywords with one ListTerms call (first user of the process)."""
+        response, code = self._call("ListTerms", pb.ListTermsRequest(), "[Setup] List Terms")
+        if response is None:
+            raise RuntimeError(f"ListTerms failed with status {code}")
+        return [item.keyword for item in response.items]
+
+    def task_list_terms(self):
+        """Task: Get list of all terms."""
+        self._call("ListTerms", pb.ListTermsRequest(), "List Terms")
+
+    def task_get_term(self):
+        """Task: Get a specific term by keyword (picked by the scenario's key_distribution)."""
+        keyword = self.key_distribution.choose(self.keywords)
+        if not keyword:
+            return
+        _, code = self._call("GetTerm", pb.GetTermRequest(keyword=keyword), "Get Term")
+        if code == grpc.StatusCode.NOT_FOUND:
+            self.keywords.remove(keyword)
+
+    def task_create_term(self):
+        """Task: Create a new term."""
+        term_data = generate_term_data(self.description_size)
+        request = pb.CreateTermRequest(
+            item=pb.Term(keyword=term_data["keyword"], description=term_data["description"])
+        )
+        response, _ = self._call("CreateTerm", request, "Create Term")
+        if response is not None:
+            self.keywords.add(response.item.keyword)
+
+    def task_update_term(self):
+        """Task: Update the description of an existing term."""
+        keyword = self.key_distribution.choose(self.keywords)
+        if not keyword:
+            return
+        if self.description_size is not None:
+            description = self.description_size.generate()
+        else:
+            description = generate_description(keyword)
+        request = pb.UpdateTermRequest(item=pb.Term(keyword=keyword, description=description))
+        _, code = self._call("UpdateTerm", request, "Update Term")
+        if code == grpc.StatusCode.NOT_FOUND:
+            self.keywords.remove(keyword)
+
+    def task_delete_term(self):
+        """Task: Delete an existing term (it leaves the shared pool before the call)."""
+        keyword = self.keywords.random()
+        if not keyword:
+            return
+        self.keywords.remove(keyword)
+        self._call("DeleteTerm", pb.DeleteTermRequest(keyword=keyword), "Delete Term")
+
+    # Task weights of the selected scenario (operation_mix)
+    tasks = build_task_weights(
+        {
+            "list": task_list_terms,
+            "get": task_get_term,
+            "create": task_create_term,
+            "update": task_update_term,
+            "delete": task_delete_term,
+        },
+        get_operation_mix(),
+    )
+
+
+@events.quitting.add_listener
+def close_stopped_channels(environment, **kwargs):
+    """Close the channels kept by stopped per-request users once their pollers are done."""
+    if GrpcConnectionUser._stopped_channels:
+        # Let grpc's connectivity poller (0.2 s interval) see the last futures resolved
+        gevent.sleep(GRPC_CONNECTIVITY_POLL_INTERVAL)
+    for channel in GrpcConnectionUser._stopped_channels:
+        channel.close()
+    GrpcConnectionUser._stopped_channels.clear()
+
+
+class GrpcPerRequestUser(GrpcConnectionUser):
+    """gRPC user that opens a new channel (HTTP/2 connection) for every RPC."""
+
+    connection_mode = CONNECTION_MODE_PER_REQUEST
+
+
+class GrpcPerUserConnectionUser(GrpcConnectionUser):
+    """gRPC user with one channel for its whole lifetime (same as GrpcUser)."""
+
+    connection_mode = CONNECTION_MODE_PER_USER
+
+
+class GrpcPooledUser(GrpcConnectionUser):
+    """gRPC user sending RPCs round-robin over channels shared by all users of the process."""
+
+    connection_mode = CONNECTION_MODE_POOLED
@@ -2,7 +2,8 @@
 Locust load testing for gRPC service.
 
 This module defines the GrpcUser class for testing the gRPC glossary service
-using Locust's User class and gRPC client.
+using Locust's User class and gRPC client. Importing it enables grpc's gevent
+integration, so blocking calls yield to other users instead of stalling them.
 """
 
 import sys
@@ -20,40 +21,130 @@ if str(grpc_service_path) not in sys.path:
     sys.path.insert(0, str(grpc_service_path))
 
 import grpc
-from locust import User, task, between, events
+import grpc.experimental.gevent as grpc_gevent
+from locust import User, between, events
 from locustfiles.common import (
     get_grpc_service_address,
+    get_grpc_channel_pool_size,
     generate_term_data,
-    get_random_keyword,
-    TASK_WEIGHT_LIST,
-    TASK_WEIGHT_GET,
-    TASK_WEIGHT_CREATE,
-    WAIT_TIME_MIN,
-    WAIT_TIME_MAX
+    generate_description,
+    get_keyword_pool,
+    get_keyword_pool_file,
+    get_key_distribution,
+    is_tls_enabled,
+    get_tls_ca_file,
+    get_operation_mix,
+    get_think_time,
+    get_description_size,
+    build_task_weights,
+    GRPC_KEEPALIVE_TIME_MS,
+    GRPC_KEEPALIVE_TIMEOUT_MS,
+    GRPC_MAX_MESSAGE_LENGTH
 )
+from locustfiles import generator_cpu  # noqa: F401  (registers event listeners)
+from locustfiles import goodput  # noqa: F401  (registers event listeners)
+from locustfiles import hdr_histograms  # noqa: F401  (registers event listeners)
+from locustfiles import run_metadata  # noqa: F401  (registers event listeners)
+from locustfiles import server_timing  # noqa: F401  (registers event listeners)
 
 # Import protobuf generated files
 import glossary_pb2 as pb
 import glossary_pb2_grpc as rpc
+from client.pool import ChannelPool, build_channel_options
 
+# Locust runs all users as greenlets of one thread. Without grpc's gevent
+# integration a blocking call (RPC, channel_ready_future) holds the event loop,
+# so one slow RPC stalls every user of the process. Locust has already
+# monkey-patched the standard library at this point, and no channel exists yet.
+grpc_gevent.init_gevent()
 
-def fire_request_event(name: str, response_time: float, response_length: int, exception: Exception = None):
+
+def create_grpc_channel(address: str, options: list = None) -> grpc.Channel:
+    """
+    Create a gRPC channel to the service.
+    
+    In TLS mode the channel is secured with the local CA certificate,
+    otherwise a plaintext channel is used.
+    
+    Args:
+        address: Service address (host:port)
+        options: Optional list of (key, value) channel arguments
+    
+    Returns:
+        A gRPC channel (connection is established lazily on first call).
+    """
+    if is_tls_enabled():
+        with open(get_tls_ca_file(), "rb") as f:
+            credentials = grpc.ssl_channel_credentials(root_certificates=f.read())
+        return grpc.secure_channel(address, credentials, options=options)
+    return grpc.insecure_channel(address, options=options)
+
+
+def fire_request_event(
+    name: str,
+    response_time: float,
+    response_length: int,
+    exception: Exception = None,
+    request_event=None,
+    call=None
+):
     """
     Fire a Locust request event to record metrics for gRPC calls.
     
     Args:
         name: Name of the request (for grouping in statistics)
         response_time: Response time in milliseconds
-        response_length: Response length in bytes (0 for gRPC as it's binary)
+        response_length: Response length in bytes (serialized message size, 0 if unknown)
         exception: Exception if request failed, None otherwise
+        request_event: Event hook to fire (default: locust.events.request)
+        call: Finished call (or grpc.RpcError) whose server-timing trailing
+            metadata is passed in the event context (locustfiles/server_timing.py)
     """
-    events.request.fire(
+    (request_event or events.request).fire(
         request_type="gRPC",
         name=name,
         response_time=response_time,
         response_length=response_length,
         exception=exception,
-        context={}
+        context={"server_timing": get_server_timing(call)} if call is not None else {}
+    )
+
+
+def get_server_timing(call) -> str:
+    """Get the server-timing trailing metadata of a finished call (None if the server sent none)."""
+    try:
+        metadata = call.trailing_metadata()
+    except Exception:
+        return None
+    for key, value in metadata or ():
+        if key == "server-timing":
+            return value
+    return None
+
+
+def create_channel_pool(address: str) -> ChannelPool:
+    """
+    Create the channel pool shared by GrpcUser instances.
+    
+    Size and channel options come from GRPC_CHANNEL_POOL_SIZE,
+    GRPC_KEEPALIVE_TIME_MS, GRPC_KEEPALIVE_TIMEOUT_MS and GRPC_MAX_MESSAGE_LENGTH.
+    
+    Args:
+        address: Service address (host:port)
+    
+    Returns:
+        A ChannelPool whose channels each hold their own HTTP/2 connection.
+    """
+    options = build_channel_options(
+        keepalive_time_ms=GRPC_KEEPALIVE_TIME_MS,
+        keepalive_timeout_ms=GRPC_KEEPALIVE_TIMEOUT_MS,
+        max_message_length=GRPC_MAX_MESSAGE_LENGTH,
+    )
+    return ChannelPool(
+        address,
+        size=get_grpc_channel_pool_size(),
+        options=options,
+        channel_factory=create_grpc_channel,
     )
 
 
@@ -61,129 +152,154 @@ class GrpcUser(User):
     """
     Locust user class for testing gRPC service.
     
-    Simulates realistic user behavior:
+    Simulates realistic user behavior (default mix, without operation_mix):
     - 50% of requests: List all terms (lightweight read operation)
     - 30% of requests: Get specific term (lightweight read operation)
     - 20% of requests: Create new term (write operation with DB commit)
     
-    Wait time between requests: 1-3 seconds (realistic user behavior)
+    Scenarios can change the mix, add Update/Delete (operation_mix) and set
+    the think time (think_time, default 1-3 seconds).
+    
+    All users of a Locust process share one ChannelPool and pick channels
+    round-robin per call (GRPC_CHANNEL_POOL_SIZE, default 1 connection), and
+    one pool of known keywords.
     """
     
     # Wait time between requests (realistic user behavior)
-    wait_time = between(WAIT_TIME_MIN, WAIT_TIME_MAX)
+    wait_time = between(*get_think_time())
+    
+    # Size of created and updated descriptions (description_size, default: short samples)
+    description_size = get_description_size()
+    
+    # Channel pool shared by all users of the process (created by the first user)
+    channel_pool = None
+    
+    def __init__(self, environment):
+        super().__init__(environment)
+        # Hook request metrics are fired through (like HttpSession.request_event)
+        self.request_event = environment.events.request
+    
+    @property
+    def stub(self) -> rpc.GlossaryServiceStub:
+        """Stub of the next pooled channel (round-robin)."""
+        return GrpcUser.channel_pool.stub()
     
     def on_start(self):
         """
-        Called when a user starts. Creates gRPC channel and loads existing terms.
+        Called when a user starts. Creates the shared channel pool and loads existing terms.
         """
-        # Create gRPC channel and stub
         self.address = get_grpc_service_address()
-        self.channel = grpc.insecure_channel(self.address)
-        self.stub = rpc.GlossaryServiceStub(self.channel)
+        if GrpcUser.channel_pool is None:
+            GrpcUser.channel_pool = create_channel_pool(self.address)
         
-        # Load list of existing terms to use in GET requests
-        try:
-            start_time = time.time()
-            request = pb.ListTermsRequest()
-            response = self.stub.ListTerms(request)
-            response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-            
-            # Extract keywords from response
-            self.terms = [item.keyword for item in response.items]
-            
-            # Record the setup request
-            fire_request_event("[Setup] List Terms", response_time, 0)
-        except Exception as e:
-            # If service is not available, start with empty list
-            self.terms = []
-            fire_request_event("[Setup] List Terms", 0, 0, e)
+        self.load_terms()
     
-    def on_stop(self):
+    def load_terms(self):
         """
-        Called when a user stops. Closes gRPC channel.
+        Load existing keywords into the pool shared by the users of this process.
+        
+        Only the first user of the process sends the ListTerms request (or reads
+        KEYWORD_POOL_FILE); users spawned later reuse its keywords.
         """
-        if hasattr(self, 'channel'):
-            self.channel.close()
+        self.keywords = get_keyword_pool("grpc")
+        self.key_distribution = get_key_distribution("grpc")
+        
+        def fetch_keywords():
+            start_time = time.time()
+            try:
+                response = self.stub.ListTerms(pb.ListTermsRequest())
+            except Exception as e:
+                fire_request_event(
+                    "[Setup] List Terms", (time.time() - start_time) * 1000, 0, e, request_event=self.request_event
+                )
+                raise
+            # Record the setup request
+            fire_request_event(
+                "[Setup] List Terms", (time.time() - start_time) * 1000, response.ByteSize(),
+                request_event=self.request_event
+            )
+            return [item.keyword for item in response.items]
+        
+        try:
+            self.keywords.load_once(fetch_keywords, get_keyword_pool_file("grpc"))
+        except Exception:
+            # If service is not available, start with an empty pool (the next user retries)
+            pass
     
-    @task(TASK_WEIGHT_LIST)
     def task_list_terms(self):
         """
         Task: Get list of all terms.
         
         This is a lightweight read operation (SELECT all from database).
-        Weight: 5 (50% probability)
+        Default weight: 5 (50% probability)
         """
         try:
             start_time = time.time()
             request = pb.ListTermsRequest()
-            response = self.stub.ListTerms(request)
+            response, call = self.stub.ListTerms.with_call(request)
             response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
             
-            # Update terms list
-            self.terms = [item.keyword for item in response.items]
-            
             # Record successful request
-            fire_request_event("List Terms", response_time, 0)
+            fire_request_event(
+                "List Terms", response_time, response.ByteSize(), request_event=self.request_event, call=call
+            )
         except grpc.RpcError as e:
             response_time = (time.time() - start_time) * 1000
-            fire_request_event("List Terms", response_time, 0, e)
+            fire_request_event("List Terms", response_time, 0, e, request_event=self.request_event, call=e)
         except Exception as e:
             response_time = (time.time() - start_time) * 1000 if 'start_time' in locals() else 0
-            fire_request_event("List Terms", response_time, 0, e)
+            fire_request_event("List Terms", response_time, 0, e, request_event=self.request_event)
     
-    @task(TASK_WEIGHT_GET)
     def task_get_term(self):
         """
         Task: Get a specific term by keyword.
         
         This is a lightweight read operation (SELECT with WHERE clause).
-        Weight: 3 (30% probability)
+        Default weight: 3 (30% probability)
         
-        Uses a random keyword from the list loaded in on_start().
+        Picks a keyword from the shared keyword pool according to the
+        scenario's key_distribution (uniform by default).
         If no terms are available, this task is skipped.
         """
-        if not self.terms:
-            # No terms available, skip this task
-            return
-        
-        keyword = get_random_keyword(self.terms)
+        keyword = self.key_distribution.choose(self.keywords)
         if not keyword:
+            # No terms available, skip this task
             return
         
         try:
             start_time = time.time()
             request = pb.GetTermRequest(keyword=keyword)
-            response = self.stub.GetTerm(request)
+            response, call = self.stub.GetTerm.with_call(request)
             response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
             
             # Record successful request
-            fire_request_event("Get Term", response_time, 0)
+            fire_request_event(
+                "Get Term", response_time, response.ByteSize(), request_event=self.request_event, call=call
+            )
         except grpc.RpcError as e:
             response_time = (time.time() - start_time) * 1000
             # Handle NOT_FOUND gracefully (term might have been deleted)
             if e.code() == grpc.StatusCode.NOT_FOUND:
-                if keyword in self.terms:
-                    self.terms.remove(keyword)
+                self.keywords.remove(keyword)
                 # Still record as error for statistics
-                fire_request_event("Get Term", response_time, 0, e)
+                fire_request_event("Get Term", response_time, 0, e, request_event=self.request_event)
             else:
-                fire_request_event("Get Term", response_time, 0, e)
+                fire_request_event("Get Term", response_time, 0, e, request_event=self.request_event)
         except Exception as e:
             response_time = (time.time() - start_time) * 1000 if 'start_time' in locals() else 0
-            fire_request_event("Get Term", response_time, 0, e)
+            fire_request_event("Get Term", response_time, 0, e, request_event=self.request_event)
     
-    @task(TASK_WEIGHT_CREATE)
     def task_create_term(self):
         """
         Task: Create a new term.
         
         This is a write operation (SELECT check + INSERT + COMMIT).
-        Weight: 2 (20% probability)
+        Default weight: 2 (20% probability)
         
         Generates unique keyword to avoid conflicts.
         """
         # Generate unique term data
-        term_data = generate_term_data()
+        term_data = generate_term_data(self.description_size)
         
         try:
             start_time = time.time()
@@ -193,25 +309,115 @@ class GrpcUser(User):
                     description=term_data["description"]
                 )
             )
-            response = self.stub.CreateTerm(request)
+            response, call = self.stub.CreateTerm.with_call(request)
             response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
             
-            # Successfully created, add to terms list
-            if response.item.keyword not in self.terms:
-                self.terms.append(response.item.keyword)
+            # Successfully created, add to the shared pool
+            self.keywords.add(response.item.keyword)
             
             # Record successful request
-            fire_request_event("Create Term", response_time, 0)
+            fire_request_event(
+                "Create Term", response_time, response.ByteSize(), request_event=self.request_event, call=call
+            )
         except grpc.RpcError as e:
             response_time = (time.time() - start_time) * 1000
             # Handle ALREADY_EXISTS gracefully (expected in concurrent scenarios)
             if e.code() == grpc.StatusCode.ALREADY_EXISTS:
                 # This is not a critical error, just a retry scenario
                 # Still record for statistics
-                fire_request_event("Create Term", response_time, 0, e)
+                fire_request_event("Create Term", response_time, 0, e, request_event=self.request_event)
             else:
-                fire_request_event("Create Term", response_time, 0, e)
+                fire_request_event("Create Term", response_time, 0, e, request_event=self.request_event)
+        except Exception as e:
+            response_time = (time.time() - start_time) * 1000 if 'start_time' in locals() else 0
+            fire_request_event("Create Term", response_time, 0, e, request_event=self.request_event)
+    
+    def new_description(self, keyword: str) -> str:
+        """Generate the description an Update writes (sized by description_size if set)."""
+        if self.description_size is not None:
+            return self.description_size.generate()
+        return generate_description(keyword)
+    
+    def task_update_term(self):
+        """
+        Task: Update the description of an existing term.
+        
+        This is a write operation (SELECT + UPDATE + COMMIT).
+        Default weight: 0 (enabled by operation_mix)
+        """
+        keyword = self.key_distribution.choose(self.keywords)
+        if not keyword:
+            # No terms available, skip this task
+            return
+        
+        try:
+            start_time = time.time()
+            request = pb.UpdateTermRequest(
+                item=pb.Term(keyword=keyword, description=self.new_description(keyword))
+            )
+            response, call = self.stub.UpdateTerm.with_call(request)
+            response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+            
+            # Record successful request
+            fire_request_event(
+                "Update Term", response_time, response.ByteSize(), request_event=self.request_event, call=call
+            )
+        except grpc.RpcError as e:
+            response_time = (time.time() - start_time) * 1000
+            # Term might have been deleted by another user
+            if e.code() == grpc.StatusCode.NOT_FOUND:
+                self.keywords.remove(keyword)
+            fire_request_event("Update Term", response_time, 0, e, request_event=self.request_event)
         except Exception as e:
             response_time = (time.time() - start_time) * 1000 if 'start_time' in locals() else 0
-            fire_request_event("Create Term", response_time, 0, e)
+            fire_request_event("Update Term", response_time, 0, e, request_event=self.request_event)
+    
+    def task_delete_term(self):
+        """
+        Task: Delete an existing term.
+        
+        This is a write operation (SELECT + DELETE + COMMIT).
+        Default weight: 0 (enabled by operation_mix)
+        
+        The keyword leaves the shared pool before the call, so that other
+        users of the process do not pick a term that is being deleted.
+        """
+        keyword = self.keywords.random()
+        if not keyword:
+            # No terms available, skip this task
+            return
+        
+        self.keywords.remove(keyword)
+        try:
+            start_time = time.time()
+            _, call = self.stub.DeleteTerm.with_call(pb.DeleteTermRequest(keyword=keyword))
+            response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+            
+            # Record successful request
+            fire_request_event("Delete Term", response_time, 0, request_event=self.request_event, call=call)
+        except grpc.RpcError as e:
+            response_time = (time.time() - start_time) * 1000
+            fire_request_event("Delete Term", response_time, 0, e, request_event=self.request_event)
+        except Exception as e:
+            response_time = (time.time() - start_time) * 1000 if 'start_time' in locals() else 0
+            fire_request_event("Delete Term", response_time, 0, e, request_event=self.request_event)
+    
+    # Task weights of the selected scenario (operation_mix)
+    tasks = build_task_weights(
+        {
+            "list": task_list_terms,
+            "get": task_get_term,
+            "create": task_create_term,
+            "update": task_update_term,
+            "delete": task_delete_term,
+        },
+        get_operation_mix(),
+    )
+
 
+@events.quitting.add_listener
+def close_channel_pool(environment, **kwargs):
+    """Close the channel pool shared by GrpcUser instances (the next runner creates a new one)."""
+    if GrpcUser.channel_pool is not None:
+        GrpcUser.channel_pool.close()
+        GrpcUser.channel_pool = None
@@ -0,0 +1,193 @@
+"""
+Exact latency percentiles with HDR histograms.
+
+Locust rounds response times into buckets (to 10 ms above 100 ms, to 100 ms
+above 1 s) and reports tails from those buckets, so the 99.9% and 99.99%
+columns are often identical. This module records every request into a
+per-endpoint HdrHistogram (microsecond values, 3 significant digits) and:
+
+- every HDR_LOG_INTERVAL seconds appends the interval histograms to
+  <csv_prefix>_latency.hlog (HdrHistogram interval log, one compressed
+  histogram per endpoint tagged with its name)
+- at the end writes exact percentiles per endpoint and for all requests to
+  <csv_prefix>_hdr_percentiles.csv and logs the aggregated tail
+
+In distributed mode each worker sends the histograms of its requests with its
+regular stats report, and the master merges them, so the log and percentiles
+cover all workers.
+
+Needs the hdrhistogram package (requirements_benchmark.txt); without it the
+module does nothing. Imported by the locustfiles for its event listeners.
+"""
+
+import csv
+import logging
+import os
+import time
+
+import gevent
+from locust import events
+from locust.runners import WorkerRunner
+
+try:
+    from hdrh.histogram import HdrHistogram
+except ImportError:
+    HdrHistogram = None
+
+# Recorded range: 1 microsecond to 1 hour, 3 significant digits (0.1% resolution)
+LOWEST_VALUE_US = 1
+HIGHEST_VALUE_US = 3_600_000_000
+SIGNIFICANT_DIGITS = 3
+
+# Seconds between interval histograms in the log
+HDR_LOG_INTERVAL = float(os.getenv("HDR_LOG_INTERVAL", "10"))
+
+PERCENTILES = [50, 90, 95, 99, 99.9, 99.99, 99.999]
+
+CSV_HEADER = ["Type", "Name", "Request Count", "Min", "Mean"] + [f"{p}%" for p in PERCENTILES] + ["Max"]
+
+# Histograms of the current interval and of the whole run, by (request type, name)
+_interval = {}
+_totals = {}
+_state = {"log": None, "base_time": None, "interval_start": None, "flusher": None}
+
+
+def new_histogram():
+    return HdrHistogram(LOWEST_VALUE_US, HIGHEST_VALUE_US, SIGNIFICANT_DIGITS)
+
+
+def _csv_prefix(environment):
+    options = environment.parsed_options
+    return getattr(options, "csv_prefix", None) if options else None
+
+
+def endpoint_tag(request_type, name) -> str:
+    """Interval log tag of an endpoint (tags cannot contain commas or spaces)."""
+    return f"{request_type}:{name}".replace(",", "_").replace(" ", "_")
+
+
+@events.request.add_listener
+def on_request(request_type, name, response_time, **kwargs):
+    """Record the response time of every request (failures included, as in Locust's stats)."""
+    if HdrHistogram is None or response_time is None:
+        return
+    histogram = _interval.get((request_type, name))
+    if histogram is None:
+        histogram = _interval[(request_type, name)] = new_histogram()
+    value = int(response_time * 1000)
+    histogram.record_value(min(max(value, LOWEST_VALUE_US), HIGHEST_VALUE_US))
+
+
+def take_interval() -> dict:
+    """Swap out the histograms of the current interval."""
+    interval = dict(_interval)
+    _interval.clear()
+    return interval
+
+
+@events.report_to_master.add_listener
+def on_report_to_master(client_id, data, **kwargs):
+    """Send this worker's histograms since the last report to the master."""
+    if HdrHistogram is None:
+        return
+    data["hdr_histograms"] = [
+        [request_type, name, histogram.encode().decode("ascii")]
+        for (request_type, name), histogram in take_interval().items()
+    ]
+
+
+@events.worker_report.add_listener
+def on_worker_report(client_id, data, **kwargs):
+    """Merge a worker's histograms into the master's current interval."""
+    for request_type, name, encoded in data.get("hdr_histograms", []):
+        histogram = _interval.get((request_type, name))
+        if histogram is None:
+            histogram = _interval[(request_type, name)] = new_histogram()
+        histogram.decode_and_add(encoded)
+
+
+def flush_interval():
+    """Write the current interval histograms to the log and add them to the run totals."""
+    now = time.time()
+    start = _state["interval_start"] or now
+    log = _state["log"]
+    for (request_type, name), histogram in sorted(take_interval().items()):
+        if log:
+            log.write(
+                f"Tag={endpoint_tag(request_type, name)},{start - _state['base_time']:.3f},{now - start:.3f},"
+                f"{histogram.get_max_value() / 1000:.3f},{histogram.encode().decode('ascii')}\n"
+            )
+        total = _totals.get((request_type, name))
+        if total is None:
+            total = _totals[(request_type, name)] = new_histogram()
+        total.add(histogram)
+    if log:
+        log.flush()
+    _state["interval_start"] = now
+
+
+def flush_periodically():
+    while True:
+        gevent.sleep(HDR_LOG_INTERVAL)
+        flush_interval()
+
+
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs):
+    """Open the interval log and start flushing (local runner or master)."""
+    if HdrHistogram is None or isinstance(environment.runner, WorkerRunner) or _state["flusher"]:
+        return
+    start = time.time()
+    _state["base_time"] = _state["interval_start"] = start
+    prefix = _csv_prefix(environment)
+    if prefix:
+        log = open(f"{prefix}_latency.hlog", "w")
+        log.write("#[Histogram log format version 1.3]\n")
+        log.write(f"#[StartTime: {start:.3f} (seconds since epoch), {time.ctime(start)}]\n")
+        log.write(f"#[BaseTime: {start:.3f} (seconds since epoch)]\n")
+        log.write("#[Values in microseconds, max in milliseconds]\n")
+        log.write('"StartTimestamp","Interval_Length","Interval_Max","Interval_Compressed_Histogram"\n')
+        _state["log"] = log
+    _state["flusher"] = gevent.spawn(flush_periodically)
+
+
+def percentile_row(request_type, name, histogram) -> list:
+    """Exact percentiles of a histogram in milliseconds."""
+    values = [histogram.get_value_at_percentile(p) / 1000 for p in PERCENTILES]
+    return (
+        [request_type, name, histogram.get_total_count(), histogram.get_min_value() / 1000,
+         round(histogram.get_mean_value() / 1000, 3)]
+        + values
+        + [histogram.get_max_value() / 1000]
+    )
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    """Write the last interval and the exact percentiles of the run."""
+    if HdrHistogram is None or isinstance(environment.runner, WorkerRunner) or not _state["flusher"]:
+        return
+    _state["flusher"].kill(block=False)
+    # Final worker reports have arrived by now (the master waits for them before quitting)
+    flush_interval()
+    if _state["log"]:
+        _state["log"].close()
+    if not _totals:
+        return
+
+    aggregated = new_histogram()
+    rows = []
+    for (request_type, name), histogram in sorted(_totals.items(), key=lambda item: item[0][1]):
+        rows.append(percentile_row(request_type, name, histogram))
+        aggregated.add(histogram)
+    rows.append(percentile_row("", "Aggregated", aggregated))
+
+    prefix = _csv_prefix(environment)
+    if prefix:
+        with open(f"{prefix}_hdr_percentiles.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(rows)
+
+    tail = ", ".join(f"p{p} {value:g} ms" for p, value in zip(PERCENTILES[2:], rows[-1][7:-1]))
+    logging.info(f"Exact latency (HDR, {aggregated.get_total_count()} requests): {tail}, max {rows[-1][-1]:g} ms")
@@ -0,0 +1,173 @@
+"""
+Locust load testing with an open (constant arrival rate) workload model.
+
+RestUser and GrpcUser are closed-loop: each user waits 1-3 seconds after its
+previous response, so when the service slows down the offered load drops with
+it, and slow periods get fewer samples (coordinated omission). Tail latencies
+of closed-loop runs are therefore understated.
+
+Here requests follow a schedule that does not depend on the service:
+ArrivalRateShape keeps a fixed pool of users, and every user starts its tasks
+at intended start times spaced users / arrival_rate seconds apart, so the pool
+issues arrival_rate requests per second in total. When a response is late the
+following tasks start late as well, but their latency is recorded from the
+intended start time, so the queueing delay an open-loop client would see is
+included (the correction used by wrk2). The plain service time is passed in
+the request context as "service_time".
+
+The users live in open_rest_user.py (OpenRestUser) and open_grpc_user.py
+(OpenGrpcUser), so a REST run never imports grpc and its gevent patching.
+
+Scenario keys (config/test_scenarios.yaml, scenario selected by BENCHMARK_SCENARIO):
+    users: size of the user pool (upper bound on requests in flight)
+    spawn_rate: users started per second
+    duration: test duration (with arrival_rate)
+    arrival_rate: target requests per second
+    arrival_stages: list of {duration, rate} steps, used instead of arrival_rate/duration
+
+Rates must be positive; a schedule with a rate of 0 or less is rejected at load.
+"""
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import gevent
+from locust import LoadTestShape, events
+from locustfiles.common import load_scenario_config, parse_duration
+
+# Used when no scenario is selected (e.g. plain `locust -f locustfiles/open_rest_user.py`)
+DEFAULT_ARRIVAL_RATE = 10
+DEFAULT_POOL_SIZE = 50
+DEFAULT_DURATION = "1m"
+
+
+def parse_arrival_rate(value) -> float:
+    """Parse an arrival rate (requests/second), which must be positive."""
+    try:
+        rate = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid arrival rate: {value!r}")
+    if not rate > 0:
+        raise ValueError(f"Arrival rate must be > 0 requests/second, got {value!r}")
+    return rate
+
+
+def build_arrival_schedule(scenario: dict) -> list:
+    """
+    Build the arrival rate schedule of a scenario.
+
+    Returns:
+        List of (end time in seconds from test start, requests per second).
+
+    Raises:
+        ValueError: If a rate is missing or not positive.
+    """
+    if scenario.get("arrival_stages"):
+        schedule, end = [], 0.0
+        for stage in scenario["arrival_stages"]:
+            end += parse_duration(stage["duration"])
+            schedule.append((end, parse_arrival_rate(stage.get("rate"))))
+        return schedule
+    duration = parse_duration(scenario.get("duration", DEFAULT_DURATION))
+    return [(duration, parse_arrival_rate(scenario.get("arrival_rate", DEFAULT_ARRIVAL_RATE)))]
+
+
+SCENARIO = load_scenario_config()
+ARRIVAL_SCHEDULE = build_arrival_schedule(SCENARIO)
+POOL_SIZE = int(SCENARIO.get("users", DEFAULT_POOL_SIZE))
+SPAWN_RATE = float(SCENARIO.get("spawn_rate", POOL_SIZE))
+
+# Test start on this process (workers pace their users without the master's shape)
+_test_start = {"time": time.time()}
+
+
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs):
+    _test_start["time"] = time.time()
+
+
+def arrival_rate_at(elapsed: float) -> float:
+    """Get the target arrival rate (requests/second) at `elapsed` seconds into the test."""
+    for end, rate in ARRIVAL_SCHEDULE:
+        if elapsed < end:
+            return rate
+    return ARRIVAL_SCHEDULE[-1][1]
+
+
+class ArrivalRateShape(LoadTestShape):
+    """
+    Keeps POOL_SIZE users running until the arrival schedule ends.
+
+    The arrival rate itself is enforced by the users' pacing.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stage = -1
+
+    def tick(self):
+        run_time = self.get_run_time()
+        for index, (end, rate) in enumerate(ARRIVAL_SCHEDULE):
+            if run_time < end:
+                if index != self.stage:
+                    self.stage = index
+                    logging.info(f"Arrival rate: {rate:g} req/s with {POOL_SIZE} users")
+                return POOL_SIZE, SPAWN_RATE
+        return None
+
+
+class IntendedStartRequestEvent:
+    """
+    Request event hook recording latency from the user's intended start time.
+
+    Wraps the hook a client fires its request metrics through; requests made
+    outside paced tasks (intended_start is None, e.g. on_start) pass unchanged.
+    """
+
+    def __init__(self, user, request_event):
+        self.user = user
+        self.request_event = request_event
+
+    def fire(self, **kwargs):
+        intended_start = self.user.intended_start
+        if intended_start is not None:
+            service_time = kwargs["response_time"]
+            kwargs["response_time"] = max(service_time, (time.time() - intended_start) * 1000)
+            kwargs["context"] = {**(kwargs.get("context") or {}), "service_time": service_time}
+        self.request_event.fire(**kwargs)
+
+
+class ArrivalPacing:
+    """
+    Mixin pacing a user's tasks on the arrival schedule.
+
+    Each user contributes arrival_rate / POOL_SIZE requests per second. The
+    next intended start is always the previous one plus the interval, never
+    "now", so late tasks do not shift the schedule.
+    """
+
+    # Start time the current task was scheduled for (None outside paced tasks)
+    intended_start = None
+
+    def pacing_interval(self) -> float:
+        """Seconds between this user's intended task starts at the current rate."""
+        return POOL_SIZE / arrival_rate_at(time.time() - _test_start["time"])
+
+    def on_start(self):
+        super().on_start()
+        # Spread users over one interval so that their arrivals do not come in bursts
+        first_start = time.time() + random.uniform(0, self.pacing_interval())
+        gevent.sleep(max(0.0, first_start - time.time()))
+        self.intended_start = first_start
+
+    def wait_time(self):
+        self.intended_start += self.pacing_interval()
+        return max(0.0, self.intended_start - time.time())
+
@@ -0,0 +1,25 @@
+"""
+Locust load testing for REST API service with an open workload model.
+
+RestUser tasks paced on a constant arrival rate schedule; see open_model.py.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# Import the module (not the class) so Locust does not also run RestUser from this file
+import locustfiles.rest_user as rest_user
+# ArrivalRateShape is imported so that Locust picks up the shape from this file
+from locustfiles.open_model import ArrivalPacing, ArrivalRateShape, IntendedStartRequestEvent  # noqa: F401
+
+
+class OpenRestUser(ArrivalPacing, rest_user.RestUser):
+    """RestUser tasks paced on the arrival schedule (latency from intended start)."""
+
+    def on_start(self):
+        self.client.request_event = IntendedStartRequestEvent(self, self.client.request_event)
+        super().on_start()
@@ -0,0 +1,323 @@
+"""
+Locust load testing of REST connection lifecycle strategies.
+
+RestUser keeps one connection per user for the whole test, so connection setup
+never shows up in the results. The users in this module make the connection
+strategy explicit and compare three modes:
+
+- per_request: a new connection for every request (TCP + TLS handshake +
+  HTTP/1.1 request)
+- per_user: one connection per user, opened in on_start and reused
+- pooled: a shared pool of CONNECTION_POOL_SIZE connections used by all users
+  of the Locust process
+
+Connection setup is recorded as a separate "[Connect]" entry, so request
+times only cover the request itself. Pooled users also record the time spent
+waiting for a free connection as "[Pool Wait]".
+
+The gRPC counterparts are in grpc_connection_users.py.
+"""
+
+import http.client
+import json
+import queue
+import ssl
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from locust import User, between
+from locustfiles.common import (
+    get_rest_service_url,
+    get_connection_pool_size,
+    get_tls_ca_file,
+    generate_term_data,
+    generate_description,
+    get_keyword_pool,
+    get_keyword_pool_file,
+    get_key_distribution,
+    get_operation_mix,
+    get_think_time,
+    get_description_size,
+    build_task_weights,
+    CONNECTION_MODE_PER_REQUEST,
+    CONNECTION_MODE_PER_USER,
+    CONNECTION_MODE_POOLED,
+    CONNECTION_TIMEOUT
+)
+from locustfiles import generator_cpu  # noqa: F401  (registers event listeners)
+from locustfiles import goodput  # noqa: F401  (registers event listeners)
+from locustfiles import hdr_histograms  # noqa: F401  (registers event listeners)
+from locustfiles import run_metadata  # noqa: F401  (registers event listeners)
+from locustfiles import server_timing  # noqa: F401  (registers event listeners)
+
+
+# Errors meaning a kept-alive HTTP connection was closed by the server
+REST_CONNECTION_ERRORS = (http.client.HTTPException, OSError)
+
+
+class RestConnectionUser(User):
+    """
+    Base Locust user for REST tests with an explicit connection lifecycle.
+
+    Uses the same task mix and think time as RestUser (the scenario's
+    operation_mix and think_time) over http.client connections managed
+    according to connection_mode.
+    """
+
+    abstract = True
+
+    # Connection lifecycle mode (one of CONNECTION_MODE_*)
+    connection_mode = CONNECTION_MODE_PER_USER
+
+    # Base URL for REST service (from environment or default)
+    host = get_rest_service_url()
+
+    # Wait time between requests (realistic user behavior)
+    wait_time = between(*get_think_time())
+
+    # Size of created and updated descriptions (description_size, default: short samples)
+    description_size = get_description_size()
+
+    # Shared pool for CONNECTION_MODE_POOLED: slots hold a connection or None (not yet connected)
+    _pool = None
+
+    def on_start(self):
+        """
+        Called when a user starts. Prepares connections and loads existing terms.
+        """
+        url = urlsplit(self.host)
+        self.hostname = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.ssl_context = None
+        if url.scheme == "https":
+            self.ssl_context = ssl.create_default_context(cafile=get_tls_ca_file())
+
+        self.connection = None
+        if self.connection_mode == CONNECTION_MODE_PER_USER:
+            self.connection = self._connect()
+        elif self.connection_mode == CONNECTION_MODE_POOLED and RestConnectionUser._pool is None:
+            RestConnectionUser._pool = queue.Queue()
+            for _ in range(get_connection_pool_size()):
+                RestConnectionUser._pool.put(None)
+
+        self.keywords = get_keyword_pool("rest")
+        self.key_distribution = get_key_distribution("rest")
+        try:
+            self.keywords.load_once(self._fetch_keywords, get_keyword_pool_file("rest"))
+        except Exception:
+            # The failed request is already recorded; the next user retries
+            pass
+
+    def on_stop(self):
+        """
+        Called when a user stops. Closes the per-user connection.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        """
+        Open a new connection (TCP connect and TLS handshake) and record its cost.
+
+        Returns:
+            Connected HTTP or HTTPS connection, or None if connecting failed.
+        """
+        if self.ssl_context is not None:
+            connection = http.client.HTTPSConnection(
+                self.hostname, self.port, timeout=CONNECTION_TIMEOUT, context=self.ssl_context
+            )
+        else:
+            connection = http.client.HTTPConnection(self.hostname, self.port, timeout=CONNECTION_TIMEOUT)
+
+        start_time = time.perf_counter()
+        exception = None
+        try:
+            connection.connect()
+        except Exception as e:
+            exception = e
+            connection = None
+        self._fire("CONNECT", "[Connect]", start_time, 0, exception)
+        return connection
+
+    def _acquire(self):
+        """Get a connection for one request according to the connection mode."""
+        if self.connection_mode == CONNECTION_MODE_PER_REQUEST:
+            return self._connect()
+        if self.connection_mode == CONNECTION_MODE_PER_USER:
+            if self.connection is None:
+                self.connection = self._connect()
+            return self.connection
+
+        start_time = time.perf_counter()
+        connection = RestConnectionUser._pool.get()
+        self._fire("POOL", "[Pool Wait]", start_time, 0, None)
+        return connection if connection is not None else self._connect()
+
+    def _release(self, connection, reusable: bool):
+        """Return a connection after a request (closing it when it cannot be reused)."""
+        if connection is not None and not reusable:
+            connection.close()
+            connection = None
+        if self.connection_mode == CONNECTION_MODE_PER_USER:
+            self.connection = connection
+        elif self.connection_mode == CONNECTION_MODE_POOLED:
+            RestConnectionUser._pool.put(connection)
+
+    def _fire(self, request_type: str, name: str, start_time: float, length: int, exception):
+        """Record a measurement that started at start_time in Locust stats."""
+        self.environment.events.request.fire(
+            request_type=request_type,
+            name=name,
+            response_time=(time.perf_counter() - start_time) * 1000,
+            response_length=length,
+            exception=exception,
+            context={}
+        )
+
+    def _request(self, method: str, path: str, name: str, payload: dict = None, expected: tuple = (200,)):
+        """
+        Send one request over a connection chosen by the connection mode.
+
+        A kept-alive connection closed by the server is reopened once
+        (the reconnect shows up as "[Connect]", not in the request time).
+
+        Returns:
+            Tuple of (status code, decoded JSON body or None).
+        """
+        headers = {}
+        data = None
+        if payload is not None:
+            data = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        if self.connection_mode == CONNECTION_MODE_PER_REQUEST:
+            headers["Connection"] = "close"
+
+        connection = self._acquire()
+        status, body, length, exception = 0, None, 0, None
+        reusable = self.connection_mode != CONNECTION_MODE_PER_REQUEST
+        completed = False
+        start_time = time.perf_counter()
+        try:
+            for attempt in range(2):
+                if connection is None:
+                    exception = ConnectionError("Could not connect to REST service")
+                    reusable = False
+                    break
+                try:
+                    start_time = time.perf_counter()
+                    connection.request(method, path, body=data, headers=headers)
+                    response = connection.getresponse()
+                    raw = response.read()
+                    status, length, exception = response.status, len(raw), None
+                    if status in expected:
+                        try:
+                            body = json.loads(raw) if raw else None
+                        except ValueError as e:
+                            exception = e
+                    else:
+                        exception = Exception(f"HTTP {status}")
+                    reusable = reusable and not response.will_close
+                    break
+                except REST_CONNECTION_ERRORS as e:
+                    exception = e
+                    connection.close()
+                    if attempt == 0 and self.connection_mode != CONNECTION_MODE_PER_REQUEST:
+                        connection = self._connect()
+                    else:
+                        connection, reusable = None, False
+            completed = True
+        except Exception as e:
+            exception = e
+            raise
+        finally:
+            # A request cut short leaves the connection in an unknown state; the
+            # pool slot is still given back (empty) so other users do not block
+            self._fire(method, name, start_time, length, exception)
+            self._release(connection, reusable and completed)
+        return status, body
+
+    def _fetch_keywords(self) -> list:
+        """Load existing keywords with one List Terms request (first user of the process)."""
+        status, body = self._request("GET", "/terms", "[Setup] List Terms")
+        if status != 200:
+            raise RuntimeError(f"List Terms failed with status {status}")
+        return [item["keyword"] for item in body]
+
+    def task_list_terms(self):
+        """Task: Get list of all terms."""
+        self._request("GET", "/terms", "List Terms")
+
+    def task_get_term(self):
+        """Task: Get a specific term by keyword (picked by the scenario's key_distribution)."""
+        keyword = self.key_distribution.choose(self.keywords)
+        if not keyword:
+            return
+        status, _ = self._request("GET", f"/terms/{keyword}", "Get Term")
+        if status == 404:
+            self.keywords.remove(keyword)
+
+    def task_create_term(self):
+        """Task: Create a new term."""
+        term_data = generate_term_data(self.description_size)
+        status, body = self._request("POST", "/terms", "Create Term", term_data, expected=(201,))
+        if status == 201 and body:
+            self.keywords.add(body["keyword"])
+
+    def task_update_term(self):
+        """Task: Update the description of an existing term."""
+        keyword = self.key_distribution.choose(self.keywords)
+        if not keyword:
+            return
+        if self.description_size is not None:
+            description = self.description_size.generate()
+        else:
+            description = generate_description(keyword)
+        status, _ = self._request("PUT", f"/terms/{keyword}", "Update Term", {"description": description})
+        if status == 404:
+            self.keywords.remove(keyword)
+
+    def task_delete_term(self):
+        """Task: Delete an existing term (it leaves the shared pool before the request)."""
+        keyword = self.keywords.random()
+        if not keyword:
+            return
+        self.keywords.remove(keyword)
+        self._request("DELETE", f"/terms/{keyword}", "Delete Term", expected=(204,))
+
+    # Task weights of the selected scenario (operation_mix)
+    tasks = build_task_weights(
+        {
+            "list": task_list_terms,
+            "get": task_get_term,
+            "create": task_create_term,
+            "update": task_update_term,
+            "delete": task_delete_term,
+        },
+        get_operation_mix(),
+    )
+
+
+class RestPerRequestUser(RestConnectionUser):
+    """REST user that opens a new HTTP/1.1 connection for every request."""
+
+    connection_mode = CONNECTION_MODE_PER_REQUEST
+
+
+class RestPerUserConnectionUser(RestConnectionUser):
+    """REST user with one kept-alive HTTP/1.1 connection for its whole lifetime."""
+
+    connection_mode = CONNECTION_MODE_PER_USER
+
+
+class RestPooledUser(RestConnectionUser):
+    """REST user borrowing connections from a pool shared by all users of the process."""
+
+    connection_mode = CONNECTION_MODE_POOLED
@@ -12,112 +12,104 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from locust import HttpUser, task, between
+from locust import HttpUser, between
 from locustfiles.common import (
     get_rest_service_url,
     generate_term_data,
+    generate_description,
     extract_keywords_from_response,
-    get_random_keyword,
-    TASK_WEIGHT_LIST,
-    TASK_WEIGHT_GET,
-    TASK_WEIGHT_CREATE,
-    WAIT_TIME_MIN,
-    WAIT_TIME_MAX
+    get_keyword_pool,
+    get_keyword_pool_file,
+    get_key_distribution,
+    get_operation_mix,
+    get_think_time,
+    get_description_size,
+    build_task_weights,
+    is_tls_enabled,
+    get_tls_ca_file
 )
+from locustfiles import generator_cpu  # noqa: F401  (registers event listeners)
+from locustfiles import goodput  # noqa: F401  (registers event listeners)
+from locustfiles import hdr_histograms  # noqa: F401  (registers event listeners)
+from locustfiles import run_metadata  # noqa: F401  (registers event listeners)
+from locustfiles import server_timing  # noqa: F401  (registers event listeners)
 
 
-class RestUser(HttpUser):
+class RestTasks:
     """
-    Locust user class for testing REST API service.
-    
-    Simulates realistic user behavior:
-    - 50% of requests: List all terms (lightweight read operation)
-    - 30% of requests: Get specific term (lightweight read operation)
-    - 20% of requests: Create new term (write operation with DB commit)
+    Tasks of the REST users and the state they share.
     
-    Wait time between requests: 1-3 seconds (realistic user behavior)
+    The tasks only use the client API common to HttpUser and FastHttpUser,
+    so RestUser and FastRestUser (fast_rest_user.py) both run them.
     """
     
-    # Base URL for REST service (from environment or default)
-    host = get_rest_service_url()
-    
-    # Wait time between requests (realistic user behavior)
-    wait_time = between(WAIT_TIME_MIN, WAIT_TIME_MAX)
+    # Size of created and updated descriptions (description_size, default: short samples)
+    description_size = get_description_size()
     
-    def on_start(self):
+    def load_terms(self):
         """
-        Called when a user starts. Loads existing terms for use in tests.
+        Load existing keywords into the pool shared by the users of this process.
+        
+        Only the first user of the process sends the List Terms request (or reads
+        KEYWORD_POOL_FILE); users spawned later reuse its keywords.
         """
-        # Load list of existing terms to use in GET requests
-        try:
+        self.keywords = get_keyword_pool("rest")
+        self.key_distribution = get_key_distribution("rest")
+        
+        def fetch_keywords():
             response = self.client.get("/terms", name="[Setup] List Terms")
-            if response.status_code == 200:
-                terms_data = response.json()
-                self.terms = extract_keywords_from_response(terms_data)
-            else:
-                self.terms = []
-        except Exception as e:
-            # If service is not available, start with empty list
-            self.terms = []
+            response.raise_for_status()
+            return extract_keywords_from_response(response.json())
+        
+        try:
+            self.keywords.load_once(fetch_keywords, get_keyword_pool_file("rest"))
+        except Exception:
+            # If service is not available, start with an empty pool (the next user retries)
+            pass
     
-    @task(TASK_WEIGHT_LIST)
     def task_list_terms(self):
         """
         Task: Get list of all terms.
         
         This is a lightweight read operation (SELECT all from database).
-        Weight: 5 (50% probability)
+        Default weight: 5 (50% probability)
         """
-        response = self.client.get("/terms", name="List Terms")
-        
-        # Update terms list if request was successful
-        if response.status_code == 200:
-            try:
-                terms_data = response.json()
-                self.terms = extract_keywords_from_response(terms_data)
-            except Exception:
-                # Ignore JSON parsing errors, keep existing list
-                pass
+        self.client.get("/terms", name="List Terms")
     
-    @task(TASK_WEIGHT_GET)
     def task_get_term(self):
         """
         Task: Get a specific term by keyword.
         
         This is a lightweight read operation (SELECT with WHERE clause).
-        Weight: 3 (30% probability)
+        Default weight: 3 (30% probability)
         
-        Uses a random keyword from the list loaded in on_start().
+        Picks a keyword from the shared keyword pool according to the
+        scenario's key_distribution (uniform by default).
         If no terms are available, this task is skipped.
         """
-        if not self.terms:
-            # No terms available, skip this task
-            return
-        
-        keyword = get_random_keyword(self.terms)
+        keyword = self.key_distribution.choose(self.keywords)
         if not keyword:
+            # No terms available, skip this task
             return
         
         response = self.client.get(f"/terms/{keyword}", name="Get Term")
         
         # Handle 404 errors gracefully (term might have been deleted)
         if response.status_code == 404:
-            # Remove from list if not found
-            if keyword in self.terms:
-                self.terms.remove(keyword)
+            # Remove from pool if not found
+            self.keywords.remove(keyword)
     
-    @task(TASK_WEIGHT_CREATE)
     def task_create_term(self):
         """
         Task: Create a new term.
         
         This is a write operation (SELECT check + INSERT + COMMIT).
-        Weight: 2 (20% probability)
+        Default weight: 2 (20% probability)
         
         Generates unique keyword to avoid conflicts.
         """
         # Generate unique term data
-        term_data = generate_term_data()
+        term_data = generate_term_data(self.description_size)
         
         response = self.client.post(
             "/terms",
@@ -127,12 +119,11 @@ class RestUser(HttpUser):
         
         # Handle different response codes
         if response.status_code == 201:
-            # Successfully created, add to terms list
+            # Successfully created, add to the shared pool
             try:
                 created_term = response.json()
                 if "keyword" in created_term:
-                    if created_term["keyword"] not in self.terms:
-                        self.terms.append(created_term["keyword"])
+                    self.keywords.add(created_term["keyword"])
             except Exception:
                 # Ignore JSON parsing errors
                 pass
@@ -141,3 +132,91 @@ class RestUser(HttpUser):
             # This is not an error, just a retry scenario
             pass
         # Other status codes (400, 500, etc.) will be tracked by Locust as errors
+    
+    def new_description(self, keyword: str) -> str:
+        """Generate the description an Update writes (sized by description_size if set)."""
+        if self.description_size is not None:
+            return self.description_size.generate()
+        return generate_description(keyword)
+    
+    def task_update_term(self):
+        """
+        Task: Update the description of an existing term.
+        
+        This is a write operation (SELECT + UPDATE + COMMIT).
+        Default weight: 0 (enabled by operation_mix)
+        """
+        keyword = self.key_distribution.choose(self.keywords)
+        if not keyword:
+            # No terms available, skip this task
+            return
+        
+        response = self.client.put(
+            f"/terms/{keyword}",
+            json={"description": self.new_description(keyword)},
+            name="Update Term"
+        )
+        
+        # Term might have been deleted by another user
+        if response.status_code == 404:
+            self.keywords.remove(keyword)
+    
+    def task_delete_term(self):
+        """
+        Task: Delete an existing term.
+        
+        This is a write operation (SELECT + DELETE + COMMIT).
+        Default weight: 0 (enabled by operation_mix)
+        
+        The keyword leaves the shared pool before the request, so that other
+        users of the process do not pick a term that is being deleted.
+        """
+        keyword = self.keywords.random()
+        if not keyword:
+            # No terms available, skip this task
+            return
+        
+        self.keywords.remove(keyword)
+        self.client.delete(f"/terms/{keyword}", name="Delete Term")
+
+
+class RestUser(RestTasks, HttpUser):
+    """
+    Locust user class for testing REST API service.
+    
+    Simulates realistic user behavior (default mix, without operation_mix):
+    - 50% of requests: List all terms (lightweight read operation)
+    - 30% of requests: Get specific term (lightweight read operation)
+    - 20% of requests: Create new term (write operation with DB commit)
+    
+    Scenarios can change the mix, add Update/Delete (operation_mix) and set
+    the think time (think_time, default 1-3 seconds).
+    """
+    
+    # Base URL for REST service (from environment or default)
+    host = get_rest_service_url()
+    
+    # Wait time between requests (realistic user behavior)
+    wait_time = between(*get_think_time())
+    
+    def on_start(self):
+        """
+        Called when a user starts. Loads existing terms for use in tests.
+        """
+        # In TLS mode verify the service certificate against the local CA
+        if is_tls_enabled():
+            self.client.verify = get_tls_ca_file()
+        
+        self.load_terms()
+    
+    # Task weights of the selected scenario (operation_mix)
+    tasks = build_task_weights(
+        {
+            "list": RestTasks.task_list_terms,
+            "get": RestTasks.task_get_term,
+            "create": RestTasks.task_create_term,
+            "update": RestTasks.task_update_term,
+            "delete": RestTasks.task_delete_term,
+        },
+        get_operation_mix(),
+    )
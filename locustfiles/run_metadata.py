@@ -0,0 +1,89 @@
+"""
+Run metadata for the results store.
+
+CSV and HTML reports do not record what produced them, so runs from different
+code versions or machines cannot be told apart later. At the start of a test
+this module writes <csv_prefix>_run.json with the scenario configuration, the
+git commit of the project and a fingerprint of the load generator environment.
+scripts/results_store.py ingests it together with the run's statistics.
+
+Imported by the locustfiles for its event listeners.
+"""
+
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+import locust
+import psutil
+from locust import events
+from locust.runners import MasterRunner, WorkerRunner
+
+from locustfiles.common import (
+    load_scenario_config,
+    is_tls_enabled,
+    BENCHMARK_CONFIG,
+    BENCHMARK_SCENARIO,
+    BENCHMARK_SERVICE,
+    PROJECT_ROOT
+)
+
+
+def git_revision() -> dict:
+    """Get the commit of the project and whether the working tree has changes."""
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, cwd=PROJECT_ROOT
+        ).stdout.strip()
+
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def environment_fingerprint() -> dict:
+    """Describe the machine and software the load generator runs on."""
+    return {
+        "hostname": socket.gethostname(),
+        "os": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "memory_mb": psutil.virtual_memory().total // 2**20,
+        "python": platform.python_version(),
+        "locust": locust.__version__,
+    }
+
+
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs):
+    """Write <csv_prefix>_run.json (local runner or master)."""
+    runner = environment.runner
+    options = environment.parsed_options
+    prefix = getattr(options, "csv_prefix", None) if options else None
+    if isinstance(runner, WorkerRunner) or not prefix:
+        return
+
+    metadata = {
+        "service": BENCHMARK_SERVICE or None,
+        "scenario": BENCHMARK_SCENARIO or None,
+        "config_file": BENCHMARK_CONFIG,
+        "config": load_scenario_config(),
+        "started": int(time.time()),
+        "host": environment.host,
+        "user_classes": [user_class.__name__ for user_class in environment.user_classes],
+        "users": getattr(options, "num_users", None),
+        "spawn_rate": getattr(options, "spawn_rate", None),
+        "run_time": getattr(options, "run_time", None),
+        "workers": runner.worker_count if isinstance(runner, MasterRunner) else 0,
+        "tls": is_tls_enabled(),
+        "command": sys.argv,
+        **git_revision(),
+        "environment": environment_fingerprint(),
+    }
+    with open(f"{prefix}_run.json", "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2, default=str)
@@ -0,0 +1,253 @@
+"""
+Saturation point search with a step-ramp load shape.
+
+The fixed scenarios run a set number of users and never show where a service
+runs out of capacity. StepRampShape adds step_users users every step_duration
+and evaluates each step over its second half (after the new users have been
+spawned): throughput, p95 and error rate. The ramp stops at the first step
+where p95 exceeds expected_p95 or the error rate exceeds max_error_rate.
+
+From the step table it reports:
+- max sustainable RPS: highest throughput of a step within the SLO
+- throughput knee: last step before the throughput gained per added user
+  falls below knee_ratio of the initial throughput per user
+
+Results go to <csv_prefix>_capacity_steps.csv and <csv_prefix>_capacity.json,
+and the summary is merged per service into <output base_dir>/comparison/capacity.json
+so REST and gRPC runs can be compared.
+
+Used as an extra locustfile next to the user's locustfile
+(`-f locustfiles/rest_user.py,locustfiles/saturation.py`); the runners add it
+for scenarios with `shape: "locustfiles/saturation.py"`.
+
+Scenario keys (config/test_scenarios.yaml):
+    step_users, step_duration, spawn_rate
+    users: upper limit of users, duration: upper limit of the test time
+    expected_p95: SLO in milliseconds
+    max_error_rate: highest tolerated share of failed requests (default 0.01)
+    knee_ratio: marginal/initial throughput per user at the knee (default 0.5)
+"""
+import csv
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from locust import LoadTestShape, events
+from locust.stats import calculate_response_time_percentile
+from locustfiles.common import (
+    load_benchmark_config,
+    load_scenario_config,
+    parse_duration,
+    BENCHMARK_SERVICE,
+    BENCHMARK_SCENARIO,
+    PROJECT_ROOT
+)
+
+# Used when no scenario is selected (e.g. plain `locust -f ...,locustfiles/saturation.py`)
+DEFAULT_STEP_USERS = 10
+DEFAULT_STEP_DURATION = "30s"
+DEFAULT_MAX_USERS = 1000
+DEFAULT_MAX_DURATION = "30m"
+DEFAULT_P95_SLO = 500
+DEFAULT_MAX_ERROR_RATE = 0.01
+DEFAULT_KNEE_RATIO = 0.5
+
+SCENARIO = load_scenario_config()
+STEP_USERS = int(SCENARIO.get("step_users", DEFAULT_STEP_USERS))
+STEP_DURATION = parse_duration(SCENARIO.get("step_duration", DEFAULT_STEP_DURATION))
+SPAWN_RATE = float(SCENARIO.get("spawn_rate", STEP_USERS))
+MAX_USERS = int(SCENARIO.get("users", DEFAULT_MAX_USERS))
+MAX_DURATION = parse_duration(SCENARIO.get("duration", DEFAULT_MAX_DURATION))
+P95_SLO = float(SCENARIO.get("expected_p95", DEFAULT_P95_SLO))
+MAX_ERROR_RATE = float(SCENARIO.get("max_error_rate", DEFAULT_MAX_ERROR_RATE))
+KNEE_RATIO = float(SCENARIO.get("knee_ratio", DEFAULT_KNEE_RATIO))
+
+STEPS_CSV_HEADER = ["Step", "Users", "Requests/s", "p95 ms", "Error Rate", "Within SLO"]
+
+
+def find_knee(steps: list, ratio: float):
+    """
+    Find the throughput knee of a step table.
+
+    Args:
+        steps: Evaluated steps (dicts with users and rps) in ramp order
+        ratio: Marginal throughput per added user, relative to the first step's
+            throughput per user, below which scaling is considered over
+
+    Returns:
+        The last step before scaling flattens, or None if it never does.
+    """
+    if len(steps) < 2 or steps[0]["users"] == 0 or steps[0]["rps"] == 0:
+        return None
+    initial = steps[0]["rps"] / steps[0]["users"]
+    for previous, step in zip(steps, steps[1:]):
+        added_users = step["users"] - previous["users"]
+        if added_users > 0 and (step["rps"] - previous["rps"]) / added_users < ratio * initial:
+            return previous
+    return None
+
+
+class StepRampShape(LoadTestShape):
+    """
+    Adds STEP_USERS users every STEP_DURATION until the SLO is broken.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.steps = []
+        self.step_index = -1
+        self.snapshot = None
+        self.stop_reason = None
+
+    def tick(self):
+        if self.stop_reason:
+            return None
+
+        run_time = self.get_run_time()
+        index = int(run_time // STEP_DURATION)
+        if index != self.step_index:
+            if self.step_index >= 0 and self.evaluate_step():
+                return None
+            self.step_index = index
+            self.snapshot = None
+
+        users = (index + 1) * STEP_USERS
+        if users > MAX_USERS:
+            self.stop_reason = f"user limit {MAX_USERS} reached"
+            return None
+        if run_time >= MAX_DURATION:
+            self.stop_reason = f"time limit {MAX_DURATION:g}s reached"
+            return None
+
+        # Measure the second half of the step, after the added users have started
+        if self.snapshot is None and run_time - index * STEP_DURATION >= STEP_DURATION / 2:
+            self.snapshot = self.take_snapshot()
+        return users, SPAWN_RATE
+
+    def take_snapshot(self) -> dict:
+        """
+        Copy the cumulative totals the step metrics are computed from.
+
+        Bracketed entries ("[Setup] List Terms", "[Connect]") are left out, so
+        the per-user setup of newly spawned users does not count as load.
+        """
+        snapshot = {"time": time.time(), "requests": 0, "failures": 0, "response_times": {}}
+        for (name, _), entry in list(self.runner.stats.entries.items()):
+            if name.startswith("["):
+                continue
+            snapshot["requests"] += entry.num_requests
+            snapshot["failures"] += entry.num_failures
+            for bucket, count in entry.response_times.items():
+                snapshot["response_times"][bucket] = snapshot["response_times"].get(bucket, 0) + count
+        return snapshot
+
+    def evaluate_step(self) -> bool:
+        """
+        Record the metrics of the step that just ended.
+
+        Returns:
+            True if the ramp should stop.
+        """
+        if self.snapshot is None:
+            return False
+        end = self.take_snapshot()
+        requests = end["requests"] - self.snapshot["requests"]
+        failures = end["failures"] - self.snapshot["failures"]
+        response_times = {
+            bucket: count - self.snapshot["response_times"].get(bucket, 0)
+            for bucket, count in end["response_times"].items()
+        }
+        p95 = calculate_response_time_percentile(response_times, requests, 0.95) if requests else 0
+        error_rate = failures / requests if requests else 0.0
+        step = {
+            "step": self.step_index + 1,
+            "users": (self.step_index + 1) * STEP_USERS,
+            "rps": requests / max(end["time"] - self.snapshot["time"], 1e-9),
+            "p95": p95,
+            "error_rate": error_rate,
+            "within_slo": p95 <= P95_SLO and error_rate <= MAX_ERROR_RATE,
+        }
+        self.steps.append(step)
+        logging.info(
+            f"Step {step['step']}: {step['users']} users, {step['rps']:.1f} req/s, "
+            f"p95 {p95} ms, errors {error_rate:.2%}"
+        )
+
+        if p95 > P95_SLO:
+            self.stop_reason = f"p95 {p95} ms > {P95_SLO:g} ms at {step['users']} users"
+        elif error_rate > MAX_ERROR_RATE:
+            self.stop_reason = f"error rate {error_rate:.2%} > {MAX_ERROR_RATE:.2%} at {step['users']} users"
+        return self.stop_reason is not None
+
+    def summary(self) -> dict:
+        """Build the capacity summary of the run."""
+        sustainable = [step for step in self.steps if step["within_slo"]]
+        best = max(sustainable, key=lambda step: step["rps"]) if sustainable else None
+        knee = find_knee(self.steps, KNEE_RATIO)
+        return {
+            "service": BENCHMARK_SERVICE,
+            "scenario": BENCHMARK_SCENARIO,
+            "timestamp": int(time.time()),
+            "p95_slo_ms": P95_SLO,
+            "max_error_rate": MAX_ERROR_RATE,
+            "max_sustainable_rps": round(best["rps"], 1) if best else None,
+            "max_sustainable_users": best["users"] if best else None,
+            "knee_users": knee["users"] if knee else None,
+            "knee_rps": round(knee["rps"], 1) if knee else None,
+            "stop_reason": self.stop_reason,
+            "steps": self.steps,
+        }
+
+
+def write_capacity_files(summary: dict, csv_prefix):
+    """Write the per-run step table and summary, and merge the summary per service."""
+    if csv_prefix:
+        with open(f"{csv_prefix}_capacity_steps.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(STEPS_CSV_HEADER)
+            for step in summary["steps"]:
+                writer.writerow([
+                    step["step"], step["users"], f"{step['rps']:.2f}", step["p95"],
+                    f"{step['error_rate']:.4f}", step["within_slo"],
+                ])
+        with open(f"{csv_prefix}_capacity.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    if not summary["service"]:
+        return
+    comparison_dir = PROJECT_ROOT / load_benchmark_config()["output"]["base_dir"] / "comparison"
+    comparison_dir.mkdir(parents=True, exist_ok=True)
+    comparison_file = comparison_dir / "capacity.json"
+    capacity = json.loads(comparison_file.read_text(encoding="utf-8")) if comparison_file.exists() else {}
+    capacity[summary["service"]] = {key: value for key, value in summary.items() if key != "steps"}
+    comparison_file.write_text(json.dumps(capacity, indent=2), encoding="utf-8")
+
+    logging.info(f"Capacity summary ({comparison_file}):")
+    for service, result in sorted(capacity.items()):
+        knee = (
+            f"knee at {result['knee_users']} users / {result['knee_rps']} req/s"
+            if result["knee_users"] else "knee not reached"
+        )
+        logging.info(
+            f"  {service:>5}: max {result['max_sustainable_rps']} req/s at p95 <= {result['p95_slo_ms']:g} ms "
+            f"({result['max_sustainable_users']} users), {knee}"
+        )
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    """Report capacity when the step ramp was used."""
+    shape = environment.shape_class
+    if not isinstance(shape, StepRampShape) or not shape.steps:
+        return
+    summary = shape.summary()
+    logging.info(f"Saturation search stopped: {shape.stop_reason}")
+    options = environment.parsed_options
+    write_capacity_files(summary, getattr(options, "csv_prefix", None) if options else None)
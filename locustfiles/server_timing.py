@@ -0,0 +1,168 @@
+"""
+Server-side phase timings recorded by the load generator.
+
+Both services time the phases of every request: the REST service sends them in
+the Server-Timing response header (framework, db, app, serialize, total), the
+gRPC service in the server-timing trailing metadata (deserialize, db, app,
+serialize, total). This module collects them for successful requests, together
+with:
+- client: the response time Locust measured
+- transport: client minus server total (network, TLS, HTTP/2 and HTTP
+  handling outside the instrumented code, client library)
+
+At the end it writes per endpoint and phase the count, mean, p50/p95/p99, max
+and the share of the client time to <csv_prefix>_server_timing.csv and logs
+the mean breakdown. In distributed mode workers send their samples with the
+regular stats report and the master merges them.
+
+REST requests are picked up from the response headers; GrpcUser passes the
+trailing metadata in the request event context. Imported by the locustfiles
+for its event listeners.
+"""
+
+import csv
+import logging
+
+from locust import events
+from locust.runners import WorkerRunner
+
+CSV_HEADER = ["Type", "Name", "Phase", "Count", "Mean", "50%", "95%", "99%", "Max", "Share %"]
+
+PERCENTILES = [0.5, 0.95, 0.99]
+
+
+def parse_server_timing(value: str) -> dict:
+    """Parse "db;dur=1.2, app;dur=0.3" into {"db": 1.2, "app": 0.3} (milliseconds)."""
+    phases = {}
+    for metric in value.split(","):
+        name, _, params = metric.strip().partition(";")
+        for param in params.split(";"):
+            key, _, duration = param.strip().partition("=")
+            if key == "dur":
+                phases[name] = float(duration)
+    return phases
+
+
+def round_ms(value: float) -> float:
+    """Round a duration to 3 significant digits at most (0.01 ms below 10 ms)."""
+    if value < 10:
+        return round(value, 2)
+    if value < 100:
+        return round(value, 1)
+    return round(value)
+
+
+class PhaseStats:
+    """Distribution of one phase of one endpoint."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.values = {}
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        key = round_ms(value)
+        self.values[key] = self.values.get(key, 0) + 1
+
+    def merge(self, count: int, total: float, values: list):
+        self.count += count
+        self.total += total
+        for key, n in values:
+            self.values[key] = self.values.get(key, 0) + n
+
+    def percentile(self, fraction: float) -> float:
+        rank = fraction * self.count
+        seen = 0
+        for key in sorted(self.values):
+            seen += self.values[key]
+            if seen >= rank:
+                return key
+        return 0.0
+
+
+# Phase stats by (request type, name) -> {phase: PhaseStats}; workers send and clear theirs
+_endpoints = {}
+
+
+def _record(request_type, name, phases: dict):
+    endpoint = _endpoints.setdefault((request_type, name), {})
+    for phase, value in phases.items():
+        stats = endpoint.get(phase)
+        if stats is None:
+            stats = endpoint[phase] = PhaseStats()
+        stats.add(value)
+
+
+@events.request.add_listener
+def on_request(request_type, name, response_time, response=None, context=None, exception=None, **kwargs):
+    """Record the server phases of a successful request."""
+    if exception or response_time is None:
+        return
+    value = (context or {}).get("server_timing")
+    if value is None and response is not None:
+        headers = getattr(response, "headers", None)
+        value = headers.get("Server-Timing") if headers else None
+    if not value:
+        return
+    server = parse_server_timing(value)
+    if "total" not in server:
+        return
+    _record(request_type, name, {
+        "client": response_time,
+        "transport": max(response_time - server["total"], 0.0),
+        **server,
+    })
+
+
+@events.report_to_master.add_listener
+def on_report_to_master(client_id, data, **kwargs):
+    """Send this worker's samples since the last report to the master."""
+    data["server_timing"] = [
+        [request_type, name, phase, stats.count, stats.total, list(stats.values.items())]
+        for (request_type, name), endpoint in _endpoints.items()
+        for phase, stats in endpoint.items()
+    ]
+    _endpoints.clear()
+
+
+@events.worker_report.add_listener
+def on_worker_report(client_id, data, **kwargs):
+    """Merge a worker's samples."""
+    for request_type, name, phase, count, total, values in data.get("server_timing", []):
+        endpoint = _endpoints.setdefault((request_type, name), {})
+        stats = endpoint.get(phase)
+        if stats is None:
+            stats = endpoint[phase] = PhaseStats()
+        stats.merge(count, total, values)
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    """Write the phase statistics and log the mean breakdown per endpoint."""
+    if isinstance(environment.runner, WorkerRunner) or not _endpoints:
+        return
+
+    rows = []
+    for (request_type, name), endpoint in sorted(_endpoints.items(), key=lambda item: item[0][1]):
+        client = endpoint["client"].total / endpoint["client"].count
+        breakdown = []
+        for phase, stats in endpoint.items():
+            mean = stats.total / stats.count
+            rows.append(
+                [request_type, name, phase, stats.count, round(mean, 3)]
+                + [stats.percentile(p) for p in PERCENTILES]
+                + [max(stats.values), round(mean / client * 100, 1) if client else ""]
+            )
+            if phase not in ("client", "total"):
+                breakdown.append(f"{phase} {mean:.2f}")
+        logging.info(f"Server timing {request_type} {name}: client {client:.2f} ms = {' + '.join(breakdown)}")
+
+    options = environment.parsed_options
+    prefix = getattr(options, "csv_prefix", None) if options else None
+    if prefix:
+        with open(f"{prefix}_server_timing.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(rows)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Script to compare REST and gRPC benchmark results.
+
+Reads the latest run of every service and scenario under the results directory
+(<base_dir>/<service>/<scenario>/*_stats_history.csv), trims the ramp-up, and
+splits the steady state into windows. For every endpoint and window it computes
+throughput, error rate and latency percentiles, then writes:
+
+    <output>/windows.csv      per run, endpoint and window
+    <output>/summary.csv      per run and endpoint over the whole steady state
+    <output>/comparison.md    REST vs gRPC table per scenario
+    <output>/<scenario>.png   throughput and p95 over time, REST vs gRPC
+
+History files are read in chunks, so their size is not limited by memory.
+Throughput and error rate come from the cumulative request/failure counts
+and are exact. The percentiles in stats_history cover Locust's rolling
+10-second window; a window's percentile is their mean weighted by the number
+of requests, so it is an approximation of the true window percentile.
+Per-endpoint rows need `--csv-full-history` (set by the benchmark runners);
+without it only the Aggregated row is analyzed.
+
+Usage:
+    python scripts/analyze_results.py
+    python scripts/analyze_results.py --scenarios sanity normal --window 60s
+    python scripts/analyze_results.py --ramp-up 30s --output results/comparison/analysis
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    print("Error: pandas is not installed. Run: pip install -r requirements_benchmark.txt")
+    sys.exit(1)
+
+from locustfiles.common import parse_duration
+
+SERVICES = ["rest", "grpc"]
+
+PERCENTILES = ["50%", "95%", "99%"]
+
+# Rows read per chunk of a stats_history file
+CHUNK_ROWS = 200_000
+
+HISTORY_COLUMNS = ["Timestamp", "User Count", "Name", "Total Request Count", "Total Failure Count"] + PERCENTILES
+
+
+def find_runs(results_dir: Path, scenarios: list = None) -> dict:
+    """
+    Find the latest run of every service and scenario.
+
+    Returns:
+        Dict of (service, scenario) -> stats_history file.
+    """
+    runs = {}
+    for service in SERVICES:
+        for history in sorted((results_dir / service).glob("*/*_stats_history.csv")):
+            scenario = history.parent.name
+            if scenarios and scenario not in scenarios:
+                continue
+            # File names end with the run timestamp, so the last one is the latest run
+            runs[(service, scenario)] = history
+    return runs
+
+
+def read_history(path: Path, columns: list):
+    """Read a stats_history file in chunks, with "N/A" percentiles as NaN."""
+    return pd.read_csv(path, usecols=columns, chunksize=CHUNK_ROWS, na_values=["N/A"])
+
+
+def steady_state(path: Path, ramp_up: float = None) -> tuple:
+    """
+    Find the steady-state interval of a run.
+
+    Without ramp_up the steady state starts when the user count first reaches
+    its maximum and ends at the last sample with the maximum user count.
+
+    Returns:
+        (start, end) Unix timestamps.
+    """
+    first = last = None
+    max_users, start, end = -1, None, None
+    for chunk in read_history(path, ["Timestamp", "User Count", "Name"]):
+        chunk = chunk[chunk["Name"] == "Aggregated"]
+        if chunk.empty:
+            continue
+        first = chunk["Timestamp"].iat[0] if first is None else first
+        last = chunk["Timestamp"].iat[-1]
+        chunk_max = chunk["User Count"].max()
+        at_max = chunk.loc[chunk["User Count"] == chunk_max, "Timestamp"]
+        if chunk_max > max_users:
+            max_users, start = chunk_max, at_max.iat[0]
+        if chunk_max >= max_users:
+            end = at_max.iat[-1]
+    if first is None:
+        return None, None
+    if ramp_up is not None:
+        return first + ramp_up, last
+    return start, end
+
+
+def analyze_history(path: Path, start: float, end: float, window: float) -> pd.DataFrame:
+    """
+    Compute per-endpoint metrics for each window of the steady state.
+
+    Consecutive samples of an endpoint are differenced to get the requests and
+    failures of each interval; the last sample of every endpoint is carried
+    over to the next chunk so intervals spanning chunk borders are counted.
+
+    Returns:
+        DataFrame with Name, Window, Start, Requests, Failures, Seconds, RPS,
+        Error Rate and the percentile columns.
+    """
+    carry = None
+    parts = []
+    for chunk in read_history(path, HISTORY_COLUMNS):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        chunk = chunk.sort_values(["Name", "Timestamp"], kind="stable")
+        grouped = chunk.groupby("Name", sort=False)
+        chunk["Seconds"] = grouped["Timestamp"].diff()
+        chunk["Requests"] = grouped["Total Request Count"].diff()
+        chunk["Failures"] = grouped["Total Failure Count"].diff()
+        carry = grouped.tail(1)[HISTORY_COLUMNS]
+        chunk = chunk[(chunk["Timestamp"] > start) & (chunk["Timestamp"] <= end) & (chunk["Seconds"] > 0)].copy()
+        if chunk.empty:
+            continue
+        chunk["Window"] = ((chunk["Timestamp"] - start - 1) // window).astype(int)
+        for column in PERCENTILES:
+            # Weighted sums (requests x percentile); intervals without requests have no percentile
+            chunk[column] = (chunk[column] * chunk["Requests"]).where(chunk["Requests"] > 0)
+        chunk["Weight"] = chunk["Requests"].where(chunk[PERCENTILES[0]].notna(), 0)
+        parts.append(
+            chunk.groupby(["Name", "Window"])[["Requests", "Failures", "Seconds", "Weight"] + PERCENTILES].sum()
+        )
+
+    if not parts:
+        return pd.DataFrame()
+    # Windows split across chunks are summed once more
+    windows = pd.concat(parts).groupby(level=["Name", "Window"]).sum().reset_index()
+    return finish_windows(windows, window)
+
+
+def finish_windows(windows: pd.DataFrame, window: float) -> pd.DataFrame:
+    """Turn summed counts and weighted percentile sums into rates and percentiles."""
+    windows["Start"] = windows["Window"] * window
+    windows["RPS"] = windows["Requests"] / windows["Seconds"]
+    windows["Error Rate"] = (windows["Failures"] / windows["Requests"]).where(windows["Requests"] > 0, 0.0)
+    weight = windows["Weight"].replace(0, np.nan)
+    for column in PERCENTILES:
+        windows[column] = windows[column] / weight
+    return windows
+
+
+def summarize(windows: pd.DataFrame) -> pd.DataFrame:
+    """Combine the windows of each endpoint into steady-state totals."""
+    totals = windows.groupby("Name")[["Requests", "Failures", "Seconds", "Weight"]].sum()
+    weighted = windows[PERCENTILES].mul(windows["Weight"], axis=0).groupby(windows["Name"]).sum()
+    summary = totals.join(weighted).reset_index()
+    return finish_windows(summary.assign(Window=0), 0).drop(columns=["Window", "Start"])
+
+
+def format_value(value, unit: str = "") -> str:
+    """Format a metric for the comparison table."""
+    if pd.isna(value):
+        return "-"
+    return f"{value:.2f}{unit}" if value < 100 else f"{value:.0f}{unit}"
+
+
+def format_ratio(rest, grpc, lower_is_better: bool) -> str:
+    """Format gRPC relative to REST (>1: gRPC is better)."""
+    if pd.isna(rest) or pd.isna(grpc) or rest == 0 or grpc == 0:
+        return "-"
+    ratio = rest / grpc if lower_is_better else grpc / rest
+    return f"{ratio:.2f}x"
+
+
+def comparison_table(summary: pd.DataFrame, scenario: str) -> list:
+    """Build the markdown REST vs gRPC table of a scenario."""
+    lines = [
+        f"## {scenario}",
+        "",
+        "| Endpoint | Metric | REST | gRPC | gRPC vs REST |",
+        "| -------- | ------ | ---- | ---- | ------------ |",
+    ]
+    rows = summary[summary["Scenario"] == scenario].set_index(["Name", "Service"])
+    names = sorted(rows.index.get_level_values("Name").unique(), key=lambda name: (name != "Aggregated", name))
+    metrics = [("RPS", "", False), ("Error Rate", "", True)] + [(column, " ms", True) for column in PERCENTILES]
+    for name in names:
+        if name.startswith("["):
+            continue
+        for column, unit, lower_is_better in metrics:
+            rest = rows[column].get((name, "rest"), np.nan)
+            grpc = rows[column].get((name, "grpc"), np.nan)
+            if column == "Error Rate":
+                values = [f"{value:.2%}" if not pd.isna(value) else "-" for value in (rest, grpc)]
+            else:
+                values = [format_value(rest, unit), format_value(grpc, unit)]
+            label = f"p{column.rstrip('%')}" if column in PERCENTILES else column
+            lines.append(
+                f"| {name} | {label} | {values[0]} | {values[1]} | "
+                f"{format_ratio(rest, grpc, lower_is_better)} |"
+            )
+    lines.append("")
+    return lines
+
+
+def plot_scenario(windows: pd.DataFrame, scenario: str, output_dir: Path):
+    """Plot steady-state throughput and p95 of both services over time."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    data = windows[(windows["Scenario"] == scenario) & (windows["Name"] == "Aggregated")]
+    fig, (rps_axis, p95_axis) = plt.subplots(2, 1, figsize=(10, 7), sharex=True)
+    for service, series in data.groupby("Service"):
+        rps_axis.plot(series["Start"], series["RPS"], marker=".", label=service)
+        p95_axis.plot(series["Start"], series["95%"], marker=".", label=service)
+    rps_axis.set_ylabel("Requests/s")
+    p95_axis.set_ylabel("p95, ms")
+    p95_axis.set_xlabel("Seconds since steady state")
+    rps_axis.set_title(f"{scenario}: REST vs gRPC (steady state)")
+    for axis in (rps_axis, p95_axis):
+        axis.grid(True, alpha=0.3)
+        axis.legend()
+    fig.tight_layout()
+    path = output_dir / f"{scenario}.png"
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare REST and gRPC benchmark results per scenario"
+    )
+    parser.add_argument(
+        "--results-dir",
+        type=str,
+        default="results",
+        help="Results directory (output base_dir of the scenario config, default: results)"
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        help="Scenarios to analyze (default: all with results)"
+    )
+    parser.add_argument(
+        "--ramp-up",
+        type=str,
+        help="Time to skip at the start of each run (e.g. 30s; default: until the user count reaches its maximum)"
+    )
+    parser.add_argument(
+        "--window",
+        type=str,
+        default="30s",
+        help="Length of the steady-state windows (default: 30s)"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Output directory (default: <results-dir>/comparison/analysis)"
+    )
+    parser.add_argument(
+        "--no-charts",
+        action="store_true",
+        help="Do not draw charts"
+    )
+
+    args = parser.parse_args()
+
+    results_dir = Path(args.results_dir)
+    output_dir = Path(args.output) if args.output else results_dir / "comparison" / "analysis"
+    window = parse_duration(args.window)
+    ramp_up = parse_duration(args.ramp_up) if args.ramp_up else None
+
+    runs = find_runs(results_dir, args.scenarios)
+    if not runs:
+        print(f"Error: No stats_history files found under {results_dir}")
+        sys.exit(1)
+
+    print(f"Analyzing {len(runs)} runs from {results_dir} (window: {window:g}s)...")
+    print()
+
+    all_windows, all_summaries = [], []
+    for (service, scenario), history in sorted(runs.items()):
+        start, end = steady_state(history, ramp_up)
+        if start is None or end is None or end <= start:
+            print(f"  ✗ [{service}/{scenario}] {history.name}: no steady-state samples")
+            continue
+        windows = analyze_history(history, start, end, window)
+        if windows.empty:
+            print(f"  ✗ [{service}/{scenario}] {history.name}: no requests in the steady state")
+            continue
+        run = history.name[:-len("_stats_history.csv")]
+        summary = summarize(windows)
+        for frame in (windows, summary):
+            frame.insert(0, "Run", run)
+            frame.insert(0, "Scenario", scenario)
+            frame.insert(0, "Service", service)
+        all_windows.append(windows)
+        all_summaries.append(summary)
+        aggregated = summary[summary["Name"] == "Aggregated"].iloc[0]
+        print(
+            f"  ✓ [{service}/{scenario}] {run}: {end - start:.0f}s steady state, "
+            f"{aggregated['RPS']:.1f} req/s, p95 {format_value(aggregated['95%'], ' ms')}, "
+            f"errors {aggregated['Error Rate']:.2%}"
+        )
+
+    if not all_summaries:
+        print("✗ Nothing to analyze")
+        sys.exit(1)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    columns = ["Service", "Scenario", "Run", "Name"]
+    windows = pd.concat(all_windows, ignore_index=True)
+    summary = pd.concat(all_summaries, ignore_index=True)
+    windows[columns + ["Window", "Start", "Requests", "Failures", "RPS", "Error Rate"] + PERCENTILES].to_csv(
+        output_dir / "windows.csv", index=False, float_format="%.3f"
+    )
+    summary[columns + ["Requests", "Failures", "Seconds", "RPS", "Error Rate"] + PERCENTILES].to_csv(
+        output_dir / "summary.csv", index=False, float_format="%.3f"
+    )
+
+    scenarios = sorted(summary["Scenario"].unique())
+    lines = ["# REST vs gRPC", ""]
+    for scenario in scenarios:
+        lines += comparison_table(summary, scenario)
+    (output_dir / "comparison.md").write_text("\n".join(lines), encoding="utf-8")
+
+    charts = []
+    if not args.no_charts:
+        try:
+            charts = [plot_scenario(windows, scenario, output_dir) for scenario in scenarios]
+        except ImportError:
+            print("Warning: matplotlib is not installed, charts skipped")
+
+    print()
+    print(f"✓ Results written to {output_dir}: windows.csv, summary.csv, comparison.md"
+          + (f", {len(charts)} charts" if charts else ""))
+
+
+if __name__ == "__main__":
+    main()
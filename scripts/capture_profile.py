@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Script to capture a sampling profile of a service during a benchmark.
+
+Both services embed a sampling profiler (app/profiler.py) behind an admin
+endpoint:
+- REST: GET <admin_url>/profile on the service port (https://localhost:8000/admin/profile)
+- gRPC: GET <admin_url>/profile on the metrics port (http://localhost:9464/profile)
+
+The script waits until the load is at steady state, has the service sample
+all its threads for --seconds, and writes the collapsed stacks to
+<prefix>_profile.folded next to the run's other results. It prints the
+functions with the most samples on the CPU (self) and on the stack (total).
+
+Steady state: with --scenario the delay is the ramp-up (users / spawn_rate)
+plus --settle seconds, and the capture is shortened to end before the test
+does. Without a scenario the capture starts after --delay seconds.
+
+View the profile as a flame graph with https://www.speedscope.app (drop the
+file), flamegraph.pl (flamegraph.pl run_profile.folded > run_profile.svg) or
+inferno-flamegraph.
+
+`run_benchmark.sh --profile` checks the service with --check before the test
+(profiling is off by default: APP_PROFILING) and runs this script next to
+Locust.
+
+Usage:
+    python scripts/capture_profile.py --url https://localhost:8000/admin --scenario normal \\
+        --output results/rest/normal/rest_normal_20260101_120000
+    python scripts/capture_profile.py --url http://localhost:9464 --seconds 20 --output /tmp/grpc
+    python scripts/capture_profile.py --url http://localhost:9464 --check
+"""
+
+import argparse
+import math
+import os
+import ssl
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from pathlib import Path
+
+import yaml
+
+# Add project root to path for imports
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from locustfiles.common import parse_duration
+
+DEFAULT_SECONDS = 30.0
+DEFAULT_SETTLE = 10.0
+# Seconds kept free between the end of the capture and the end of the test
+END_MARGIN = 5.0
+# Shortest capture worth taking
+MIN_SECONDS = 5.0
+TOP_FUNCTIONS = 15
+# Length of the --check capture
+CHECK_SECONDS = 0.05
+
+
+def steady_state_window(scenario: dict, seconds: float, settle: float):
+    """
+    Get the delay and length of a capture at the scenario's steady state.
+
+    Returns:
+        (delay, seconds); seconds is 0 when the test is too short for a capture.
+    """
+    users = float(scenario.get("users", 0))
+    spawn_rate = float(scenario.get("spawn_rate", 0)) or 1.0
+    delay = math.ceil(users / spawn_rate) + settle
+    duration = parse_duration(scenario.get("duration", 0))
+    if duration:
+        seconds = min(seconds, duration - delay - END_MARGIN)
+        if seconds < MIN_SECONDS:
+            return delay, 0.0
+    return delay, seconds
+
+
+def fetch_profile(url: str, seconds: float, interval: float, idle: bool, cafile: str) -> str:
+    """Run a capture on the service and return the collapsed stacks."""
+    query = f"seconds={seconds:g}&interval={interval:g}&idle={'true' if idle else 'false'}"
+    context = ssl.create_default_context(cafile=cafile) if url.startswith("https") else None
+    with urllib.request.urlopen(f"{url.rstrip('/')}/profile?{query}", timeout=seconds + 30, context=context) as response:
+        return response.read().decode()
+
+
+def top_functions(stacks: str, limit: int = TOP_FUNCTIONS):
+    """Count samples per function: innermost frame (self) and anywhere on the stack (total)."""
+    own, total = Counter(), Counter()
+    samples = 0
+    for line in stacks.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if not stack:
+            continue
+        count = int(count)
+        samples += count
+        # The first frame is the thread name
+        frames = stack.split(";")[1:]
+        if frames:
+            own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    return samples, own.most_common(limit), total
+
+
+def capture(args, seconds: float):
+    """Run a capture; returns the collapsed stacks, or None after printing the error."""
+    try:
+        return fetch_profile(args.url, seconds, args.interval, args.idle, args.cafile)
+    except urllib.error.HTTPError as e:
+        print(f"Error: profile capture failed: HTTP {e.code} {e.read().decode().strip()}")
+        if e.code == 404:
+            print("Start the service with APP_PROFILING=true (off by default)")
+    except (urllib.error.URLError, OSError) as e:
+        print(f"Error: profile capture failed: {e}")
+    return None
+
+
+def run(args) -> bool:
+    if args.check:
+        # A capture of a few samples: fails at once when profiling is off
+        if capture(args, CHECK_SECONDS) is None:
+            return False
+        print(f"Profiling is enabled at {args.url}")
+        return True
+
+    seconds = args.seconds
+    delay = args.delay
+    if args.scenario:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        scenario = config["scenarios"].get(args.scenario)
+        if scenario is None:
+            print(f"Error: unknown scenario '{args.scenario}' in {args.config}")
+            return False
+        delay, seconds = steady_state_window(scenario, seconds, args.settle)
+        if not seconds:
+            print(f"Scenario '{args.scenario}' is too short for a profile after {delay:g}s of ramp-up; skipping")
+            return True
+
+    if delay:
+        print(f"Waiting {delay:g}s for steady state...")
+        time.sleep(delay)
+
+    print(f"Profiling {args.url} for {seconds:g}s (sample every {args.interval * 1000:g} ms)...")
+    stacks = capture(args, seconds)
+    if stacks is None:
+        return False
+
+    output = Path(f"{args.output}_profile.folded")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(stacks, encoding="utf-8")
+
+    samples, own, total = top_functions(stacks)
+    print(f"Profile: {samples} stack samples -> {output}")
+    if samples:
+        print(f"{'Self %':>7} {'Total %':>7}  Function")
+        for frame, count in own:
+            print(f"{count / samples * 100:7.1f} {total[frame] / samples * 100:7.1f}  {frame}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture a sampling profile of a service under load")
+    parser.add_argument("--url", type=str, required=True,
+                        help="Admin URL of the service (REST: https://localhost:8000/admin, gRPC: http://localhost:9464)")
+    parser.add_argument("--output", type=str,
+                        help="Output prefix (the run's CSV prefix): writes <prefix>_profile.folded")
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS,
+                        help=f"Length of the capture (default: {DEFAULT_SECONDS:g})")
+    parser.add_argument("--interval", type=float, default=0.01,
+                        help="Seconds between samples (default: 0.01)")
+    parser.add_argument("--idle", action="store_true",
+                        help="Keep threads waiting for work or for locks in the profile")
+    parser.add_argument("--delay", type=float, default=0,
+                        help="Seconds to wait before the capture (ignored with --scenario)")
+    parser.add_argument("--scenario", type=str,
+                        help="Start at the scenario's steady state and end before the test does")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE,
+                        help=f"Seconds to wait after the ramp-up with --scenario (default: {DEFAULT_SETTLE:g})")
+    parser.add_argument("--config", type=str, default=os.getenv("BENCHMARK_CONFIG", "config/test_scenarios.yaml"),
+                        help="Benchmark configuration (default: config/test_scenarios.yaml)")
+    parser.add_argument("--cafile", type=str, default=os.getenv("TLS_CA_FILE", "certs/ca.pem"),
+                        help="CA certificate for https URLs (default: TLS_CA_FILE or certs/ca.pem)")
+
+    parser.add_argument("--check", action="store_true",
+                        help="Only check that the service has profiling enabled (APP_PROFILING) and exit")
+
+    args = parser.parse_args()
+    if not args.check and not args.output:
+        parser.error("--output is required")
+
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
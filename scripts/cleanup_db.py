@@ -6,16 +6,36 @@ Usage:
     python scripts/cleanup_db.py --rest-db glossary_RESTservice/glossary.db --grpc-db glossary_RPCservice/glossary.db
     python scripts/cleanup_db.py --rest-db glossary_RESTservice/glossary.db
     python scripts/cleanup_db.py --grpc-db glossary_RPCservice/glossary.db
+    python scripts/cleanup_db.py --yes --strategy drop
+    python scripts/cleanup_db.py --yes --strategy replace
+
+Strategies:
+    delete:   ORM delete of all terms (freed pages stay in the file)
+    drop:     drop the terms table and recreate it with its indexes
+              (freed pages stay in the file)
+    truncate: DELETE without WHERE, VACUUM and wal_checkpoint(TRUNCATE),
+              so the file and the WAL shrink back to an empty database (default)
+    replace:  build an empty database with the same schema and atomically
+              rename it over the file (services must be stopped)
 """
 
 import argparse
+import sqlite3
 import sys
+import time
 from pathlib import Path
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Mapped, mapped_column
 from sqlalchemy import DateTime, Integer, String, func
 from datetime import datetime
 
+# Add project root to path for imports
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from scripts.reset_db import restore_database
+
 
 # Define Term model (same as in both services)
 class Base(DeclarativeBase):
@@ -36,13 +56,118 @@ class Term(Base):
     )
 
 
-def cleanup_database(db_path: str, confirm: bool = False):
+STRATEGIES = ["delete", "drop", "truncate", "replace"]
+
+
+def database_size(db_path: Path) -> int:
+    """Get the size of a database in bytes, including its WAL file."""
+    wal_path = db_path.with_name(db_path.name + "-wal")
+    return sum(path.stat().st_size for path in (db_path, wal_path) if path.exists())
+
+
+def format_size(size: int) -> str:
+    """Format a size in bytes for output."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def delete_terms(engine) -> int:
+    """Delete all terms through the ORM."""
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    session = SessionLocal()
+    try:
+        deleted = session.query(Term).delete()
+        session.commit()
+        return deleted
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def drop_terms(engine) -> int:
+    """Drop the terms table and recreate it (with its indexes) from its stored schema."""
+    # sqlite3 would run the DDL in autocommit; an explicit transaction keeps the
+    # table if the rebuild fails (SQLite DDL is transactional)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            count = conn.exec_driver_sql("SELECT COUNT(*) FROM terms").scalar()
+            statements = [
+                sql for (sql,) in conn.exec_driver_sql(
+                    "SELECT sql FROM sqlite_master WHERE tbl_name = 'terms' AND sql IS NOT NULL "
+                    "ORDER BY type = 'index'"
+                )
+            ]
+            conn.exec_driver_sql("DROP TABLE terms")
+            for statement in statements:
+                conn.exec_driver_sql(statement)
+        except BaseException:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+        conn.exec_driver_sql("COMMIT")
+    return count
+
+
+def truncate_terms(engine) -> int:
+    """Delete all terms, then give the free pages back with VACUUM and empty the WAL."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        count = conn.exec_driver_sql("SELECT COUNT(*) FROM terms").scalar()
+        # DELETE without WHERE truncates the table in SQLite
+        conn.exec_driver_sql("DELETE FROM terms")
+        conn.exec_driver_sql("VACUUM")
+        busy, _, _ = conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()
+        if busy:
+            print("  Warning: WAL checkpoint blocked by another connection, the WAL file was not truncated")
+    return count
+
+
+def replace_database(db_path: Path) -> int:
+    """
+    Replace the database file with an empty database of the same schema.
+
+    Other tables (e.g. alembic_version) keep their rows.
+    """
+    empty_path = db_path.with_name(db_path.name + ".empty")
+    if empty_path.exists():
+        empty_path.unlink()
+    conn = sqlite3.connect(empty_path)
+    try:
+        conn.execute("ATTACH DATABASE ? AS old", (str(db_path),))
+        count = conn.execute("SELECT COUNT(*) FROM old.terms").fetchone()[0]
+        journal_mode = conn.execute("PRAGMA old.journal_mode").fetchone()[0]
+        objects = conn.execute(
+            "SELECT type, name, sql FROM old.sqlite_master "
+            "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY type = 'index'"
+        ).fetchall()
+        for object_type, name, sql in objects:
+            conn.execute(sql)
+            if object_type == "table" and name != "terms":
+                conn.execute(f'INSERT INTO main."{name}" SELECT * FROM old."{name}"')
+        conn.commit()
+        conn.execute("DETACH DATABASE old")
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    finally:
+        conn.close()
+    try:
+        restore_database(str(empty_path), str(db_path), method="swap")
+    finally:
+        empty_path.unlink()
+    return count
+
+
+def cleanup_database(db_path: str, confirm: bool = False, strategy: str = "truncate"):
     """
     Remove all terms from database.
     
     Args:
         db_path: Path to SQLite database file
         confirm: Whether to skip confirmation prompt
+        strategy: How to remove the terms (see STRATEGIES)
     """
     db_path = Path(db_path).resolve()
     
@@ -59,37 +184,37 @@ def cleanup_database(db_path: str, confirm: bool = False):
     # Create database URL
     db_url = f"sqlite:///{db_path}"
     
-    # Create engine and session
+    # Create engine
     engine = create_engine(
         db_url,
         connect_args={"check_same_thread": False},
         future=True
     )
     
-    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
-    session = SessionLocal()
-    
+    size_before = database_size(db_path)
+    start_time = time.perf_counter()
     try:
-        # Count existing terms
-        count_before = session.query(Term).count()
-        
-        if count_before == 0:
-            print(f"  Database {db_path.name} is already empty")
-            return True
-        
-        # Delete all terms
-        deleted = session.query(Term).delete()
-        session.commit()
-        
-        print(f"  ✓ Deleted {deleted} terms from {db_path.name}")
-        return True
-        
+        if strategy == "delete":
+            deleted = delete_terms(engine)
+        elif strategy == "drop":
+            deleted = drop_terms(engine)
+        elif strategy == "truncate":
+            deleted = truncate_terms(engine)
+        elif strategy == "replace":
+            engine.dispose()
+            deleted = replace_database(db_path)
+        else:
+            raise ValueError(f"Unknown cleanup strategy '{strategy}'. Available: {', '.join(STRATEGIES)}")
     except Exception as e:
-        session.rollback()
         print(f"  ✗ Error cleaning {db_path.name}: {e}")
         return False
     finally:
-        session.close()
+        engine.dispose()
+    elapsed = time.perf_counter() - start_time
+    
+    print(f"  ✓ Deleted {deleted} terms from {db_path.name} ({strategy}) in {elapsed * 1000:.0f} ms")
+    print(f"    Size: {format_size(size_before)} -> {format_size(database_size(db_path))}")
+    return True
 
 
 def main():
@@ -118,6 +243,14 @@ def main():
         action="store_true",
         help="Only clean gRPC database"
     )
+    parser.add_argument(
+        "--strategy",
+        choices=STRATEGIES,
+        default="truncate",
+        help="delete: ORM delete; drop: drop and recreate the table; "
+             "truncate: delete, VACUUM and truncate the WAL (default); "
+             "replace: swap in an empty database file (services must be stopped)"
+    )
     parser.add_argument(
         "--yes",
         "-y",
@@ -127,20 +260,20 @@ def main():
     
     args = parser.parse_args()
     
-    print("Cleaning up test data from databases...")
+    print(f"Cleaning up test data from databases (strategy: {args.strategy})...")
     print()
     
     success = True
     
     if not args.grpc_only:
         print(f"REST Database: {args.rest_db}")
-        if not cleanup_database(args.rest_db, confirm=args.yes):
+        if not cleanup_database(args.rest_db, confirm=args.yes, strategy=args.strategy):
             success = False
         print()
     
     if not args.rest_only:
         print(f"gRPC Database: {args.grpc_db}")
-        if not cleanup_database(args.grpc_db, confirm=args.yes):
+        if not cleanup_database(args.grpc_db, confirm=args.yes, strategy=args.strategy):
             success = False
         print()
     
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Script to gate benchmark runs against stored baselines.
+
+A baseline is one run of a service and scenario saved to
+results/baselines/<service>_<scenario>.json: per endpoint its throughput and
+error rate (from <run>_stats.csv) and its full latency distribution (the HDR
+histograms of <run>_latency.hlog, written by locustfiles/hdr_histograms.py).
+
+`compare` checks a run against the baseline, per endpoint and Aggregated:
+- latency: one-sided Mann-Whitney U test on the two latency distributions
+  (histogram counts, normal approximation with tie correction). A regression
+  needs p < --alpha and p50 or p95 higher than the baseline by more than
+  --latency-tolerance, so tiny but "significant" shifts of long runs pass
+- throughput: Aggregated RPS below the baseline by more than --rps-tolerance
+- errors: error rate above the baseline by more than --error-tolerance
+
+Exit codes: 0 no regression, 1 regression, 2 missing baseline or run files.
+
+Usage:
+    python scripts/compare_baseline.py save --service rest --scenario normal
+    python scripts/compare_baseline.py compare --service rest --scenario normal
+    python scripts/compare_baseline.py compare --run results/rest/normal/rest_normal_20260121_164443
+"""
+
+import argparse
+import csv
+import json
+import math
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+try:
+    from hdrh.histogram import HdrHistogram
+except ImportError:
+    HdrHistogram = None
+
+# Add project root to path for imports
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from locustfiles.hdr_histograms import HIGHEST_VALUE_US, LOWEST_VALUE_US, SIGNIFICANT_DIGITS, endpoint_tag
+
+BASELINE_DIR = "results/baselines"
+
+DEFAULT_ALPHA = 0.01
+DEFAULT_LATENCY_TOLERANCE = 0.05
+DEFAULT_RPS_TOLERANCE = 0.10
+DEFAULT_ERROR_TOLERANCE = 0.01
+
+# Run files are named <service>_<scenario>_<YYYYmmdd>_<HHMMSS>
+RUN_NAME = re.compile(r"^(rest|grpc)_(.+)_\d{8}_\d{6}$")
+
+
+def new_histogram():
+    return HdrHistogram(LOWEST_VALUE_US, HIGHEST_VALUE_US, SIGNIFICANT_DIGITS)
+
+
+def find_latest_run(results_dir: Path, service: str, scenario: str) -> Path:
+    """Get the CSV prefix of the latest run of a service and scenario."""
+    stats = sorted((results_dir / service / scenario).glob(f"{service}_{scenario}_*_stats.csv"))
+    return Path(str(stats[-1])[:-len("_stats.csv")]) if stats else None
+
+
+def read_stats(run: Path) -> dict:
+    """Read request counts, throughput and error rate per endpoint from <run>_stats.csv."""
+    endpoints = {}
+    with open(f"{run}_stats.csv", newline="") as f:
+        for row in csv.DictReader(f):
+            requests = int(row["Request Count"])
+            endpoints[row["Name"]] = {
+                "type": row["Type"],
+                "requests": requests,
+                "failures": int(row["Failure Count"]),
+                "rps": float(row["Requests/s"]),
+                "error_rate": int(row["Failure Count"]) / requests if requests else 0.0,
+            }
+    return endpoints
+
+
+def read_histograms(run: Path, stats: dict) -> dict:
+    """
+    Merge the interval histograms of <run>_latency.hlog per endpoint.
+
+    Args:
+        run: CSV prefix of the run
+        stats: Endpoints of the run (read_stats), used to map log tags to names
+
+    Returns:
+        Dict of endpoint name -> HdrHistogram, with "Aggregated" for all requests.
+    """
+    names = {endpoint_tag(values["type"], name): name for name, values in stats.items()}
+    histograms = {"Aggregated": new_histogram()}
+    with open(f"{run}_latency.hlog") as f:
+        for line in f:
+            if not line.startswith("Tag="):
+                continue
+            tag, _, _, _, encoded = line.rstrip("\n").split(",", 4)
+            tag = tag[len("Tag="):]
+            name = names.get(tag, tag)
+            histogram = histograms.get(name)
+            if histogram is None:
+                histogram = histograms[name] = new_histogram()
+            histogram.decode_and_add(encoded)
+            histograms["Aggregated"].decode_and_add(encoded)
+    return histograms
+
+
+def histogram_counts(histogram) -> dict:
+    """Get the recorded values of a histogram with their counts."""
+    return {
+        item.value_iterated_to: item.count_added_in_this_iter_step
+        for item in histogram.get_recorded_iterator()
+    }
+
+
+def mann_whitney_greater(baseline: dict, current: dict) -> tuple:
+    """
+    One-sided Mann-Whitney U test that current values tend to be larger.
+
+    Args:
+        baseline, current: Dicts of value -> count
+
+    Returns:
+        (p-value, probability that a current value exceeds a baseline value)
+    """
+    n_baseline, n_current = sum(baseline.values()), sum(current.values())
+    if not n_baseline or not n_current:
+        return 1.0, 0.5
+    total = n_baseline + n_current
+    rank_sum, ties, rank = 0.0, 0.0, 0
+    for value in sorted(set(baseline) | set(current)):
+        count_current = current.get(value, 0)
+        count = baseline.get(value, 0) + count_current
+        # Tied values share the mean of their ranks
+        rank_sum += count_current * (rank + (count + 1) / 2)
+        ties += count ** 3 - count
+        rank += count
+    u = rank_sum - n_current * (n_current + 1) / 2
+    mean = n_baseline * n_current / 2
+    variance = n_baseline * n_current / 12 * ((total + 1) - ties / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0, 0.5
+    z = (u - mean) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2)), u / (n_baseline * n_current)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=project_root
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_run(run: Path) -> dict:
+    """Read the metrics of a run into the baseline format."""
+    stats = read_stats(run)
+    histograms = read_histograms(run, stats)
+    endpoints = {}
+    for name, values in stats.items():
+        histogram = histograms.get(name)
+        endpoints[name] = dict(values)
+        if histogram is not None and histogram.get_total_count():
+            endpoints[name].update({
+                "p50": histogram.get_value_at_percentile(50) / 1000,
+                "p95": histogram.get_value_at_percentile(95) / 1000,
+                "p99": histogram.get_value_at_percentile(99) / 1000,
+                "histogram": histogram.encode().decode("ascii"),
+            })
+    return {"run": run.name, "endpoints": endpoints}
+
+
+def compare(baseline: dict, current: dict, args) -> list:
+    """
+    Compare a run with its baseline.
+
+    Returns:
+        Rows of (endpoint, check, baseline value, current value, detail, regression).
+    """
+    rows = []
+    for name, base in baseline["endpoints"].items():
+        cur = current["endpoints"].get(name)
+        if cur is None or name.startswith("["):
+            continue
+        if "histogram" in base and "histogram" in cur:
+            p_value, probability = mann_whitney_greater(
+                histogram_counts(HdrHistogram.decode(base["histogram"])),
+                histogram_counts(HdrHistogram.decode(cur["histogram"])),
+            )
+            for percentile in ("p50", "p95"):
+                change = cur[percentile] / base[percentile] - 1 if base[percentile] else 0.0
+                regression = p_value < args.alpha and change > args.latency_tolerance
+                rows.append((
+                    name, percentile, f"{base[percentile]:.2f} ms", f"{cur[percentile]:.2f} ms",
+                    f"{change:+.1%}, p={p_value:.2g}, P(cur>base)={probability:.2f}", regression,
+                ))
+        error_change = cur["error_rate"] - base["error_rate"]
+        rows.append((
+            name, "errors", f"{base['error_rate']:.2%}", f"{cur['error_rate']:.2%}",
+            f"{error_change * 100:+.2f} pp", error_change > args.error_tolerance,
+        ))
+        if name == "Aggregated":
+            change = cur["rps"] / base["rps"] - 1 if base["rps"] else 0.0
+            rows.append((
+                name, "rps", f"{base['rps']:.2f}", f"{cur['rps']:.2f}",
+                f"{change:+.1%}", change < -args.rps_tolerance,
+            ))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Save benchmark baselines and check runs against them"
+    )
+    parser.add_argument("command", choices=["save", "compare"], help="save a run as baseline or compare a run with it")
+    parser.add_argument("--service", choices=["rest", "grpc"], help="Service (default: from the run name)")
+    parser.add_argument("--scenario", type=str, help="Scenario (default: from the run name)")
+    parser.add_argument(
+        "--run",
+        type=str,
+        help="CSV prefix of the run (results/<service>/<scenario>/<service>_<scenario>_<timestamp>); "
+             "default: latest run of --service and --scenario"
+    )
+    parser.add_argument("--results-dir", type=str, default="results", help="Results directory (default: results)")
+    parser.add_argument("--baseline-dir", type=str, default=BASELINE_DIR, help=f"Baseline directory (default: {BASELINE_DIR})")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help=f"Significance level (default: {DEFAULT_ALPHA})")
+    parser.add_argument(
+        "--latency-tolerance", type=float, default=DEFAULT_LATENCY_TOLERANCE,
+        help=f"Tolerated p50/p95 increase (default: {DEFAULT_LATENCY_TOLERANCE})"
+    )
+    parser.add_argument(
+        "--rps-tolerance", type=float, default=DEFAULT_RPS_TOLERANCE,
+        help=f"Tolerated Aggregated RPS decrease (default: {DEFAULT_RPS_TOLERANCE})"
+    )
+    parser.add_argument(
+        "--error-tolerance", type=float, default=DEFAULT_ERROR_TOLERANCE,
+        help=f"Tolerated error rate increase (default: {DEFAULT_ERROR_TOLERANCE})"
+    )
+
+    args = parser.parse_args()
+
+    if HdrHistogram is None:
+        print("Error: hdrhistogram is not installed. Run: pip install -r requirements_benchmark.txt")
+        sys.exit(2)
+
+    if args.run:
+        run = Path(args.run)
+        match = RUN_NAME.match(run.name)
+        service = args.service or (match.group(1) if match else None)
+        scenario = args.scenario or (match.group(2) if match else None)
+        if not service or not scenario:
+            parser.error("--service and --scenario are needed when the run name does not contain them")
+    else:
+        if not args.service or not args.scenario:
+            parser.error("--service and --scenario are required without --run")
+        service, scenario = args.service, args.scenario
+        run = find_latest_run(Path(args.results_dir), service, scenario)
+        if run is None:
+            print(f"Error: No runs of {service}/{scenario} under {args.results_dir}")
+            sys.exit(2)
+
+    for suffix in ("_stats.csv", "_latency.hlog"):
+        if not Path(f"{run}{suffix}").exists():
+            print(f"Error: {run}{suffix} not found (the run needs --csv and locustfiles/hdr_histograms.py)")
+            sys.exit(2)
+
+    baseline_path = Path(args.baseline_dir) / f"{service}_{scenario}.json"
+    current = load_run(run)
+
+    if args.command == "save":
+        current.update({"service": service, "scenario": scenario, "saved": int(time.time()), "commit": git_commit()})
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"✓ Baseline {baseline_path} saved from {run.name}")
+        sys.exit(0)
+
+    if not baseline_path.exists():
+        print(f"Error: No baseline {baseline_path} (create it with: compare_baseline.py save --run {run})")
+        sys.exit(2)
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+
+    print(f"Comparing {run.name} with baseline {baseline['run']} (commit {baseline.get('commit') or 'unknown'})")
+    print()
+    rows = compare(baseline, current, args)
+    widths = [max(len(str(row[i])) for row in rows) for i in range(4)] if rows else [0] * 4
+    for name, check, base, cur, detail, regression in rows:
+        mark = "✗" if regression else "✓"
+        print(f"  {mark} {name:<{widths[0]}}  {check:<6} {base:>{widths[2]}} -> {cur:>{widths[3]}}  ({detail})")
+    print()
+
+    regressions = [row for row in rows if row[5]]
+    if regressions:
+        print(f"✗ {len(regressions)} regression(s) against the baseline")
+        sys.exit(1)
+    print("✓ No regression against the baseline")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Script to collect the garbage collector pauses and allocation snapshots of a run.
+
+Both services time every garbage collection (app/gc_monitor.py) and keep the
+recent pauses; with APP_TRACEMALLOC_INTERVAL they also compare tracemalloc
+snapshots on that interval. This script fetches the pauses and snapshots from
+the run's start on:
+- REST: GET <admin_url>/gc (https://localhost:8000/admin/gc)
+- gRPC: GET <admin_url>/gc on the metrics port (http://localhost:9464/gc)
+
+and writes next to the run's other results:
+- <prefix>_gc.csv: one row per collection (Unix time, generation, pause)
+- <prefix>_gc_summary.csv: per generation the number of collections, total,
+  mean, p99 and max pause, collections per second
+- <prefix>_tracemalloc.csv: per snapshot the traced and peak memory and the
+  locations whose allocations changed the most since the previous snapshot
+
+When <prefix>_stats_history.csv exists, the p99 of every history row is set
+against the GC pause time of the same window (Locust's current percentiles
+cover the last 10 s) and the correlation and the worst seconds are printed.
+
+The benchmark runners call this script when the test ends. GC statistics are
+off by default (APP_GC_STATS); against a service without them it only says so.
+
+Usage:
+    python scripts/gc_report.py --url https://localhost:8000/admin --since 1767261600 \\
+        --output results/rest/stability/rest_stability_20260101_120000
+    python scripts/gc_report.py --url http://localhost:9464 --output /tmp/grpc
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import ssl
+import sys
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+
+GC_HEADER = ["Timestamp", "Generation", "Pause ms", "Collected", "Uncollectable"]
+SUMMARY_HEADER = ["Generation", "Collections", "Collections/s", "Total ms", "Mean ms", "99% ms", "Max ms"]
+TRACEMALLOC_HEADER = [
+    "Timestamp", "Traced MB", "Peak MB", "Rank", "Location", "Size KB", "Count", "Size Diff KB", "Count Diff",
+]
+
+# Window of Locust's current response time percentiles in *_stats_history.csv
+PERCENTILE_WINDOW = 10
+TOP_SECONDS = 5
+TOP_LOCATIONS = 10
+
+
+def fetch_report(url: str, since: float, cafile: str) -> dict:
+    """Get the GC report of the service from `since` (Unix time) on."""
+    context = ssl.create_default_context(cafile=cafile) if url.startswith("https") else None
+    with urllib.request.urlopen(f"{url.rstrip('/')}/gc?since={since:.3f}", timeout=60, context=context) as response:
+        return json.load(response)
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))]
+
+
+def summarize(pauses: list, elapsed: float) -> list:
+    """Summary rows per generation and for all collections."""
+    by_generation = defaultdict(list)
+    for _, generation, pause, _, _ in pauses:
+        by_generation[str(generation)].append(pause)
+    by_generation["all"] = [pause for _, _, pause, _, _ in pauses]
+    rows = []
+    for generation, values in sorted(by_generation.items()):
+        if not values:
+            continue
+        total = sum(values)
+        rows.append([
+            generation, len(values), round(len(values) / elapsed, 2) if elapsed else "",
+            round(total, 3), round(total / len(values), 4), round(percentile(values, 0.99), 4), round(max(values), 4),
+        ])
+    return rows
+
+
+def correlate(history_file: Path, pauses: list):
+    """
+    Set the Aggregated p99 of each history row against the GC pause time of its window.
+
+    Returns:
+        (Pearson correlation or None, [(timestamp, p99 ms, gc ms), ...] worst p99 first)
+    """
+    # Pause time per whole second: a history row describes the seconds before its timestamp
+    per_second = defaultdict(float)
+    for t, _, pause, _, _ in pauses:
+        per_second[math.ceil(t)] += pause
+    rows = []
+    with open(history_file, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["Name"] != "Aggregated" or row["99%"] in ("", "N/A"):
+                continue
+            timestamp = int(row["Timestamp"])
+            gc_ms = sum(per_second.get(second, 0.0) for second in range(timestamp - PERCENTILE_WINDOW + 1, timestamp + 1))
+            rows.append((timestamp, float(row["99%"]), round(gc_ms, 3)))
+    worst = sorted(rows, key=lambda row: row[1], reverse=True)[:TOP_SECONDS]
+    if len(rows) < 3:
+        return None, worst
+    p99 = [row[1] for row in rows]
+    gc_ms = [row[2] for row in rows]
+    mean_p99, mean_gc = sum(p99) / len(p99), sum(gc_ms) / len(gc_ms)
+    covariance = sum((a - mean_p99) * (b - mean_gc) for a, b in zip(p99, gc_ms))
+    spread = math.sqrt(sum((a - mean_p99) ** 2 for a in p99) * sum((b - mean_gc) ** 2 for b in gc_ms))
+    return (covariance / spread if spread else None), worst
+
+
+def write_csv(path: Path, header: list, rows: list):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def run(args) -> bool:
+    try:
+        report = fetch_report(args.url, args.since, args.cafile)
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            # GC statistics are off by default; nothing to collect
+            print("GC statistics are disabled in the service (start it with APP_GC_STATS=true); skipping")
+            return True
+        print(f"Error: GC report failed: HTTP {e.code} {e.read().decode().strip()}")
+        return False
+    except (urllib.error.URLError, OSError) as e:
+        print(f"Error: GC report failed: {e}")
+        return False
+
+    prefix = args.output
+    Path(prefix).parent.mkdir(parents=True, exist_ok=True)
+    pauses = report["pauses"]
+    write_csv(Path(f"{prefix}_gc.csv"), GC_HEADER, pauses)
+
+    elapsed = (pauses[-1][0] - (args.since or pauses[0][0])) if pauses else 0
+    summary = summarize(pauses, elapsed)
+    write_csv(Path(f"{prefix}_gc_summary.csv"), SUMMARY_HEADER, summary)
+
+    print(f"GC pauses: {len(pauses)} collections -> {prefix}_gc.csv")
+    if report["truncated"]:
+        print("Warning: the service kept only the latest pauses; the start of the run is missing")
+    if summary:
+        print(f"{'Gen':>4} {'Count':>8} {'/s':>8} {'Total ms':>10} {'Mean ms':>9} {'99% ms':>9} {'Max ms':>9}")
+        for row in summary:
+            print(f"{row[0]:>4} {row[1]:>8} {row[2]:>8} {row[3]:>10} {row[4]:>9} {row[5]:>9} {row[6]:>9}")
+        if elapsed:
+            total = next(row[3] for row in summary if row[0] == "all")
+            print(f"GC time: {total / (elapsed * 1000) * 100:.2f}% of {elapsed:.0f}s")
+
+    history_file = Path(f"{prefix}_stats_history.csv")
+    if pauses and history_file.exists():
+        r, worst = correlate(history_file, pauses)
+        print(f"p99 vs GC pause time per {PERCENTILE_WINDOW}s window: "
+              f"correlation {'n/a' if r is None else f'{r:.2f}'}")
+        for timestamp, p99, gc_ms in worst:
+            print(f"  {timestamp}: p99 {p99:g} ms, GC {gc_ms:g} ms")
+
+    snapshots = report["snapshots"]
+    if snapshots:
+        rows = []
+        growth = defaultdict(int)
+        for snapshot in snapshots:
+            for rank, (location, size, count, size_diff, count_diff) in enumerate(snapshot["top"], 1):
+                rows.append([
+                    round(snapshot["time"]), round(snapshot["traced"] / 2**20, 2), round(snapshot["peak"] / 2**20, 2),
+                    rank, location, round(size / 1024, 1), count, round(size_diff / 1024, 1), count_diff,
+                ])
+                growth[location] += size_diff
+        write_csv(Path(f"{prefix}_tracemalloc.csv"), TRACEMALLOC_HEADER, rows)
+        first, last = snapshots[0], snapshots[-1]
+        print(f"tracemalloc: {len(snapshots)} snapshots -> {prefix}_tracemalloc.csv; traced "
+              f"{first['traced'] / 2**20:.1f} -> {last['traced'] / 2**20:.1f} MB, "
+              f"peak {max(s['peak'] for s in snapshots) / 2**20:.1f} MB")
+        # Summed over the top locations of every interval: steady growth points at a leak
+        for location, size_diff in sorted(growth.items(), key=lambda item: item[1], reverse=True)[:TOP_LOCATIONS]:
+            if size_diff > 0:
+                print(f"  +{size_diff / 1024:10.1f} KB  {location}")
+    elif report["tracemalloc"]:
+        print("tracemalloc: no snapshot during the run (the run is shorter than APP_TRACEMALLOC_INTERVAL)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect GC pauses and tracemalloc snapshots of a service for a run")
+    parser.add_argument("--url", type=str, required=True,
+                        help="Admin URL of the service (REST: https://localhost:8000/admin, gRPC: http://localhost:9464)")
+    parser.add_argument("--output", type=str, required=True,
+                        help="Output prefix (the run's CSV prefix): writes <prefix>_gc.csv, _gc_summary.csv, _tracemalloc.csv")
+    parser.add_argument("--since", type=float, default=0,
+                        help="Unix time of the run's start (default: everything the service kept)")
+    parser.add_argument("--cafile", type=str, default=os.getenv("TLS_CA_FILE", "certs/ca.pem"),
+                        help="CA certificate for https URLs (default: TLS_CA_FILE or certs/ca.pem)")
+
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
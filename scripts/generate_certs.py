@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Script to generate self-signed TLS certificates for benchmark testing.
+
+Creates a local certificate authority and a server certificate signed by it.
+Both services use the server certificate, and the Locust users trust the CA.
+
+Usage:
+    python scripts/generate_certs.py
+    python scripts/generate_certs.py --out certs --hosts rest-service grpc-service
+    python scripts/generate_certs.py --force
+"""
+
+import argparse
+import datetime
+import ipaddress
+import sys
+from pathlib import Path
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID
+
+
+# Names always present in the server certificate (local runs and Docker healthchecks)
+DEFAULT_HOSTS = ["localhost", "127.0.0.1", "::1"]
+
+CA_CERT_FILE = "ca.pem"
+SERVER_CERT_FILE = "server.pem"
+SERVER_KEY_FILE = "server-key.pem"
+
+
+def generate_private_key() -> ec.EllipticCurvePrivateKey:
+    """Generate a P-256 key (the curve most TLS stacks negotiate fastest)."""
+    return ec.generate_private_key(ec.SECP256R1())
+
+
+def build_subject_alt_names(hosts: list) -> x509.SubjectAlternativeName:
+    """Build SAN entries, using IP entries for addresses and DNS entries otherwise."""
+    entries = []
+    for host in hosts:
+        try:
+            entries.append(x509.IPAddress(ipaddress.ip_address(host)))
+        except ValueError:
+            entries.append(x509.DNSName(host))
+    return x509.SubjectAlternativeName(entries)
+
+
+def generate_certificates(out_dir: str, hosts: list, days: int, force: bool = False) -> bool:
+    """
+    Generate CA and server certificates.
+
+    Args:
+        out_dir: Directory to write PEM files to
+        hosts: Host names and IP addresses for the server certificate
+        days: Certificate validity in days
+        force: Whether to overwrite existing certificates
+
+    Returns:
+        True if certificates are available after the call.
+    """
+    out_path = Path(out_dir).resolve()
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    server_cert_path = out_path / SERVER_CERT_FILE
+    if server_cert_path.exists() and not force:
+        print(f"  Certificates already exist in {out_path} (use --force to regenerate)")
+        return True
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    not_after = now + datetime.timedelta(days=days)
+
+    # Certificate authority
+    ca_key = generate_private_key()
+    ca_name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Glossary Benchmark Local CA")])
+    ca_cert = (
+        x509.CertificateBuilder()
+        .subject_name(ca_name)
+        .issuer_name(ca_name)
+        .public_key(ca_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(not_after)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=0), critical=True)
+        .add_extension(
+            x509.KeyUsage(
+                digital_signature=True, content_commitment=False, key_encipherment=False,
+                data_encipherment=False, key_agreement=False, key_cert_sign=True,
+                crl_sign=True, encipher_only=False, decipher_only=False,
+            ),
+            critical=True,
+        )
+        .sign(ca_key, hashes.SHA256())
+    )
+
+    # Server certificate signed by the CA
+    server_key = generate_private_key()
+    server_cert = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, hosts[0])]))
+        .issuer_name(ca_name)
+        .public_key(server_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(not_after)
+        .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
+        .add_extension(build_subject_alt_names(hosts), critical=False)
+        .add_extension(x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH]), critical=False)
+        .sign(ca_key, hashes.SHA256())
+    )
+
+    (out_path / CA_CERT_FILE).write_bytes(ca_cert.public_bytes(serialization.Encoding.PEM))
+    server_cert_path.write_bytes(server_cert.public_bytes(serialization.Encoding.PEM))
+    (out_path / SERVER_KEY_FILE).write_bytes(
+        server_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+
+    print(f"  ✓ CA certificate:     {out_path / CA_CERT_FILE}")
+    print(f"  ✓ Server certificate: {server_cert_path}")
+    print(f"  ✓ Server key:         {out_path / SERVER_KEY_FILE}")
+    print(f"  Valid for: {', '.join(hosts)} ({days} days)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate self-signed TLS certificates for benchmark testing"
+    )
+    parser.add_argument(
+        "--out",
+        type=str,
+        default="certs",
+        help="Output directory for PEM files (default: certs)"
+    )
+    parser.add_argument(
+        "--hosts",
+        nargs="*",
+        default=[],
+        help="Additional host names or IP addresses for the server certificate"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=365,
+        help="Certificate validity in days (default: 365)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite existing certificates"
+    )
+
+    args = parser.parse_args()
+
+    hosts = DEFAULT_HOSTS + [h for h in args.hosts if h not in DEFAULT_HOSTS]
+
+    print(f"Generating TLS certificates in {args.out}...")
+    print()
+
+    if generate_certificates(args.out, hosts, args.days, args.force):
+        print()
+        print("✓ Certificates ready")
+        sys.exit(0)
+    else:
+        print("✗ Certificate generation failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Script to reset the service databases to a template dataset between benchmark runs.
+
+The template is created by setup_test_data.py --seed. Restoring it takes
+milliseconds to a few seconds instead of a cleanup plus reseed, and both
+services get exactly the same data.
+
+Methods:
+    backup: SQLite online backup API into the existing database file. Safe while
+            the services are running: their open connections see the new data
+            and the database keeps its journal mode (WAL).
+    swap:   copy the template next to the database and atomically rename it over
+            the database file. Only for stopped services: a running service keeps
+            its handle to the replaced file.
+
+Usage:
+    python scripts/reset_db.py --template data/templates/glossary_100000_seed42.db
+    python scripts/reset_db.py --template data/templates/glossary_100000_seed42.db --rest-only
+    python scripts/reset_db.py --template data/templates/glossary_100000_seed42.db --method swap
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+
+# Seconds to wait for the services to release their write locks
+LOCK_TIMEOUT = 30
+
+
+def restore_database(template_path: str, db_path: str, method: str = "backup") -> float:
+    """
+    Replace the contents of a database with the template.
+
+    Args:
+        template_path: Path to the template database file
+        db_path: Path to the service database file
+        method: "backup" (online backup API) or "swap" (atomic file rename)
+
+    Returns:
+        Time taken in seconds.
+    """
+    template_path = Path(template_path).resolve()
+    db_path = Path(db_path).resolve()
+    start_time = time.perf_counter()
+
+    if method == "backup":
+        source = sqlite3.connect(f"file:{template_path}?mode=ro", uri=True)
+        target = sqlite3.connect(db_path, timeout=LOCK_TIMEOUT)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+    elif method == "swap":
+        temp_path = db_path.with_name(db_path.name + ".reset")
+        shutil.copyfile(template_path, temp_path)
+        # The WAL and shared-memory files belong to the old database
+        for suffix in ("-wal", "-shm"):
+            stale = db_path.with_name(db_path.name + suffix)
+            if stale.exists():
+                stale.unlink()
+        os.replace(temp_path, db_path)
+    else:
+        raise ValueError(f"Unknown reset method '{method}'. Available: backup, swap")
+
+    return time.perf_counter() - start_time
+
+
+def reset_database(template_path: str, db_path: str, method: str, label: str) -> bool:
+    """Restore one service database and print the result."""
+    if not Path(db_path).parent.exists():
+        print(f"  ✗ [{label}] Directory {Path(db_path).parent} does not exist")
+        return False
+    try:
+        elapsed = restore_database(template_path, db_path, method)
+    except (sqlite3.Error, OSError) as e:
+        print(f"  ✗ [{label}] Error resetting {db_path}: {e}")
+        return False
+    print(f"  ✓ [{label}] {db_path} reset from template in {elapsed * 1000:.0f} ms ({method})")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reset the service databases to a template dataset"
+    )
+    parser.add_argument(
+        "--template",
+        type=str,
+        required=True,
+        help="Template database created by setup_test_data.py --seed"
+    )
+    parser.add_argument(
+        "--rest-db",
+        type=str,
+        help="Path to REST service database file",
+        default="glossary_RESTservice/glossary.db"
+    )
+    parser.add_argument(
+        "--grpc-db",
+        type=str,
+        help="Path to gRPC service database file",
+        default="glossary_RPCservice/glossary.db"
+    )
+    parser.add_argument(
+        "--rest-only",
+        action="store_true",
+        help="Only reset REST database"
+    )
+    parser.add_argument(
+        "--grpc-only",
+        action="store_true",
+        help="Only reset gRPC database"
+    )
+    parser.add_argument(
+        "--method",
+        choices=["backup", "swap"],
+        default="backup",
+        help="backup: online backup API, safe with running services (default); "
+             "swap: atomic file rename, services must be stopped"
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.template).exists():
+        print(f"Error: Template {args.template} does not exist (create it with setup_test_data.py --seed)")
+        sys.exit(1)
+
+    print(f"Resetting databases from {args.template}...")
+
+    success = True
+    if not args.grpc_only:
+        success &= reset_database(args.template, args.rest_db, args.method, "REST")
+    if not args.rest_only:
+        success &= reset_database(args.template, args.grpc_db, args.method, "gRPC")
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
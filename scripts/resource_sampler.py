@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Script to sample the resources of the services and of Locust during a benchmark.
+
+Every second the sampler records, for each uvicorn (REST), gRPC server and
+Locust process on this machine:
+- CPU of the process and of its busiest thread, number of threads
+- RSS, open file descriptors (handles on Windows)
+- voluntary and involuntary context switches per second
+- disk reads and writes per second
+- size of the service's SQLite database and of its WAL file
+
+Rows go to <prefix>_resources.csv, CPU of every busy thread to
+<prefix>_threads.csv. The Timestamp column is in whole Unix seconds, as in
+Locust's <prefix>_stats_history.csv, so both files join on Timestamp; a row
+describes the second before its timestamp.
+
+Processes are found by their command line (app.main:app, server.server,
+locust) together with their child processes; processes that start later (e.g.
+Locust workers) are picked up while sampling. Services in Docker containers
+are visible on a Linux host; on Docker Desktop (Windows/macOS) only Locust and
+the database files are sampled.
+
+The benchmark runners start the sampler next to Locust and stop it when the
+test ends. It runs until interrupted (Ctrl+C, SIGTERM) or for --duration.
+
+Usage:
+    python scripts/resource_sampler.py --output results/rest/sanity/rest_sanity_20260101_120000
+    python scripts/resource_sampler.py --output /tmp/run --service grpc --duration 60
+"""
+
+import argparse
+import csv
+import math
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+DEFAULT_REST_DB = "glossary_RESTservice/glossary.db"
+DEFAULT_GRPC_DB = "glossary_RPCservice/glossary.db"
+
+# Seconds between rediscovering processes (new Locust workers, restarted services)
+DISCOVERY_INTERVAL = 5
+
+RESOURCES_HEADER = [
+    "Timestamp", "Process", "PID", "CPU %", "Threads", "Busiest Thread CPU %", "RSS MB", "Open FDs",
+    "Voluntary Switches/s", "Involuntary Switches/s", "Read MB/s", "Write MB/s", "DB MB", "WAL MB",
+]
+THREADS_HEADER = ["Timestamp", "Process", "PID", "Thread ID", "CPU %"]
+
+
+def process_role(cmdline: list) -> str:
+    """Get the role of a process from its command line ("rest", "grpc", "locust" or None)."""
+    if "app.main:app" in cmdline:
+        return "rest"
+    if "server.server" in cmdline or any(arg.replace("\\", "/").endswith("server/server.py") for arg in cmdline):
+        return "grpc"
+    # python -m locust ..., locust ..., locust.exe ...
+    if "locust" in cmdline[:3] or any(Path(arg).stem == "locust" for arg in cmdline[:2]):
+        return "locust"
+    return None
+
+
+def discover(roles: set) -> dict:
+    """Find the processes of the sampled roles and their children, by PID."""
+    found = {}
+    for proc in psutil.process_iter(["pid", "cmdline"]):
+        role = process_role(proc.info["cmdline"] or [])
+        if role not in roles:
+            continue
+        found[proc.pid] = (role, proc)
+        try:
+            for child in proc.children(recursive=True):
+                found.setdefault(child.pid, (role, child))
+        except psutil.Error:
+            pass
+    return found
+
+
+def database_file(proc, default: str) -> str:
+    """Get the SQLite database a service has open, or the default database path."""
+    try:
+        for f in proc.open_files():
+            # Paths inside a container are not visible on the host
+            if f.path.endswith(".db") and os.path.exists(f.path):
+                return f.path
+    except psutil.Error:
+        pass
+    return default
+
+
+def file_mb(path: str) -> float:
+    try:
+        return os.path.getsize(path) / 2**20
+    except OSError:
+        return 0.0
+
+
+class ProcessSampler:
+    """Cumulative counters of one process, turned into rates between samples."""
+
+    def __init__(self, role: str, proc, db_path: str):
+        self.role = role
+        self.proc = proc
+        self.db_path = db_path
+        self.previous = None
+
+    def counters(self) -> dict:
+        proc = self.proc
+        with proc.oneshot():
+            cpu = proc.cpu_times()
+            switches = proc.num_ctx_switches()
+            try:
+                io = proc.io_counters()
+                io = (io.read_bytes, io.write_bytes)
+            except (AttributeError, psutil.AccessDenied):
+                # Not available on macOS
+                io = None
+            try:
+                fds = proc.num_fds()
+            except AttributeError:
+                fds = proc.num_handles()
+            return {
+                "time": time.monotonic(),
+                "cpu": cpu.user + cpu.system,
+                "threads": {thread.id: thread.user_time + thread.system_time for thread in proc.threads()},
+                "rss": proc.memory_info().rss,
+                "fds": fds,
+                "switches": (switches.voluntary, switches.involuntary),
+                "io": io,
+            }
+
+    def sample(self, timestamp: int):
+        """
+        Take a sample.
+
+        Returns:
+            (resources row, thread rows), or None for the first sample of a process
+        """
+        current = self.counters()
+        previous, self.previous = self.previous, current
+        if previous is None:
+            return None
+
+        elapsed = current["time"] - previous["time"]
+        threads = []
+        for thread_id, cpu in current["threads"].items():
+            usage = (cpu - previous["threads"].get(thread_id, cpu)) / elapsed * 100
+            if usage > 0:
+                threads.append([timestamp, self.role, self.proc.pid, thread_id, round(usage, 1)])
+
+        def rate(key, index, scale=1):
+            if current[key] is None or previous[key] is None:
+                return ""
+            return round((current[key][index] - previous[key][index]) / elapsed / scale, 3)
+
+        row = [
+            timestamp, self.role, self.proc.pid,
+            round((current["cpu"] - previous["cpu"]) / elapsed * 100, 1),
+            len(current["threads"]),
+            max((thread[-1] for thread in threads), default=0.0),
+            round(current["rss"] / 2**20, 1),
+            current["fds"],
+            rate("switches", 0), rate("switches", 1),
+            rate("io", 0, 2**20), rate("io", 1, 2**20),
+            round(file_mb(self.db_path), 3) if self.db_path else "",
+            round(file_mb(self.db_path + "-wal"), 3) if self.db_path else "",
+        ]
+        return row, threads
+
+
+def run(args) -> bool:
+    roles = {"locust"} | ({"rest", "grpc"} if args.service == "all" else {args.service})
+    default_dbs = {"rest": args.rest_db, "grpc": args.grpc_db}
+
+    stop = {"requested": False}
+
+    def request_stop(signum, frame):
+        stop["requested"] = True
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    samplers = {}
+    summary = {}
+    deadline = time.time() + args.duration if args.duration else None
+    next_discovery = 0.0
+
+    with open(f"{args.output}_resources.csv", "w", newline="") as resources_file, \
+            open(f"{args.output}_threads.csv", "w", newline="") as threads_file:
+        resources = csv.writer(resources_file)
+        threads = csv.writer(threads_file)
+        resources.writerow(RESOURCES_HEADER)
+        threads.writerow(THREADS_HEADER)
+
+        while not stop["requested"] and (deadline is None or time.time() < deadline):
+            # Look for missing processes every second, for new ones every DISCOVERY_INTERVAL
+            missing = roles - {sampler.role for sampler in samplers.values()}
+            if missing or time.time() >= next_discovery:
+                for pid, (role, proc) in discover(roles).items():
+                    if pid not in samplers:
+                        db_path = database_file(proc, default_dbs[role]) if role in default_dbs else None
+                        samplers[pid] = ProcessSampler(role, proc, db_path)
+                        print(f"  Sampling {role} process {pid}" + (f" (database {db_path})" if db_path else ""))
+                next_discovery = time.time() + DISCOVERY_INTERVAL
+
+            # Sample on whole seconds, so the timestamps match Locust's history rows
+            time.sleep(max(0.0, math.floor(time.time()) + 1 - time.time()))
+            timestamp = int(time.time())
+            for pid, sampler in list(samplers.items()):
+                try:
+                    result = sampler.sample(timestamp)
+                except psutil.Error:
+                    # The process has exited
+                    del samplers[pid]
+                    continue
+                if result:
+                    row, thread_rows = result
+                    resources.writerow(row)
+                    threads.writerows(thread_rows)
+                    summary.setdefault((sampler.role, pid), []).append((row[3], row[6]))
+            # Flush every second: the runners on Windows stop the sampler without a signal
+            resources_file.flush()
+            threads_file.flush()
+
+    print()
+    print(f"Resources saved to {args.output}_resources.csv and {args.output}_threads.csv")
+    for (role, pid), samples in sorted(summary.items()):
+        cpu = [value for value, _ in samples]
+        print(
+            f"  {role} ({pid}): CPU avg {sum(cpu) / len(cpu):.1f}%, max {max(cpu):.1f}%, "
+            f"RSS max {max(rss for _, rss in samples):.1f} MB"
+        )
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sample CPU, memory, FDs, context switches, disk I/O and database size of the services and Locust"
+    )
+    parser.add_argument("--output", type=str, required=True,
+                        help="Output prefix (the run's CSV prefix): writes <prefix>_resources.csv and <prefix>_threads.csv")
+    parser.add_argument("--service", choices=["rest", "grpc", "all"], default="all",
+                        help="Service processes to sample besides Locust (default: all)")
+    parser.add_argument("--duration", type=float, default=0,
+                        help="Stop after this many seconds (default: run until interrupted)")
+    parser.add_argument("--rest-db", type=str, default=DEFAULT_REST_DB,
+                        help=f"REST database when the service's open files are not visible (default: {DEFAULT_REST_DB})")
+    parser.add_argument("--grpc-db", type=str, default=DEFAULT_GRPC_DB,
+                        help=f"gRPC database when the service's open files are not visible (default: {DEFAULT_GRPC_DB})")
+
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args) else 1)
+
+
+if __name__ == "__main__":
+    main()
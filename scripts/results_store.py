@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Script to collect benchmark runs into one SQLite results store and query trends.
+
+Each run leaves CSV and HTML files under results/<service>/<scenario>/ (and
+published reports under docs/results/). `ingest` loads every run into
+results/results.db:
+
+    runs            one row per run: service, scenario, timestamp, git commit,
+                    scenario config and load generator environment (from
+                    <run>_run.json, written by locustfiles/run_metadata.py)
+    endpoint_stats  one row per run and endpoint: counts, RPS, error rate,
+                    Locust percentiles and, when recorded, exact HDR percentiles
+
+Runs with _stats.csv are read from the CSV files; runs with only an HTML
+report are read from the statistics embedded in the report. Runs already in
+the store are skipped, so ingest can be repeated after every benchmark.
+
+Usage:
+    python scripts/results_store.py ingest
+    python scripts/results_store.py runs --service grpc --scenario stress
+    python scripts/results_store.py query --service grpc --scenario stress --endpoint "Get Term" --metric p95 --last 20
+"""
+
+import argparse
+import csv
+import json
+import re
+import sqlite3
+import statistics
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from locustfiles.common import load_scenario_config
+
+DEFAULT_DB = "results/results.db"
+DEFAULT_SOURCES = ["results", "docs/results"]
+
+# Run files are named <service>_<scenario>_<YYYYmmdd>_<HHMMSS>
+RUN_NAME = re.compile(r"^(rest|grpc)_(.+)_(\d{8}_\d{6})$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    service TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    source TEXT NOT NULL,
+    path TEXT NOT NULL,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    config_source TEXT,
+    config TEXT,
+    environment TEXT,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_runs_service_scenario_timestamp ON runs (service, scenario, timestamp);
+
+CREATE TABLE IF NOT EXISTS endpoint_stats (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    type TEXT,
+    name TEXT NOT NULL,
+    requests INTEGER,
+    failures INTEGER,
+    rps REAL,
+    error_rate REAL,
+    avg_ms REAL,
+    min_ms REAL,
+    max_ms REAL,
+    avg_content_size REAL,
+    p50 REAL, p66 REAL, p75 REAL, p80 REAL, p90 REAL, p95 REAL, p98 REAL, p99 REAL,
+    p999 REAL, p9999 REAL, p100 REAL,
+    hdr_p50 REAL, hdr_p90 REAL, hdr_p95 REAL, hdr_p99 REAL, hdr_p999 REAL, hdr_p9999 REAL, hdr_max REAL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS ix_endpoint_stats_name ON endpoint_stats (name, run_id);
+"""
+
+# Column of endpoint_stats -> column of <run>_stats.csv
+CSV_COLUMNS = {
+    "type": "Type", "name": "Name", "requests": "Request Count", "failures": "Failure Count",
+    "rps": "Requests/s", "avg_ms": "Average Response Time", "min_ms": "Min Response Time",
+    "max_ms": "Max Response Time", "avg_content_size": "Average Content Size",
+    "p50": "50%", "p66": "66%", "p75": "75%", "p80": "80%", "p90": "90%", "p95": "95%",
+    "p98": "98%", "p99": "99%", "p999": "99.9%", "p9999": "99.99%", "p100": "100%",
+}
+
+# Column of endpoint_stats -> column of <run>_hdr_percentiles.csv
+HDR_COLUMNS = {
+    "hdr_p50": "50%", "hdr_p90": "90%", "hdr_p95": "95%", "hdr_p99": "99%",
+    "hdr_p999": "99.9%", "hdr_p9999": "99.99%", "hdr_max": "Max",
+}
+
+METRICS = ["requests", "failures", "rps", "error_rate", "avg_ms", "min_ms", "max_ms", "avg_content_size"] + [
+    column for column in CSV_COLUMNS if column.startswith("p")
+] + list(HDR_COLUMNS)
+
+
+def number(value):
+    """Parse a CSV value ("N/A" and empty values are None)."""
+    if value in (None, "", "N/A"):
+        return None
+    return float(value)
+
+
+def read_csv_stats(prefix: Path) -> list:
+    """Read endpoint rows from <prefix>_stats.csv and, if present, <prefix>_hdr_percentiles.csv."""
+    hdr = {}
+    hdr_file = Path(f"{prefix}_hdr_percentiles.csv")
+    if hdr_file.exists():
+        with open(hdr_file, newline="") as f:
+            hdr = {row["Name"]: row for row in csv.DictReader(f)}
+
+    rows = []
+    with open(f"{prefix}_stats.csv", newline="") as f:
+        for record in csv.DictReader(f):
+            row = {
+                column: record[source] if column in ("type", "name") else number(record[source])
+                for column, source in CSV_COLUMNS.items()
+            }
+            for column, source in HDR_COLUMNS.items():
+                row[column] = number(hdr.get(row["name"], {}).get(source))
+            rows.append(row)
+    return rows
+
+
+def read_html_stats(report: Path) -> list:
+    """Read endpoint rows from the statistics embedded in a Locust HTML report."""
+    text = report.read_text(encoding="utf-8")
+    match = re.search(r"window\.templateArgs = (\{.*?\})\n", text)
+    if not match:
+        raise ValueError("no statistics found in the report")
+    data = json.loads(match.group(1))
+    percentiles = {(entry["method"], entry["name"]): entry for entry in data.get("response_time_statistics", [])}
+
+    rows = []
+    for entry in data["requests_statistics"]:
+        row = {column: None for column in CSV_COLUMNS}
+        row.update({
+            "type": entry["method"] or "",
+            "name": entry["name"],
+            "requests": entry["num_requests"],
+            "failures": entry["num_failures"],
+            "rps": entry["total_rps"],
+            "avg_ms": entry["avg_response_time"],
+            "min_ms": entry["min_response_time"],
+            "max_ms": entry["max_response_time"],
+            "avg_content_size": entry["avg_content_length"],
+            "p50": entry["median_response_time"],
+            "p95": entry.get("response_time_percentile_0.95"),
+            "p99": entry.get("response_time_percentile_0.99"),
+        })
+        extra = percentiles.get((entry["method"], entry["name"]), {})
+        row.update({"p90": extra.get("0.9"), "p100": extra.get("1.0", row["max_ms"])})
+        row.update({column: None for column in HDR_COLUMNS})
+        rows.append(row)
+    return rows
+
+
+def find_runs(sources: list) -> dict:
+    """
+    Find the runs under the source directories.
+
+    Returns:
+        Dict of run name -> (source kind, path); CSV results win over HTML-only reports.
+    """
+    runs = {}
+    for source in sources:
+        for path in sorted(Path(source).glob("*/*/*")):
+            if path.name.endswith("_stats.csv"):
+                name, kind = path.name[:-len("_stats.csv")], "csv"
+                path = path.with_name(name)
+            elif path.suffix == ".html":
+                name, kind = path.stem, "html"
+            else:
+                continue
+            if RUN_NAME.match(name) and (name not in runs or kind == "csv"):
+                runs[name] = (kind, path)
+    return runs
+
+
+def ingest_run(conn, name: str, kind: str, path: Path) -> int:
+    """Insert one run and its endpoint rows, returning the number of endpoints."""
+    service, scenario, stamp = RUN_NAME.match(name).groups()
+    timestamp = datetime.strptime(stamp, "%Y%m%d_%H%M%S").isoformat(sep=" ")
+
+    metadata_file = Path(f"{path.with_name(name)}_run.json")
+    if metadata_file.exists():
+        metadata = json.loads(metadata_file.read_text(encoding="utf-8"))
+        config, config_source = metadata.get("config"), "run"
+    else:
+        # Older runs did not record their configuration: use the current one
+        metadata = None
+        config, config_source = load_scenario_config(scenario), "current"
+
+    rows = read_csv_stats(path) if kind == "csv" else read_html_stats(path)
+    cursor = conn.execute(
+        "INSERT INTO runs (name, service, scenario, timestamp, source, path, git_commit, git_dirty, "
+        "config_source, config, environment, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            name, service, scenario, timestamp, kind, str(path),
+            metadata.get("commit") if metadata else None,
+            metadata.get("dirty") if metadata else None,
+            config_source,
+            json.dumps(config, ensure_ascii=False) if config else None,
+            json.dumps(metadata.get("environment")) if metadata else None,
+            json.dumps(metadata, ensure_ascii=False) if metadata else None,
+        ),
+    )
+    columns = list(CSV_COLUMNS) + ["error_rate"] + list(HDR_COLUMNS)
+    for row in rows:
+        row["error_rate"] = row["failures"] / row["requests"] if row["requests"] else 0.0
+    conn.executemany(
+        f"INSERT INTO endpoint_stats (run_id, {', '.join(columns)}) VALUES (?, {', '.join('?' * len(columns))})",
+        [(cursor.lastrowid, *(row[column] for column in columns)) for row in rows],
+    )
+    return len(rows)
+
+
+def connect(db_path: str):
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def ingest(args) -> bool:
+    conn = connect(args.db)
+    existing = {name for (name,) in conn.execute("SELECT name FROM runs")}
+    added = skipped = 0
+    success = True
+    for name, (kind, path) in sorted(find_runs(args.sources).items()):
+        if name in existing:
+            if not args.force:
+                skipped += 1
+                continue
+            conn.execute("DELETE FROM runs WHERE name = ?", (name,))
+        try:
+            with conn:
+                endpoints = ingest_run(conn, name, kind, path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  ✗ {name}: {e}")
+            success = False
+            continue
+        added += 1
+        print(f"  ✓ {name} ({kind}, {endpoints} endpoints)")
+    conn.commit()
+    conn.close()
+    print()
+    print(f"Ingested {added} runs into {args.db} ({skipped} already stored)")
+    return success
+
+
+def filters(args) -> tuple:
+    """Build the WHERE clause for the service/scenario filters."""
+    clauses, params = [], []
+    for column in ("service", "scenario"):
+        value = getattr(args, column)
+        if value:
+            clauses.append(f"r.{column} = ?")
+            params.append(value)
+    return (" AND ".join(clauses) or "1"), params
+
+
+def list_runs(args) -> bool:
+    conn = connect(args.db)
+    where, params = filters(args)
+    rows = conn.execute(
+        f"SELECT r.timestamp, r.name, r.source, r.git_commit, e.requests, e.rps, e.p95 "
+        f"FROM runs r LEFT JOIN endpoint_stats e ON e.run_id = r.id AND e.name = 'Aggregated' "
+        f"WHERE {where} ORDER BY r.timestamp DESC LIMIT ?",
+        (*params, args.last),
+    ).fetchall()
+    conn.close()
+    print(f"{'Timestamp':<19}  {'Run':<40}  {'Source':<6}  {'Commit':<8}  {'Requests':>9}  {'RPS':>8}  {'p95':>8}")
+    for timestamp, name, source, commit, requests, rps, p95 in reversed(rows):
+        print(
+            f"{timestamp:<19}  {name:<40}  {source:<6}  {(commit or '-')[:8]:<8}  "
+            f"{requests or 0:>9.0f}  {rps or 0:>8.2f}  {p95 if p95 is not None else '-':>8}"
+        )
+    return True
+
+
+def query(args) -> bool:
+    conn = connect(args.db)
+    where, params = filters(args)
+    rows = conn.execute(
+        f"SELECT r.timestamp, r.name, r.git_commit, e.{args.metric} "
+        f"FROM endpoint_stats e JOIN runs r ON r.id = e.run_id "
+        f"WHERE e.name = ? AND {where} ORDER BY r.timestamp DESC LIMIT ?",
+        (args.endpoint, *params, args.last),
+    ).fetchall()
+    conn.close()
+    rows.reverse()
+    if not rows:
+        print("No runs found")
+        return False
+
+    if args.format == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["timestamp", "run", "commit", args.metric])
+        writer.writerows(rows)
+        return True
+
+    print(f"{args.metric} of {args.endpoint} ({args.service or 'all services'}, {args.scenario or 'all scenarios'}), "
+          f"last {len(rows)} runs:")
+    for timestamp, name, commit, value in rows:
+        print(f"  {timestamp}  {name:<40}  {(commit or '-')[:8]:<8}  {value if value is not None else '-':>10}")
+    values = [value for *_, value in rows if value is not None]
+    if values:
+        change = f", first -> last {values[-1] / values[0] - 1:+.1%}" if len(values) > 1 and values[0] else ""
+        print(f"  min {min(values):g}, median {statistics.median(values):g}, max {max(values):g}{change}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Collect benchmark runs into a SQLite results store and query trends"
+    )
+    parser.add_argument("--db", type=str, default=DEFAULT_DB, help=f"Results store (default: {DEFAULT_DB})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Load new runs into the store")
+    ingest_parser.add_argument(
+        "sources", nargs="*", default=DEFAULT_SOURCES,
+        help=f"Result directories (<dir>/<service>/<scenario>/...; default: {' '.join(DEFAULT_SOURCES)})"
+    )
+    ingest_parser.add_argument("--force", action="store_true", help="Reload runs that are already stored")
+
+    for command, help_text in (("runs", "List stored runs"), ("query", "Show a metric over the latest runs")):
+        command_parser = subparsers.add_parser(command, help=help_text)
+        command_parser.add_argument("--service", choices=["rest", "grpc"], help="Filter by service")
+        command_parser.add_argument("--scenario", type=str, help="Filter by scenario")
+        command_parser.add_argument("--last", type=int, default=20, help="Number of latest runs (default: 20)")
+        if command == "query":
+            command_parser.add_argument("--endpoint", type=str, default="Aggregated", help="Endpoint name (default: Aggregated)")
+            command_parser.add_argument("--metric", choices=METRICS, default="p95", help="Metric (default: p95)")
+            command_parser.add_argument("--format", choices=["table", "csv"], default="table", help="Output format")
+
+    args = parser.parse_args()
+
+    commands = {"ingest": ingest, "runs": list_runs, "query": query}
+    sys.exit(0 if commands[args.command](args) else 1)
+
+
+if __name__ == "__main__":
+    main()
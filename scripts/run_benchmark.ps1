@@ -2,24 +2,61 @@
 # Usage:
 #   .\scripts\run_benchmark.ps1 -Service rest -Scenario sanity
 #   .\scripts\run_benchmark.ps1 -Service grpc -Scenario stress -Headless
+#   .\scripts\run_benchmark.ps1 -Service rest -Scenario churn -Headless -Tls
+#   .\scripts\run_benchmark.ps1 -Service rest -Scenario saturation -Headless -Workers 4
+#   .\scripts\run_benchmark.ps1 -Service grpc -Scenario sanity -Headless -ResetTemplate data/templates/glossary_100000_seed42.db
+#   .\scripts\run_benchmark.ps1 -Service rest -Scenario normal -Headless -CompareBaseline
+#   .\scripts\run_benchmark.ps1 -Service grpc -Scenario stress -Headless -NoResources
+#   .\scripts\run_benchmark.ps1 -Service rest -Scenario normal -Headless -Tls -CaptureProfile
 
 param(
     [Parameter(Mandatory=$true)]
     [ValidateSet("rest", "grpc")]
     [string]$Service,
     
+    # Any scenario defined in the config file (validated when the config is loaded)
     [Parameter(Mandatory=$true)]
-    [ValidateSet("sanity", "normal", "stress", "stability")]
     [string]$Scenario,
     
     [switch]$Headless,
     
+    [switch]$Tls,
+    
+    # Number of local Locust worker processes (0: single process, no master)
+    [ValidateRange(0, 256)]
+    [int]$Workers = 0,
+    
+    # Template database (setup_test_data.py -Seed) restored into the service database before the run
+    [string]$ResetTemplate = "",
+    
+    # Compare the run with <base_dir>/baselines/<service>_<scenario>.json (exit code 1 on regression)
+    [switch]$CompareBaseline,
+    
+    # Do not sample service and Locust resources (scripts/resource_sampler.py) or collect GC pauses (scripts/gc_report.py)
+    [switch]$NoResources,
+    
+    # Capture a sampling profile of the service at steady state (scripts/capture_profile.py)
+    [switch]$CaptureProfile,
+    
     [string]$ConfigFile = "config/test_scenarios.yaml"
 )
 
 # Import required modules
 $ErrorActionPreference = "Stop"
 
+# Seconds the master waits for all workers to connect (headless mode)
+$WorkerConnectTimeout = 60
+
+if ($CaptureProfile -and -not $Headless) {
+    Write-Host "Error: -CaptureProfile needs -Headless (the capture is timed from the scenario's ramp-up)" -ForegroundColor Red
+    exit 1
+}
+
+if ($ResetTemplate -and -not (Test-Path $ResetTemplate)) {
+    Write-Host "Error: Template $ResetTemplate not found (create it with scripts/setup_test_data.py --seed)" -ForegroundColor Red
+    exit 1
+}
+
 # Function to parse YAML (simplified - requires PyYAML in Python)
 function Get-ScenarioConfig {
     param(
@@ -36,20 +73,36 @@ import json
 with open('$ConfigFile', 'r', encoding='utf-8') as f:
     config = yaml.safe_load(f)
 
+if '$ScenarioName' not in config['scenarios']:
+    print('Unknown scenario $ScenarioName. Available: ' + ', '.join(config['scenarios']), file=sys.stderr)
+    sys.exit(1)
+
 scenario = config['scenarios']['$ScenarioName']
 service = config['services']['$Service']
 output = config['output']
 
+# A scenario may override the user class; the locustfile follows the user class
+user_class = scenario.get('user_class', {}).get('$Service') or service['user_class']
+locustfile = config.get('user_classes', {}).get(user_class, service['locustfile'])
+# A scenario may add a load shape from a separate locustfile (e.g. locustfiles/saturation.py)
+if scenario.get('shape'):
+    locustfile += ',' + scenario['shape']
+
 result = {
     'scenario': scenario,
     'service': service,
-    'output': output
+    'output': output,
+    'user_class': user_class,
+    'locustfile': locustfile
 }
 
 print(json.dumps(result))
 "@
     
     $json = python -c $pythonScript
+    if ($LASTEXITCODE -ne 0) {
+        throw "Failed to load scenario '$ScenarioName' from $ConfigFile"
+    }
     return $json | ConvertFrom-Json
 }
 
@@ -62,6 +115,14 @@ function Test-ServiceHealth {
     
     if ($ServiceType -eq "rest") {
         try {
+            # In TLS mode the local CA is not trusted by Windows, so only check that the port answers
+            if ($Tls) {
+                $uri = [System.Uri]$ServiceHost
+                $tcpClient = New-Object System.Net.Sockets.TcpClient
+                $tcpClient.Connect($uri.Host, $uri.Port)
+                $tcpClient.Close()
+                return $true
+            }
             $response = Invoke-WebRequest -Uri "$ServiceHost/health" -Method GET -TimeoutSec 2 -UseBasicParsing
             return $response.StatusCode -eq 200
         } catch {
@@ -129,6 +190,40 @@ try {
 $scenarioConfig = $config.scenario
 $serviceConfig = $config.service
 $outputConfig = $config.output
+$userClass = $config.user_class
+$locustfile = $config.locustfile
+$serviceHost = $serviceConfig.host
+$adminUrl = $serviceConfig.admin_url
+
+# Locustfiles that read their parameters from the scenario (load_scenario_config)
+$env:BENCHMARK_SERVICE = $Service
+$env:BENCHMARK_SCENARIO = $Scenario
+$env:BENCHMARK_CONFIG = $ConfigFile
+
+# TLS mode: Locust users verify the services with certs/ca.pem
+if ($Tls) {
+    $env:TLS_ENABLED = "true"
+    $serviceHost = $serviceHost -replace "^http://", "https://"
+    # The REST admin endpoints share the service port; the gRPC metrics port stays plain HTTP
+    if ($Service -eq "rest" -and $adminUrl) {
+        $adminUrl = $adminUrl -replace "^http://", "https://"
+    }
+}
+
+if ($CaptureProfile -and -not $adminUrl) {
+    Write-Host "Error: -CaptureProfile needs services.$Service.admin_url in $ConfigFile" -ForegroundColor Red
+    exit 1
+}
+
+# Profiling is off in the services by default: fail now rather than after the test
+if ($CaptureProfile) {
+    $caFile = if ($env:TLS_CA_FILE) { $env:TLS_CA_FILE } else { "certs/ca.pem" }
+    python scripts/capture_profile.py --url $adminUrl --check --cafile $caFile
+    if ($LASTEXITCODE -ne 0) {
+        Write-Host "Error: -CaptureProfile needs the service started with APP_PROFILING=true" -ForegroundColor Red
+        exit 1
+    }
+}
 
 Write-Host ""
 Write-Host "Test Configuration:" -ForegroundColor Cyan
@@ -138,14 +233,19 @@ Write-Host "  Description: $($scenarioConfig.description)" -ForegroundColor Whit
 Write-Host "  Users: $($scenarioConfig.users)" -ForegroundColor White
 Write-Host "  Spawn Rate: $($scenarioConfig.spawn_rate) users/sec" -ForegroundColor White
 Write-Host "  Duration: $($scenarioConfig.duration)" -ForegroundColor White
+Write-Host "  User Class: $userClass" -ForegroundColor White
+Write-Host "  TLS: $Tls" -ForegroundColor White
+Write-Host "  Workers: $(if ($Workers -gt 0) { "$Workers (distributed)" } else { 'none (single process)' })" -ForegroundColor White
+Write-Host "  Reset: $(if ($ResetTemplate) { $ResetTemplate } else { 'no' })" -ForegroundColor White
+Write-Host "  Profile: $CaptureProfile" -ForegroundColor White
 Write-Host ""
 
 # Check service health
 Write-Host "Checking service health..." -ForegroundColor Yellow
-$isHealthy = Test-ServiceHealth -ServiceType $Service -ServiceHost $serviceConfig.host
+$isHealthy = Test-ServiceHealth -ServiceType $Service -ServiceHost $serviceHost
 
 if (-not $isHealthy) {
-    Write-Host "Warning: Service at $($serviceConfig.host) appears to be unavailable." -ForegroundColor Yellow
+    Write-Host "Warning: Service at $serviceHost appears to be unavailable." -ForegroundColor Yellow
     Write-Host "Please ensure the service is running before starting the test." -ForegroundColor Yellow
     $continue = Read-Host "Continue anyway? (y/N)"
     if ($continue -ne "y" -and $continue -ne "Y") {
@@ -157,6 +257,17 @@ if (-not $isHealthy) {
 
 Write-Host ""
 
+# Restore the seeded dataset, so every run starts from the same data
+if ($ResetTemplate) {
+    Write-Host "Resetting $Service database from $ResetTemplate..." -ForegroundColor Yellow
+    python scripts/reset_db.py --template $ResetTemplate "--$Service-only"
+    if ($LASTEXITCODE -ne 0) {
+        Write-Host "Error: Database reset failed" -ForegroundColor Red
+        exit 1
+    }
+    Write-Host ""
+}
+
 # Prepare output directory
 $outputDir = Join-Path $outputConfig.base_dir $Service
 $outputDir = Join-Path $outputDir $Scenario
@@ -170,16 +281,20 @@ $timestamp = Get-Date -Format "yyyyMMdd_HHmmss"
 $csvPrefix = Join-Path $outputDir "${Service}_${Scenario}_${timestamp}"
 
 # Build Locust command
+# Arguments shared by the master and the workers
 $locustArgs = @(
-    "-f", $serviceConfig.locustfile
+    "-f", $locustfile
 )
 
 if ($Service -eq "rest") {
-    $locustArgs += @("-H", $serviceConfig.host)
+    $locustArgs += @("-H", $serviceHost)
 }
 
+# Arguments of the process that drives the test and writes the reports
+$runArgs = @()
+
 if ($Headless) {
-    $locustArgs += @(
+    $runArgs += @(
         "--headless",
         "-u", $scenarioConfig.users.ToString(),
         "-r", $scenarioConfig.spawn_rate.ToString(),
@@ -188,32 +303,100 @@ if ($Headless) {
 }
 
 if ($outputConfig.csv_prefix) {
-    $locustArgs += @("--csv", $csvPrefix)
+    # Per-endpoint history rows for scripts/analyze_results.py
+    $runArgs += @("--csv", $csvPrefix, "--csv-full-history")
 }
 
 if ($outputConfig.html_report) {
     $htmlFile = Join-Path $outputDir "${Service}_${Scenario}_${timestamp}.html"
-    $locustArgs += @("--html", $htmlFile)
+    $runArgs += @("--html", $htmlFile)
 }
 
 if ($outputConfig.json_report) {
     $jsonFile = Join-Path $outputDir "${Service}_${Scenario}_${timestamp}.json"
-    $locustArgs += @("--json-file", $jsonFile)
+    $runArgs += @("--json-file", $jsonFile)
+}
+
+# Distributed mode: the master merges worker stats into the CSV/HTML reports
+if ($Workers -gt 0) {
+    $runArgs += "--master"
+    if ($Headless) {
+        $runArgs += @("--expect-workers", $Workers.ToString(), "--expect-workers-max-wait", $WorkerConnectTimeout.ToString())
+    }
 }
 
 # Add user class if specified
-if ($serviceConfig.user_class) {
-    $locustArgs += $serviceConfig.user_class
+$classArgs = @()
+if ($userClass) {
+    $classArgs += $userClass
+}
+
+# Resource sampler (scripts/resource_sampler.py), stopped when the test ends
+$samplerProcess = $null
+if (-not $NoResources -and $outputConfig.csv_prefix) {
+    Write-Host "Sampling service and Locust resources (${csvPrefix}_resources.csv)..." -ForegroundColor Cyan
+    $samplerProcess = Start-Process -FilePath "python" -NoNewWindow -PassThru `
+        -ArgumentList @("scripts/resource_sampler.py", "--output", $csvPrefix, "--service", $Service) `
+        -RedirectStandardOutput "${csvPrefix}_resources.log" `
+        -RedirectStandardError "${csvPrefix}_resources.err.log"
 }
 
+# Profile capture (scripts/capture_profile.py): starts at steady state and ends before the test does
+$profilerProcess = $null
+if ($CaptureProfile) {
+    Write-Host "Profiling $Service at steady state (${csvPrefix}_profile.folded)..." -ForegroundColor Cyan
+    $caFile = if ($env:TLS_CA_FILE) { $env:TLS_CA_FILE } else { "certs/ca.pem" }
+    $profilerProcess = Start-Process -FilePath "python" -NoNewWindow -PassThru `
+        -ArgumentList @("scripts/capture_profile.py", "--url", $adminUrl, "--scenario", $Scenario, `
+            "--config", $ConfigFile, "--output", $csvPrefix, "--cafile", $caFile) `
+        -RedirectStandardOutput "${csvPrefix}_profile.log" `
+        -RedirectStandardError "${csvPrefix}_profile.err.log"
+}
+
+# Start workers (they retry until the master is up and exit when it quits)
+$workerProcesses = @()
+if ($Workers -gt 0) {
+    Write-Host "Starting $Workers Locust workers (logs: ${csvPrefix}_worker<N>.log)..." -ForegroundColor Cyan
+    foreach ($i in 1..$Workers) {
+        $workerArgs = @("-m", "locust") + $locustArgs + @("--worker", "--master-host", "127.0.0.1") + $classArgs
+        $workerProcesses += Start-Process -FilePath "python" -ArgumentList $workerArgs -NoNewWindow -PassThru `
+            -RedirectStandardOutput "${csvPrefix}_worker${i}.out.log" `
+            -RedirectStandardError "${csvPrefix}_worker${i}.log"
+    }
+}
+
+$locustArgs += $runArgs + $classArgs
+
 Write-Host "Starting Locust test..." -ForegroundColor Cyan
 Write-Host "Command: python -m locust $($locustArgs -join ' ')" -ForegroundColor Gray
 Write-Host ""
 
 # Run Locust
+$runStart = [DateTimeOffset]::UtcNow.ToUnixTimeSeconds()
 try {
     python -m locust @locustArgs
     $exitCode = $LASTEXITCODE
+    # The sampler writes every second, so stopping it loses nothing
+    if ($samplerProcess -and -not $samplerProcess.HasExited) {
+        Stop-Process -InputObject $samplerProcess -Force -ErrorAction SilentlyContinue
+    }
+    if ($profilerProcess) {
+        $profilerProcess.WaitForExit()
+        if ($profilerProcess.ExitCode -ne 0) {
+            Write-Host "Warning: profile capture failed" -ForegroundColor Yellow
+        }
+        Get-Content "${csvPrefix}_profile.log", "${csvPrefix}_profile.err.log" -ErrorAction SilentlyContinue
+    }
+    # GC pauses and tracemalloc snapshots of the service during the test (scripts/gc_report.py)
+    if (-not $NoResources -and $outputConfig.csv_prefix -and $adminUrl) {
+        Write-Host ""
+        Write-Host "Collecting GC pauses of $Service (${csvPrefix}_gc.csv)..." -ForegroundColor Cyan
+        $caFile = if ($env:TLS_CA_FILE) { $env:TLS_CA_FILE } else { "certs/ca.pem" }
+        python scripts/gc_report.py --url $adminUrl --since $runStart --output $csvPrefix --cafile $caFile
+        if ($LASTEXITCODE -ne 0) {
+            Write-Host "Warning: GC report failed" -ForegroundColor Yellow
+        }
+    }
     
     if ($exitCode -eq 0) {
         Write-Host ""
@@ -233,6 +416,15 @@ try {
         if ($outputConfig.html_report) {
             Write-Host "HTML report: $htmlFile" -ForegroundColor Cyan
         }
+        
+        # Regression gate: fail the run when it is significantly worse than the stored baseline
+        if ($CompareBaseline) {
+            Write-Host ""
+            $baselineDir = Join-Path $outputConfig.base_dir "baselines"
+            Write-Host "Comparing with baseline $baselineDir/${Service}_${Scenario}.json..." -ForegroundColor Yellow
+            python scripts/compare_baseline.py compare --run $csvPrefix --baseline-dir $baselineDir
+            $exitCode = $LASTEXITCODE
+        }
     } else {
         Write-Host ""
         Write-Host "Test completed with exit code: $exitCode" -ForegroundColor Yellow
@@ -243,5 +435,13 @@ try {
     Write-Host ""
     Write-Host "Error running Locust: $_" -ForegroundColor Red
     exit 1
+} finally {
+    $workerProcesses | Where-Object { -not $_.HasExited } | Stop-Process -Force -ErrorAction SilentlyContinue
+    if ($samplerProcess -and -not $samplerProcess.HasExited) {
+        Stop-Process -InputObject $samplerProcess -Force -ErrorAction SilentlyContinue
+    }
+    if ($profilerProcess -and -not $profilerProcess.HasExited) {
+        Stop-Process -InputObject $profilerProcess -Force -ErrorAction SilentlyContinue
+    }
 }
 
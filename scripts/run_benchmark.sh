@@ -3,6 +3,12 @@
 # Usage:
 #   ./scripts/run_benchmark.sh rest sanity
 #   ./scripts/run_benchmark.sh grpc stress --headless
+#   ./scripts/run_benchmark.sh rest churn --headless --tls
+#   ./scripts/run_benchmark.sh rest saturation --headless --workers 4
+#   ./scripts/run_benchmark.sh grpc sanity --headless --reset data/templates/glossary_100000_seed42.db
+#   ./scripts/run_benchmark.sh rest normal --headless --compare-baseline
+#   ./scripts/run_benchmark.sh grpc stress --headless --no-resources
+#   ./scripts/run_benchmark.sh rest normal --headless --tls --profile
 
 set -e
 
@@ -17,7 +23,17 @@ NC='\033[0m' # No Color
 SERVICE=""
 SCENARIO=""
 HEADLESS=false
+TLS=false
+WORKERS=0
+RESET_TEMPLATE=""
+COMPARE_BASELINE=false
+SAMPLE_RESOURCES=true
+PROFILE=false
 CONFIG_FILE="config/test_scenarios.yaml"
+USAGE="Usage: $0 <rest|grpc> <scenario> [--headless] [--tls] [--workers N] [--reset <template.db>] [--compare-baseline] [--no-resources] [--profile] [--config <file>]"
+
+# Seconds the master waits for all workers to connect (headless mode)
+WORKER_CONNECT_TIMEOUT=60
 
 # Parse arguments
 while [[ $# -gt 0 ]]; do
@@ -26,30 +42,76 @@ while [[ $# -gt 0 ]]; do
             SERVICE="$1"
             shift
             ;;
-        sanity|normal|stress|stability)
-            SCENARIO="$1"
-            shift
-            ;;
         --headless)
             HEADLESS=true
             shift
             ;;
+        --tls)
+            TLS=true
+            shift
+            ;;
+        --workers)
+            WORKERS="$2"
+            shift 2
+            ;;
+        --compare-baseline)
+            COMPARE_BASELINE=true
+            shift
+            ;;
+        --no-resources)
+            SAMPLE_RESOURCES=false
+            shift
+            ;;
+        --profile)
+            PROFILE=true
+            shift
+            ;;
+        --reset)
+            RESET_TEMPLATE="$2"
+            shift 2
+            ;;
         --config)
             CONFIG_FILE="$2"
             shift 2
             ;;
-        *)
+        -*)
             echo -e "${RED}Unknown option: $1${NC}"
-            echo "Usage: $0 <rest|grpc> <sanity|normal|stress|stability> [--headless] [--config <file>]"
+            echo "$USAGE"
             exit 1
             ;;
+        *)
+            # Scenario name (validated against the config file below)
+            if [ -n "$SCENARIO" ]; then
+                echo -e "${RED}Unknown option: $1${NC}"
+                echo "$USAGE"
+                exit 1
+            fi
+            SCENARIO="$1"
+            shift
+            ;;
     esac
 done
 
 # Validate required parameters
 if [ -z "$SERVICE" ] || [ -z "$SCENARIO" ]; then
     echo -e "${RED}Error: Service and scenario are required${NC}"
-    echo "Usage: $0 <rest|grpc> <sanity|normal|stress|stability> [--headless]"
+    echo "$USAGE"
+    exit 1
+fi
+
+if ! [[ "$WORKERS" =~ ^[0-9]+$ ]]; then
+    echo -e "${RED}Error: --workers expects a number of worker processes${NC}"
+    echo "$USAGE"
+    exit 1
+fi
+
+if [ "$PROFILE" = true ] && [ "$HEADLESS" != true ]; then
+    echo -e "${RED}Error: --profile needs --headless (the capture is timed from the scenario's ramp-up)${NC}"
+    exit 1
+fi
+
+if [ -n "$RESET_TEMPLATE" ] && [ ! -f "$RESET_TEMPLATE" ]; then
+    echo -e "${RED}Error: Template $RESET_TEMPLATE not found (create it with scripts/setup_test_data.py --seed)${NC}"
     exit 1
 fi
 
@@ -63,14 +125,27 @@ import json
 with open('$CONFIG_FILE', 'r', encoding='utf-8') as f:
     config = yaml.safe_load(f)
 
+if '$SCENARIO' not in config['scenarios']:
+    print(\"Unknown scenario '$SCENARIO'. Available: \" + ', '.join(config['scenarios']), file=sys.stderr)
+    sys.exit(1)
+
 scenario = config['scenarios']['$SCENARIO']
 service = config['services']['$SERVICE']
 output = config['output']
 
+# A scenario may override the user class; the locustfile follows the user class
+user_class = scenario.get('user_class', {}).get('$SERVICE') or service['user_class']
+locustfile = config.get('user_classes', {}).get(user_class, service['locustfile'])
+# A scenario may add a load shape from a separate locustfile (e.g. locustfiles/saturation.py)
+if scenario.get('shape'):
+    locustfile += ',' + scenario['shape']
+
 result = {
     'scenario': scenario,
     'service': service,
-    'output': output
+    'output': output,
+    'user_class': user_class,
+    'locustfile': locustfile
 }
 
 print(json.dumps(result))
@@ -83,7 +158,11 @@ check_service_health() {
     local host=$2
     
     if [ "$service_type" = "rest" ]; then
-        if curl -s -f "${host}/health" > /dev/null 2>&1; then
+        local curl_args=("-s" "-f")
+        if [ "$TLS" = true ]; then
+            curl_args+=("--cacert" "${TLS_CA_FILE:-certs/ca.pem}")
+        fi
+        if curl "${curl_args[@]}" "${host}/health" > /dev/null 2>&1; then
             return 0
         else
             return 1
@@ -133,9 +212,7 @@ fi
 
 # Load configuration
 echo -e "${YELLOW}Loading configuration from $CONFIG_FILE...${NC}"
-CONFIG_JSON=$(get_config)
-
-if [ $? -ne 0 ]; then
+if ! CONFIG_JSON=$(get_config); then
     echo -e "${RED}Error: Failed to load configuration${NC}"
     exit 1
 fi
@@ -147,13 +224,41 @@ DESCRIPTION=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.loa
 USERS=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['scenario']['users'])")
 SPAWN_RATE=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['scenario']['spawn_rate'])")
 DURATION=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['scenario']['duration'])")
-LOCUSTFILE=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['service']['locustfile'])")
+LOCUSTFILE=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['locustfile'])")
 HOST=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['service']['host'])")
-USER_CLASS=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['service']['user_class'])")
+ADMIN_URL=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['service'].get('admin_url', ''))")
+USER_CLASS=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['user_class'])")
 OUTPUT_DIR=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print(json.load(sys.stdin)['output']['base_dir'])")
 CSV_PREFIX=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print('true' if json.load(sys.stdin)['output']['csv_prefix'] else 'false')")
 HTML_REPORT=$(echo "$CONFIG_JSON" | python3 -c "import sys, json; print('true' if json.load(sys.stdin)['output']['html_report'] else 'false')")
 
+# Locustfiles that read their parameters from the scenario (load_scenario_config)
+export BENCHMARK_SERVICE="$SERVICE"
+export BENCHMARK_SCENARIO="$SCENARIO"
+export BENCHMARK_CONFIG="$CONFIG_FILE"
+
+# TLS mode: Locust users verify the services with certs/ca.pem
+if [ "$TLS" = true ]; then
+    export TLS_ENABLED=true
+    HOST="${HOST/http:\/\//https://}"
+    # The REST admin endpoints share the service port; the gRPC metrics port stays plain HTTP
+    if [ "$SERVICE" = "rest" ]; then
+        ADMIN_URL="${ADMIN_URL/http:\/\//https://}"
+    fi
+fi
+
+if [ "$PROFILE" = true ] && [ -z "$ADMIN_URL" ]; then
+    echo -e "${RED}Error: --profile needs services.${SERVICE}.admin_url in $CONFIG_FILE${NC}"
+    exit 1
+fi
+
+# Profiling is off in the services by default: fail now rather than after the test
+if [ "$PROFILE" = true ] && ! python3 scripts/capture_profile.py --url "$ADMIN_URL" --check \
+        --cafile "${TLS_CA_FILE:-certs/ca.pem}"; then
+    echo -e "${RED}Error: --profile needs the service started with APP_PROFILING=true${NC}"
+    exit 1
+fi
+
 echo ""
 echo -e "${CYAN}Test Configuration:${NC}"
 echo -e "  Service: ${SERVICE_NAME}"
@@ -162,6 +267,11 @@ echo -e "  Description: ${DESCRIPTION}"
 echo -e "  Users: ${USERS}"
 echo -e "  Spawn Rate: ${SPAWN_RATE} users/sec"
 echo -e "  Duration: ${DURATION}"
+echo -e "  User Class: ${USER_CLASS}"
+echo -e "  TLS: ${TLS}"
+echo -e "  Workers: $([ "$WORKERS" -gt 0 ] && echo "$WORKERS (distributed)" || echo "none (single process)")"
+echo -e "  Reset: ${RESET_TEMPLATE:-no}"
+echo -e "  Profile: ${PROFILE}"
 echo ""
 
 # Check service health
@@ -180,6 +290,16 @@ fi
 
 echo ""
 
+# Restore the seeded dataset, so every run starts from the same data
+if [ -n "$RESET_TEMPLATE" ]; then
+    echo -e "${YELLOW}Resetting $SERVICE database from $RESET_TEMPLATE...${NC}"
+    if ! python3 scripts/reset_db.py --template "$RESET_TEMPLATE" "--${SERVICE}-only"; then
+        echo -e "${RED}Error: Database reset failed${NC}"
+        exit 1
+    fi
+    echo ""
+fi
+
 # Prepare output directory
 OUTPUT_PATH="${OUTPUT_DIR}/${SERVICE}/${SCENARIO}"
 mkdir -p "$OUTPUT_PATH"
@@ -188,35 +308,127 @@ TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
 CSV_PREFIX_PATH="${OUTPUT_PATH}/${SERVICE}_${SCENARIO}_${TIMESTAMP}"
 
 # Build Locust command
+# Arguments shared by the master and the workers
 LOCUST_ARGS=("-f" "$LOCUSTFILE")
 
 if [ "$SERVICE" = "rest" ]; then
     LOCUST_ARGS+=("-H" "$HOST")
 fi
 
+# Arguments of the process that drives the test and writes the reports
+RUN_ARGS=()
+
 if [ "$HEADLESS" = true ]; then
-    LOCUST_ARGS+=("--headless" "-u" "$USERS" "-r" "$SPAWN_RATE" "-t" "$DURATION")
+    RUN_ARGS+=("--headless" "-u" "$USERS" "-r" "$SPAWN_RATE" "-t" "$DURATION")
 fi
 
 if [ "$CSV_PREFIX" = "true" ]; then
-    LOCUST_ARGS+=("--csv" "$CSV_PREFIX_PATH")
+    # Per-endpoint history rows for scripts/analyze_results.py
+    RUN_ARGS+=("--csv" "$CSV_PREFIX_PATH" "--csv-full-history")
 fi
 
 if [ "$HTML_REPORT" = "true" ]; then
     HTML_FILE="${OUTPUT_PATH}/${SERVICE}_${SCENARIO}_${TIMESTAMP}.html"
-    LOCUST_ARGS+=("--html" "$HTML_FILE")
+    RUN_ARGS+=("--html" "$HTML_FILE")
 fi
 
+# Distributed mode: the master merges worker stats into the CSV/HTML reports
+if [ "$WORKERS" -gt 0 ]; then
+    RUN_ARGS+=("--master")
+    if [ "$HEADLESS" = true ]; then
+        RUN_ARGS+=("--expect-workers" "$WORKERS" "--expect-workers-max-wait" "$WORKER_CONNECT_TIMEOUT")
+    fi
+fi
+
+CLASS_ARGS=()
 if [ -n "$USER_CLASS" ]; then
-    LOCUST_ARGS+=("$USER_CLASS")
+    CLASS_ARGS+=("$USER_CLASS")
 fi
 
+# Start workers (they retry until the master is up and exit when it quits)
+WORKER_PIDS=()
+stop_workers() {
+    for pid in "${WORKER_PIDS[@]}"; do
+        kill "$pid" 2>/dev/null || true
+    done
+}
+
+# Resource sampler (scripts/resource_sampler.py), stopped when the test ends
+SAMPLER_PID=""
+stop_sampler() {
+    if [ -n "$SAMPLER_PID" ]; then
+        kill "$SAMPLER_PID" 2>/dev/null || true
+        wait "$SAMPLER_PID" 2>/dev/null || true
+        SAMPLER_PID=""
+    fi
+}
+
+# Profile capture (scripts/capture_profile.py), waited for when the test ends
+PROFILER_PID=""
+stop_profiler() {
+    if [ -n "$PROFILER_PID" ]; then
+        kill "$PROFILER_PID" 2>/dev/null || true
+        PROFILER_PID=""
+    fi
+}
+finish_profiler() {
+    if [ -n "$PROFILER_PID" ]; then
+        wait "$PROFILER_PID" || echo -e "${YELLOW}Warning: profile capture failed${NC}"
+        PROFILER_PID=""
+        cat "${CSV_PREFIX_PATH}_profile.log"
+    fi
+}
+
+# GC pauses and tracemalloc snapshots of the service during the test (scripts/gc_report.py)
+collect_gc_report() {
+    if [ "$SAMPLE_RESOURCES" = true ] && [ "$CSV_PREFIX" = "true" ] && [ -n "$ADMIN_URL" ]; then
+        echo ""
+        echo -e "${CYAN}Collecting GC pauses of $SERVICE (${CSV_PREFIX_PATH}_gc.csv)...${NC}"
+        python3 scripts/gc_report.py --url "$ADMIN_URL" --since "$RUN_START" --output "$CSV_PREFIX_PATH" \
+            --cafile "${TLS_CA_FILE:-certs/ca.pem}" \
+            || echo -e "${YELLOW}Warning: GC report failed${NC}"
+    fi
+}
+
+trap 'stop_workers; stop_sampler; stop_profiler' EXIT
+
+if [ "$SAMPLE_RESOURCES" = true ] && [ "$CSV_PREFIX" = "true" ]; then
+    echo -e "${CYAN}Sampling service and Locust resources (${CSV_PREFIX_PATH}_resources.csv)...${NC}"
+    python3 scripts/resource_sampler.py --output "$CSV_PREFIX_PATH" --service "$SERVICE" \
+        > "${CSV_PREFIX_PATH}_resources.log" 2>&1 &
+    SAMPLER_PID=$!
+fi
+
+# The capture starts at steady state (after the ramp-up) and ends before the test does
+if [ "$PROFILE" = true ]; then
+    echo -e "${CYAN}Profiling $SERVICE at steady state (${CSV_PREFIX_PATH}_profile.folded)...${NC}"
+    python3 scripts/capture_profile.py --url "$ADMIN_URL" --scenario "$SCENARIO" --config "$CONFIG_FILE" \
+        --output "$CSV_PREFIX_PATH" --cafile "${TLS_CA_FILE:-certs/ca.pem}" \
+        > "${CSV_PREFIX_PATH}_profile.log" 2>&1 &
+    PROFILER_PID=$!
+fi
+
+if [ "$WORKERS" -gt 0 ]; then
+    echo -e "${CYAN}Starting $WORKERS Locust workers (logs: ${CSV_PREFIX_PATH}_worker<N>.log)...${NC}"
+    for i in $(seq 1 "$WORKERS"); do
+        python3 -m locust "${LOCUST_ARGS[@]}" --worker --master-host 127.0.0.1 "${CLASS_ARGS[@]}" \
+            > "${CSV_PREFIX_PATH}_worker${i}.log" 2>&1 &
+        WORKER_PIDS+=($!)
+    done
+fi
+
+LOCUST_ARGS+=("${RUN_ARGS[@]}" "${CLASS_ARGS[@]}")
+
 echo -e "${CYAN}Starting Locust test...${NC}"
 echo -e "Command: python3 -m locust ${LOCUST_ARGS[*]}"
 echo ""
 
 # Run Locust
+RUN_START=$(date +%s)
 if python3 -m locust "${LOCUST_ARGS[@]}"; then
+    stop_sampler
+    finish_profiler
+    collect_gc_report
     echo ""
     echo -e "${GREEN}========================================${NC}"
     echo -e "${GREEN}Test completed successfully!${NC}"
@@ -234,8 +446,18 @@ if python3 -m locust "${LOCUST_ARGS[@]}"; then
     if [ "$HTML_REPORT" = "true" ]; then
         echo -e "${CYAN}HTML report: $HTML_FILE${NC}"
     fi
+    
+    # Regression gate: fail the run when it is significantly worse than the stored baseline
+    if [ "$COMPARE_BASELINE" = true ]; then
+        echo ""
+        echo -e "${YELLOW}Comparing with baseline ${OUTPUT_DIR}/baselines/${SERVICE}_${SCENARIO}.json...${NC}"
+        python3 scripts/compare_baseline.py compare --run "$CSV_PREFIX_PATH" --baseline-dir "${OUTPUT_DIR}/baselines"
+    fi
 else
     EXIT_CODE=$?
+    stop_sampler
+    finish_profiler
+    collect_gc_report
     echo ""
     echo -e "${YELLOW}Test completed with exit code: $EXIT_CODE${NC}"
     exit $EXIT_CODE
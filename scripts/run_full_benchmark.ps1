@@ -3,19 +3,31 @@
 #   .\scripts\run_full_benchmark.ps1
 #   .\scripts\run_full_benchmark.ps1 -Scenarios sanity,normal
 #   .\scripts\run_full_benchmark.ps1 -Services rest,grpc -Scenarios sanity,normal,stress
+#   .\scripts\run_full_benchmark.ps1 -Scenarios stress -Headless -Workers 4
+#   .\scripts\run_full_benchmark.ps1 -Scenarios sanity,normal -Headless -SetupData -TestDataCount 100000 -Seed 42
 
 param(
     [string[]]$Services = @("rest", "grpc"),
     [string[]]$Scenarios = @("sanity", "normal", "stress", "stability"),
     [switch]$Headless,
+    [switch]$Tls,
     [switch]$CleanupDB,
     [switch]$SetupData,
     [int]$TestDataCount = 100,
+    [int]$Workers = 0,
+    # Seeded dataset: -SetupData generates the template, every run starts from it
+    [int]$Seed,
+    [string]$ResetTemplate = "",
     [string]$ConfigFile = "config/test_scenarios.yaml"
 )
 
 $ErrorActionPreference = "Stop"
 
+# Template of the seeded dataset (same default name as setup_test_data.py --seed)
+if ($PSBoundParameters.ContainsKey("Seed") -and -not $ResetTemplate) {
+    $ResetTemplate = "data/templates/glossary_${TestDataCount}_seed${Seed}.db"
+}
+
 # Colors for output
 function Write-ColorOutput {
     param(
@@ -39,11 +51,11 @@ foreach ($service in $Services) {
     }
 }
 
-# Validate scenarios
-$ValidScenarios = @("sanity", "normal", "stress", "stability")
+# Validate scenarios (any scenario defined in the config file)
+$ValidScenarios = python -c "import yaml; print('\n'.join(yaml.safe_load(open('$ConfigFile', encoding='utf-8'))['scenarios']))"
 foreach ($scenario in $Scenarios) {
     if ($scenario -notin $ValidScenarios) {
-        Write-ColorOutput "Error: Invalid scenario '$scenario'. Valid scenarios: sanity, normal, stress, stability" "Red"
+        Write-ColorOutput "Error: Invalid scenario '$scenario'. Valid scenarios: $($ValidScenarios -join ', ')" "Red"
         exit 1
     }
 }
@@ -52,9 +64,12 @@ Write-ColorOutput "Configuration:" "Cyan"
 Write-ColorOutput "  Services: $($Services -join ', ')" "White"
 Write-ColorOutput "  Scenarios: $($Scenarios -join ', ')" "White"
 Write-ColorOutput "  Headless: $Headless" "White"
+Write-ColorOutput "  TLS: $Tls" "White"
 Write-ColorOutput "  Cleanup DB: $CleanupDB" "White"
 Write-ColorOutput "  Setup Data: $SetupData" "White"
 Write-ColorOutput "  Test Data Count: $TestDataCount" "White"
+Write-ColorOutput "  Workers: $Workers" "White"
+Write-ColorOutput "  Reset Template: $(if ($ResetTemplate) { $ResetTemplate } else { 'no' })" "White"
 Write-Host ""
 
 # Step 1: Cleanup databases if requested
@@ -79,6 +94,10 @@ if ($SetupData) {
     try {
         $setupArgs = @("scripts/setup_test_data.py", "--count", $TestDataCount.ToString())
         
+        if ($PSBoundParameters.ContainsKey("Seed")) {
+            $setupArgs += @("--seed", $Seed.ToString(), "--template", $ResetTemplate)
+        }
+        
         if ($Services -contains "rest" -and $Services -contains "grpc") {
             # Setup both
         } elseif ($Services -contains "rest") {
@@ -132,6 +151,18 @@ foreach ($service in $Services) {
                 $params.Headless = $true
             }
             
+            if ($Tls) {
+                $params.Tls = $true
+            }
+            
+            if ($Workers -gt 0) {
+                $params.Workers = $Workers
+            }
+            
+            if ($ResetTemplate) {
+                $params.ResetTemplate = $ResetTemplate
+            }
+            
             & $scriptPath @params
             
             if ($LASTEXITCODE -eq 0) {
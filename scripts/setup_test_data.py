@@ -6,17 +6,32 @@ Usage:
     python scripts/setup_test_data.py --rest-db glossary_RESTservice/glossary.db --grpc-db glossary_RPCservice/glossary.db --count 100
     python scripts/setup_test_data.py --rest-db glossary_RESTservice/glossary.db --count 50
     python scripts/setup_test_data.py --grpc-db glossary_RPCservice/glossary.db --count 50
+    python scripts/setup_test_data.py --count 10000 --keywords-file "results/keywords_{service}.txt"
+    python scripts/setup_test_data.py --count 10000000 --clear
+    python scripts/setup_test_data.py --count 1000 --clear --description-size 10KB
+    python scripts/setup_test_data.py --count 1000 --clear --description-size 4KB --description-sigma 1.0
+    python scripts/setup_test_data.py --count 100000 --seed 42
 """
 
 import argparse
+import itertools
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy import DateTime, Integer, String, func
 from datetime import datetime
 import random
-import string
+
+# Add project root to path for imports
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from locustfiles.common import DescriptionSize, parse_size
+from scripts.reset_db import restore_database
 
 
 # Define Term model (same as in both services)
@@ -118,43 +133,105 @@ SAMPLE_DESCRIPTIONS = [
 ]
 
 
-def generate_keyword(index: int = None) -> str:
-    """Generate a unique keyword for testing."""
-    if index is not None and index < len(SAMPLE_KEYWORDS):
-        base = SAMPLE_KEYWORDS[index]
-    else:
-        base = random.choice(SAMPLE_KEYWORDS)
+# Suffixes of the default sample descriptions
+DESCRIPTION_VARIATIONS = [" (тестовый термин)", " - тестовая запись", " [benchmark]"]
+
+# Rows per executemany batch (committed separately, so memory stays flat)
+CHUNK_SIZE = 10000
+
+# Progress is printed every PROGRESS_STEP share of the rows
+PROGRESS_STEP = 0.05
+
+# Seeded datasets are saved here (restored between runs by scripts/reset_db.py)
+TEMPLATE_DIR = "data/templates"
+
+
+def default_template_path(count: int, seed: int, description_size: DescriptionSize = None) -> str:
+    """Get the template file name of a seeded dataset."""
+    size = f"_{description_size.size}B" if description_size is not None else ""
+    sigma = f"_s{description_size.sigma:g}" if description_size is not None and description_size.sigma else ""
+    return f"{TEMPLATE_DIR}/glossary_{count}_seed{seed}{size}{sigma}.db"
+
+
+def generate_terms(start_id: int, count: int, description_size: DescriptionSize = None):
+    """
+    Generate term rows with consecutive ids.
+    
+    The keyword suffix is the id in hex, so keywords are unique without
+    looking up existing ones (Locust creates keywords with 6-character suffixes).
     
-    # Add random suffix to ensure uniqueness
-    suffix = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-    return f"{base}_{suffix}"
-
-
-def generate_description(keyword: str = None) -> str:
-    """Generate a test description."""
-    if keyword and any(kw in keyword.upper() for kw in [k.upper() for k in SAMPLE_KEYWORDS]):
-        # Try to match description to keyword
-        for i, kw in enumerate(SAMPLE_KEYWORDS):
-            if kw.upper() in keyword.upper():
-                return SAMPLE_DESCRIPTIONS[i] if i < len(SAMPLE_DESCRIPTIONS) else f"Описание для {keyword}"
+    Args:
+        start_id: Id of the first row (above every existing id)
+        count: Number of rows
+        description_size: Size of the descriptions (default: short sample descriptions)
+    
+    Yields:
+        Row dictionaries with id, keyword and description.
+    """
+    for term_id in range(start_id, start_id + count):
+        index = random.randrange(len(SAMPLE_KEYWORDS))
+        keyword = f"{SAMPLE_KEYWORDS[index]}_{term_id:08X}"
+        if description_size is not None:
+            description = description_size.generate()
+        elif index < len(SAMPLE_DESCRIPTIONS):
+            description = SAMPLE_DESCRIPTIONS[index] + random.choice(DESCRIPTION_VARIATIONS)
+        else:
+            description = f"Описание для {keyword}"
+        yield {"id": term_id, "keyword": keyword, "description": description}
+
+
+def drop_indexes(conn) -> list:
+    """
+    Drop the secondary indexes of the terms table.
     
-    # Fallback to random description
-    desc = random.choice(SAMPLE_DESCRIPTIONS)
-    # Add some variation
-    variations = [" (тестовый термин)", " - тестовая запись", " [benchmark]"]
-    return desc + random.choice(variations)
+    Returns:
+        CREATE INDEX statements to restore them.
+    """
+    indexes = conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'terms' AND sql IS NOT NULL"
+    ).fetchall()
+    for name, _ in indexes:
+        conn.exec_driver_sql(f'DROP INDEX "{name}"')
+    conn.commit()
+    return [sql for _, sql in indexes]
+
 
+def export_keywords(conn, keywords_file: str):
+    """Write all keywords of the database to a file, one per line (for KEYWORD_POOL_FILE)."""
+    path = Path(keywords_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for (keyword,) in conn.exec_driver_sql("SELECT keyword FROM terms ORDER BY id"):
+            f.write(keyword + "\n")
+    print(f"  Keywords written to {path}")
 
-def setup_database(db_path: str, count: int, clear: bool = False):
+
+def setup_database(
+    db_path: str,
+    count: int,
+    clear: bool = False,
+    keywords_file: str = None,
+    description_size: DescriptionSize = None,
+    label: str = None
+):
     """
     Populate database with test data.
     
+    Rows are generated as a stream and inserted with executemany in chunks
+    of CHUNK_SIZE. During the load the secondary indexes are dropped (and
+    rebuilt once at the end), and the connection runs with
+    synchronous=OFF and journal_mode=MEMORY; both are restored afterwards.
+    
     Args:
         db_path: Path to SQLite database file
-        count: Number of terms to create
+        count: Number of terms the database should have
         clear: Whether to clear existing data first
+        keywords_file: Optional file to write the keywords of the database to
+        description_size: Size of the descriptions (default: short sample descriptions)
+        label: Name used in messages (default: database file name)
     """
     db_path = Path(db_path).resolve()
+    label = label or db_path.name
     
     if not db_path.parent.exists():
         print(f"Error: Directory {db_path.parent} does not exist")
@@ -163,7 +240,7 @@ def setup_database(db_path: str, count: int, clear: bool = False):
     # Create database URL
     db_url = f"sqlite:///{db_path}"
     
-    # Create engine and session
+    # Create engine
     engine = create_engine(
         db_url,
         connect_args={"check_same_thread": False},
@@ -173,61 +250,134 @@ def setup_database(db_path: str, count: int, clear: bool = False):
     # Create tables if they don't exist
     Base.metadata.create_all(bind=engine)
     
-    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
-    session = SessionLocal()
+    insert_term = Term.__table__.insert()
     
-    try:
-        if clear:
-            # Clear existing data
-            deleted = session.query(Term).delete()
-            session.commit()
-            print(f"  Cleared {deleted} existing terms from {db_path.name}")
-        
-        # Check current count
-        current_count = session.query(Term).count()
-        needed = count - current_count
-        
-        if needed <= 0:
-            print(f"  Database {db_path.name} already has {current_count} terms (need {count})")
+    with engine.connect() as conn:
+        try:
+            if clear:
+                # Clear existing data (DELETE without WHERE truncates the table in SQLite)
+                deleted = conn.exec_driver_sql("SELECT COUNT(*) FROM terms").scalar()
+                conn.exec_driver_sql("DELETE FROM terms")
+                conn.commit()
+                print(f"  [{label}] Cleared {deleted} existing terms")
+            
+            # Check current count
+            current_count = conn.exec_driver_sql("SELECT COUNT(*) FROM terms").scalar()
+            needed = count - current_count
+            
+            if needed <= 0:
+                print(f"  [{label}] Database already has {current_count} terms (need {count})")
+                if keywords_file:
+                    export_keywords(conn, keywords_file)
+                return True
+            
+            print(f"  [{label}] Adding {needed:,} terms to {db_path.name}...")
+            
+            start_id = (conn.exec_driver_sql("SELECT MAX(id) FROM terms").scalar() or 0) + 1
+            synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+            journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.exec_driver_sql("PRAGMA journal_mode=MEMORY")
+            # 256 MB page cache for the index rebuild
+            conn.exec_driver_sql("PRAGMA cache_size=-262144")
+            
+            index_statements = drop_indexes(conn)
+            start_time = time.perf_counter()
+            inserted, next_report = 0, PROGRESS_STEP
+            try:
+                rows = generate_terms(start_id, needed, description_size)
+                while True:
+                    chunk = list(itertools.islice(rows, CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    conn.execute(insert_term, chunk)
+                    conn.commit()
+                    inserted += len(chunk)
+                    if inserted >= needed * next_report or inserted == needed:
+                        elapsed = time.perf_counter() - start_time
+                        print(
+                            f"  [{label}] {inserted:,}/{needed:,} ({inserted / needed:.0%}), "
+                            f"{inserted / max(elapsed, 1e-9):,.0f} rows/s",
+                            flush=True
+                        )
+                        next_report = inserted / needed + PROGRESS_STEP
+            finally:
+                # Rebuild the indexes once, even if the load was interrupted
+                index_start = time.perf_counter()
+                for statement in index_statements:
+                    conn.exec_driver_sql(statement)
+                conn.commit()
+                print(f"  [{label}] Indexes rebuilt in {time.perf_counter() - index_start:.1f}s")
+                conn.exec_driver_sql(f"PRAGMA journal_mode={journal_mode}")
+                conn.exec_driver_sql(f"PRAGMA synchronous={synchronous}")
+            
+            final_count = conn.exec_driver_sql("SELECT COUNT(*) FROM terms").scalar()
+            elapsed = time.perf_counter() - start_time
+            print(f"  [{label}] ✓ Successfully populated {db_path.name} with {final_count:,} terms in {elapsed:.1f}s")
+            if keywords_file:
+                export_keywords(conn, keywords_file)
             return True
-        
-        print(f"  Adding {needed} terms to {db_path.name}...")
-        
-        # Generate and insert terms
-        existing_keywords = {term.keyword for term in session.query(Term.keyword).all()}
-        new_terms = []
-        
-        for i in range(needed):
-            # Generate unique keyword
-            attempts = 0
-            while True:
-                keyword = generate_keyword(i if i < len(SAMPLE_KEYWORDS) else None)
-                if keyword not in existing_keywords:
-                    existing_keywords.add(keyword)
-                    break
-                attempts += 1
-                if attempts > 100:
-                    # Fallback to timestamp-based keyword
-                    keyword = f"TERM_{i}_{random.randint(100000, 999999)}"
-                    break
             
-            description = generate_description(keyword)
-            term = Term(keyword=keyword, description=description)
-            new_terms.append(term)
-        
-        session.add_all(new_terms)
-        session.commit()
-        
-        final_count = session.query(Term).count()
-        print(f"  ✓ Successfully populated {db_path.name} with {final_count} terms")
-        return True
-        
-    except Exception as e:
-        session.rollback()
-        print(f"  ✗ Error populating {db_path.name}: {e}")
+        except Exception as e:
+            conn.rollback()
+            print(f"  [{label}] ✗ Error populating {db_path.name}: {e}")
+            return False
+        finally:
+            engine.dispose()
+
+
+def setup_from_template(args, description_size: DescriptionSize, keywords_file) -> bool:
+    """
+    Generate the seeded template database and restore it into the selected databases.
+    
+    The template is rebuilt from scratch on every call, so the same seed,
+    count and description size always give the same rows.
+    """
+    template = Path(args.template or default_template_path(args.count, args.seed, description_size))
+    template.parent.mkdir(parents=True, exist_ok=True)
+    print(
+        f"Setting up seeded test data (seed: {args.seed}, count: {args.count}, "
+        f"descriptions: {description_size or 'samples'})..."
+    )
+    print(f"Template: {template}")
+    print()
+    
+    start_time = time.perf_counter()
+    random.seed(args.seed)
+    if template.exists():
+        template.unlink()
+    if not setup_database(str(template), args.count, False, None, description_size, "template"):
+        print("✗ Test data setup completed with errors")
         return False
-    finally:
-        session.close()
+    
+    targets = []
+    if not args.grpc_only:
+        targets.append(("REST", args.rest_db, keywords_file("rest")))
+    if not args.rest_only:
+        targets.append(("gRPC", args.grpc_db, keywords_file("grpc")))
+    
+    success = True
+    for label, db_path, keywords in targets:
+        if not Path(db_path).resolve().parent.exists():
+            print(f"  [{label}] ✗ Directory {Path(db_path).resolve().parent} does not exist")
+            success = False
+            continue
+        elapsed = restore_database(str(template), db_path)
+        print(f"  [{label}] ✓ Restored {db_path} from template in {elapsed * 1000:.0f} ms")
+        if keywords:
+            engine = create_engine(f"sqlite:///{template.resolve()}", future=True)
+            with engine.connect() as conn:
+                export_keywords(conn, keywords)
+            engine.dispose()
+    
+    print()
+    print(f"Finished in {time.perf_counter() - start_time:.1f}s")
+    print(f"Reset between runs: python scripts/reset_db.py --template {template}")
+    if success:
+        print("✓ Test data setup completed successfully")
+    else:
+        print("✗ Test data setup completed with errors")
+    return success
 
 
 def main():
@@ -250,7 +400,7 @@ def main():
         "--count",
         type=int,
         default=100,
-        help="Number of test terms to create in each database (default: 100)"
+        help="Number of test terms each database should have, up to millions (default: 100)"
     )
     parser.add_argument(
         "--clear",
@@ -267,25 +417,87 @@ def main():
         action="store_true",
         help="Only populate gRPC database"
     )
+    parser.add_argument(
+        "--keywords-file",
+        type=str,
+        help="Write the keywords of each database to this file for KEYWORD_POOL_FILE "
+             "(\"{service}\" is replaced by rest or grpc)"
+    )
+    parser.add_argument(
+        "--description-size",
+        type=str,
+        help="Description size in bytes (e.g. 100B, 10KB, 1MB; median with --description-sigma). "
+             "Default: short sample descriptions"
+    )
+    parser.add_argument(
+        "--description-sigma",
+        type=float,
+        default=0.0,
+        help="Lognormal shape of the description size (0: fixed size, default: 0)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Generate a deterministic dataset into a template database and restore it into "
+             "both databases, so they hold identical data (always regenerates the template)"
+    )
+    parser.add_argument(
+        "--template",
+        type=str,
+        help="Template database path for --seed "
+             f"(default: {TEMPLATE_DIR}/glossary_<count>_seed<seed>[_<size>].db)"
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Populate the REST and gRPC databases one after another instead of in parallel"
+    )
     
     args = parser.parse_args()
     
-    print(f"Setting up test data (count: {args.count}, clear: {args.clear})...")
-    print()
+    description_size = None
+    if args.description_size:
+        try:
+            description_size = DescriptionSize(parse_size(args.description_size), sigma=args.description_sigma)
+        except ValueError as e:
+            parser.error(str(e))
     
-    success = True
+    if args.keywords_file and "{service}" not in args.keywords_file and not (args.rest_only or args.grpc_only):
+        parser.error("--keywords-file needs a {service} placeholder when both databases are populated")
+    
+    def keywords_file(service):
+        return args.keywords_file.replace("{service}", service) if args.keywords_file else None
+    
+    if args.seed is not None:
+        sys.exit(0 if setup_from_template(args, description_size, keywords_file) else 1)
+    elif args.template:
+        parser.error("--template is only used with --seed")
     
+    print(
+        f"Setting up test data (count: {args.count}, clear: {args.clear}, "
+        f"descriptions: {description_size or 'samples'})..."
+    )
+    print()
+    
+    jobs = []
     if not args.grpc_only:
         print(f"REST Database: {args.rest_db}")
-        if not setup_database(args.rest_db, args.count, args.clear):
-            success = False
-        print()
-    
+        jobs.append((args.rest_db, args.count, args.clear, keywords_file("rest"), description_size, "REST"))
     if not args.rest_only:
         print(f"gRPC Database: {args.grpc_db}")
-        if not setup_database(args.grpc_db, args.count, args.clear):
-            success = False
-        print()
+        jobs.append((args.grpc_db, args.count, args.clear, keywords_file("grpc"), description_size, "gRPC"))
+    print()
+    
+    start_time = time.perf_counter()
+    if len(jobs) > 1 and not args.sequential:
+        # Each database is written by its own process (SQLite writes are single-threaded per file)
+        with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+            results = list(executor.map(setup_database, *zip(*jobs)))
+    else:
+        results = [setup_database(*job) for job in jobs]
+    success = all(results)
+    print()
+    print(f"Finished in {time.perf_counter() - start_time:.1f}s")
     
     if success:
         print("✓ Test data setup completed successfully")
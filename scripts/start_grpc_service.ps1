@@ -1,5 +1,12 @@
 # PowerShell script to start gRPC service
 # Usage: .\scripts\start_grpc_service.ps1
+#        .\scripts\start_grpc_service.ps1 -Tls   (certificates from scripts/generate_certs.py)
+#        .\scripts\start_grpc_service.ps1 -Instrument   (server-timing metadata; /metrics, /profile, /gc on port 9464)
+
+param(
+    [switch]$Tls,
+    [switch]$Instrument
+)
 
 $ErrorActionPreference = "Stop"
 
@@ -56,8 +63,33 @@ if (-not (Test-Path $pb2File) -or -not (Test-Path $pb2GrpcFile)) {
     Write-Host "Protobuf files generated successfully" -ForegroundColor Green
 }
 
+$mode = "plaintext"
+
+if ($Tls) {
+    $certsDir = Join-Path $projectRoot "certs"
+    $certFile = Join-Path $certsDir "server.pem"
+    
+    if (-not (Test-Path $certFile)) {
+        Write-Host "Certificates not found. Generating..." -ForegroundColor Yellow
+        & $pythonCmd (Join-Path $projectRoot "scripts\generate_certs.py") --out $certsDir
+    }
+    
+    # Picked up by app.config.Settings (APP_ prefix)
+    $env:APP_TLS_CERT_FILE = $certFile
+    $env:APP_TLS_KEY_FILE = Join-Path $certsDir "server-key.pem"
+    $mode = "TLS"
+}
+
+if ($Instrument) {
+    # Picked up by app.config.Settings (APP_ prefix); all of them are off by default
+    $env:APP_SERVER_TIMING = "true"
+    $env:APP_METRICS = "true"
+    $env:APP_PROFILING = "true"
+    $env:APP_GC_STATS = "true"
+}
+
 Write-Host ""
-Write-Host "Starting gRPC service on localhost:50051" -ForegroundColor Green
+Write-Host "Starting gRPC service on localhost:50051 ($mode)" -ForegroundColor Green
 Write-Host "Press Ctrl+C to stop the service" -ForegroundColor Yellow
 Write-Host ""
 
@@ -1,5 +1,12 @@
 # PowerShell script to start REST service
 # Usage: .\scripts\start_rest_service.ps1
+#        .\scripts\start_rest_service.ps1 -Tls   (certificates from scripts/generate_certs.py)
+#        .\scripts\start_rest_service.ps1 -Instrument   (Server-Timing, /metrics, /admin/profile, /admin/gc)
+
+param(
+    [switch]$Tls,
+    [switch]$Instrument
+)
 
 $ErrorActionPreference = "Stop"
 
@@ -42,11 +49,36 @@ try {
     & $pythonCmd -m pip install uvicorn[standard]
 }
 
+$uvicornArgs = @("-m", "uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000")
+$scheme = "http"
+
+if ($Tls) {
+    $certsDir = Join-Path $projectRoot "certs"
+    $certFile = Join-Path $certsDir "server.pem"
+    $keyFile = Join-Path $certsDir "server-key.pem"
+    
+    if (-not (Test-Path $certFile)) {
+        Write-Host "Certificates not found. Generating..." -ForegroundColor Yellow
+        & $pythonCmd (Join-Path $projectRoot "scripts\generate_certs.py") --out $certsDir
+    }
+    
+    $uvicornArgs += @("--ssl-certfile", $certFile, "--ssl-keyfile", $keyFile)
+    $scheme = "https"
+}
+
+if ($Instrument) {
+    # Picked up by app.config.Settings (APP_ prefix); all of them are off by default
+    $env:APP_SERVER_TIMING = "true"
+    $env:APP_METRICS = "true"
+    $env:APP_PROFILING = "true"
+    $env:APP_GC_STATS = "true"
+}
+
 Write-Host ""
-Write-Host "Starting REST service on http://localhost:8000" -ForegroundColor Green
+Write-Host "Starting REST service on ${scheme}://localhost:8000" -ForegroundColor Green
 Write-Host "Press Ctrl+C to stop the service" -ForegroundColor Yellow
 Write-Host ""
 
 # Start uvicorn
-& $pythonCmd -m uvicorn app.main:app --host 0.0.0.0 --port 8000
+& $pythonCmd @uvicornArgs
 
@@ -1,5 +1,12 @@
 # PowerShell script to start both services in separate windows
 # Usage: .\scripts\start_services.ps1
+#        .\scripts\start_services.ps1 -Tls
+#        .\scripts\start_services.ps1 -Instrument   (server timing, metrics, profiling and GC statistics)
+
+param(
+    [switch]$Tls,
+    [switch]$Instrument
+)
 
 $ErrorActionPreference = "Stop"
 
@@ -14,7 +21,10 @@ $projectRoot = Split-Path -Parent $scriptDir
 # Start REST service in new window
 Write-Host "Starting REST service in new window..." -ForegroundColor Yellow
 $restScript = Join-Path $scriptDir "start_rest_service.ps1"
-Start-Process powershell -ArgumentList "-NoExit", "-File", $restScript
+$restArgs = @("-NoExit", "-File", $restScript)
+if ($Tls) { $restArgs += "-Tls" }
+if ($Instrument) { $restArgs += "-Instrument" }
+Start-Process powershell -ArgumentList $restArgs
 
 # Wait a bit
 Start-Sleep -Seconds 2
@@ -22,11 +32,15 @@ Start-Sleep -Seconds 2
 # Start gRPC service in new window
 Write-Host "Starting gRPC service in new window..." -ForegroundColor Yellow
 $grpcScript = Join-Path $scriptDir "start_grpc_service.ps1"
-Start-Process powershell -ArgumentList "-NoExit", "-File", $grpcScript
+$grpcArgs = @("-NoExit", "-File", $grpcScript)
+if ($Tls) { $grpcArgs += "-Tls" }
+if ($Instrument) { $grpcArgs += "-Instrument" }
+Start-Process powershell -ArgumentList $grpcArgs
 
 Write-Host ""
 Write-Host "Services are starting in separate windows." -ForegroundColor Green
-Write-Host "REST service: http://localhost:8000" -ForegroundColor Cyan
+$restScheme = if ($Tls) { "https" } else { "http" }
+Write-Host "REST service: ${restScheme}://localhost:8000" -ForegroundColor Cyan
 Write-Host "gRPC service: localhost:50051" -ForegroundColor Cyan
 Write-Host ""
 Write-Host "Wait a few seconds for services to start, then run your tests." -ForegroundColor Yellow
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Script to validate that Locust gRPC users run concurrently.
+
+Starts a stub gRPC server whose RPCs sleep for a fixed delay, runs GrpcUser
+(with no wait time) against it, and checks that the number of RPCs in flight
+reaches the number of users. If gRPC calls blocked the gevent loop, only one
+RPC would be in flight and the users would run one after another.
+
+Usage:
+    python scripts/validate_grpc_concurrency.py
+    python scripts/validate_grpc_concurrency.py --users 500 --delay 0.2 --duration 15
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent import futures
+from pathlib import Path
+
+# Add project root and glossary_RPCservice to path for imports
+project_root = Path(__file__).resolve().parent.parent
+grpc_service_path = project_root / "glossary_RPCservice"
+for path in (project_root, grpc_service_path):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+# Share of users that must have an RPC in flight at the same time
+MIN_CONCURRENCY_RATIO = 0.95
+# Share of the ideal throughput (users / delay) that must be reached
+MIN_THROUGHPUT_RATIO = 0.8
+
+
+def serve(port: int, delay: float, workers: int):
+    """Run a stub server whose RPCs each take `delay` seconds (server subprocess)."""
+    import grpc
+    import glossary_pb2 as pb
+    import glossary_pb2_grpc as rpc
+
+    terms = [pb.Term(keyword=f"term{i}", description="Stub term") for i in range(10)]
+
+    class SlowGlossaryService(rpc.GlossaryServiceServicer):
+        def ListTerms(self, request, context):
+            time.sleep(delay)
+            return pb.ListTermsResponse(items=terms)
+
+        def GetTerm(self, request, context):
+            time.sleep(delay)
+            return pb.GetTermResponse(item=pb.Term(keyword=request.keyword, description="Stub term"))
+
+        def CreateTerm(self, request, context):
+            time.sleep(delay)
+            return pb.CreateTermResponse(item=request.item)
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers))
+    rpc.add_GlossaryServiceServicer_to_server(SlowGlossaryService(), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    server.wait_for_termination()
+
+
+def max_overlap(intervals: list) -> int:
+    """Return the maximum number of (start, end) intervals open at the same time."""
+    edges = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    current = peak = 0
+    for _, delta in edges:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def run_users(port: int, users: int, duration: float) -> dict:
+    """
+    Run GrpcUser (with no wait time) against the stub server and measure concurrency.
+
+    Returns:
+        Dictionary with max in-flight RPCs, request count, throughput and median latency.
+    """
+    # common.py reads the service address at import time
+    os.environ["GRPC_SERVICE_HOST"] = "127.0.0.1"
+    os.environ["GRPC_SERVICE_PORT"] = str(port)
+    os.environ["TLS_ENABLED"] = "false"
+
+    import gevent
+    import locust
+    from locust import constant
+    from locust.env import Environment
+    from locustfiles.grpc_user import GrpcUser, close_channel_pool
+
+    class ValidationUser(GrpcUser):
+        wait_time = constant(0)
+
+    # Each request event is fired on completion; its start is end - response_time
+    intervals = []
+
+    def on_request(name, response_time, **kwargs):
+        if not name.startswith("[Setup]"):
+            end = time.perf_counter()
+            intervals.append((end - response_time / 1000, end))
+
+    env = Environment(user_classes=[ValidationUser], events=locust.events)
+    env.events.request.add_listener(on_request)
+    runner = env.create_local_runner()
+    runner.start(users, spawn_rate=users)
+    gevent.sleep(duration)
+    runner.quit()
+    # Only locust's main fires quitting; close the shared channels here
+    close_channel_pool(env)
+    env.events.request.remove_listener(on_request)
+
+    total = env.stats.total
+    return {
+        "max_in_flight": max_overlap(intervals),
+        "requests": len(intervals),
+        "failures": total.num_failures,
+        "rps": len(intervals) / duration,
+        "median_ms": sorted(end - start for start, end in intervals)[len(intervals) // 2] * 1000 if intervals else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate that Locust gRPC users reach their target concurrency"
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=200,
+        help="Number of concurrent users (default: 200)"
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.5,
+        help="Server-side delay of each RPC in seconds (default: 0.5)"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10,
+        help="Test duration in seconds (default: 10)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=50099,
+        help="Port for the stub server (default: 50099)"
+    )
+    parser.add_argument(
+        "--role",
+        choices=["server", "users"],
+        help=argparse.SUPPRESS
+    )
+
+    args = parser.parse_args()
+
+    if args.role == "server":
+        serve(args.port, args.delay, workers=args.users + 10)
+        return
+    if args.role == "users":
+        print(json.dumps(run_users(args.port, args.users, args.duration)))
+        return
+
+    # Server and users run in child processes: the users process is monkey-patched
+    # by gevent, and a blocked event loop there must not stall this process
+    child_args = [
+        "--port", str(args.port), "--delay", str(args.delay),
+        "--users", str(args.users), "--duration", str(args.duration),
+    ]
+
+    server = subprocess.Popen([sys.executable, __file__, "--role", "server"] + child_args)
+    try:
+        time.sleep(1)
+        print(f"Running {args.users} users for {args.duration:.0f}s against a server with {args.delay}s per RPC...")
+        users = subprocess.run(
+            [sys.executable, __file__, "--role", "users"] + child_args,
+            stdout=subprocess.PIPE,
+            text=True,
+            timeout=args.duration * 3 + 30,
+        )
+        result = json.loads(users.stdout.strip().splitlines()[-1])
+    except subprocess.TimeoutExpired:
+        # A blocked event loop runs the users one RPC at a time
+        print("✗ Test did not finish in time: gRPC calls block the gevent loop")
+        sys.exit(1)
+    finally:
+        server.terminate()
+        server.wait()
+
+    ideal_rps = args.users / args.delay
+    print()
+    print(f"  Max RPCs in flight: {result['max_in_flight']} / {args.users}")
+    print(f"  Requests:           {result['requests']} ({result['failures']} failed)")
+    print(f"  Throughput:         {result['rps']:.1f} req/s (ideal {ideal_rps:.1f})")
+    print(f"  Median latency:     {result['median_ms']:.0f} ms (server delay {args.delay * 1000:.0f} ms)")
+    print()
+
+    concurrent_ok = result["max_in_flight"] >= args.users * MIN_CONCURRENCY_RATIO
+    throughput_ok = result["rps"] >= ideal_rps * MIN_THROUGHPUT_RATIO
+    if concurrent_ok and throughput_ok and result["failures"] == 0:
+        print("✓ gRPC users run concurrently")
+        sys.exit(0)
+    else:
+        print("✗ gRPC users do not reach target concurrency (blocking calls stall the gevent loop?)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()